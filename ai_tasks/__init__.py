@@ -1,2 +1,18 @@
-from .extract_recipe_details_task import ExtractRecipeDetailsTask
-from .generate_recipe_task import GenerateRecipeTask
+import importlib
+from typing import Any, Dict
+
+from .ai_cache import AiCache
+from .ai_task import close_clients
+from .task_pool import get_task
+
+LAZY_EXPORTS: Dict[str, str] = {
+    "ExtractRecipeDetailsTask": ".extract_recipe_details_task",
+    "GenerateRecipeTask": ".generate_recipe_task",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name not in LAZY_EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    return getattr(importlib.import_module(LAZY_EXPORTS[name], __name__), name)
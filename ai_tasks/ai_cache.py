@@ -0,0 +1,102 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+from typing import Dict, List, Optional
+
+from models.data_models import RecipeDetails
+
+AI_CACHE_PATH = os.getenv("AI_CACHE_PATH", "ai_cache.sqlite3")
+
+
+def normalize_text(text: str) -> str:
+    return re.sub(r"\s+", " ", text).strip().lower()
+
+
+class AiCache:
+    def __init__(self, path: str = AI_CACHE_PATH) -> None:
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS recipe_details (
+                key TEXT PRIMARY KEY,
+                details TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS ingredient_lines (
+                model TEXT NOT NULL,
+                line TEXT NOT NULL,
+                ingredient TEXT NOT NULL,
+                PRIMARY KEY (model, line)
+            );
+            """)
+
+        self.details_hits = 0
+        self.details_misses = 0
+        self.line_hits = 0
+        self.line_misses = 0
+
+    @staticmethod
+    def details_key(model: str, dish_name: str, ingredients: List[str]) -> str:
+        payload = json.dumps(
+            [model, normalize_text(dish_name), [normalize_text(i) for i in ingredients]]
+        )
+
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get_details(self, key: str) -> Optional[RecipeDetails]:
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT details FROM recipe_details WHERE key = ?", (key,)
+            ).fetchone()
+
+            if not row:
+                self.details_misses += 1
+                return None
+
+            self.details_hits += 1
+
+        return RecipeDetails.model_validate_json(row[0])
+
+    def set_details(self, key: str, details: RecipeDetails) -> None:
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO recipe_details (key, details) VALUES (?, ?)",
+                (key, details.model_dump_json()),
+            )
+
+    def get_lines(self, model: str, lines: List[str]) -> Dict[str, str]:
+        normalized = list({normalize_text(l) for l in lines})
+        if not normalized:
+            return {}
+
+        placeholders = ",".join("?" * len(normalized))
+        with self.lock:
+            rows = self.conn.execute(
+                f"SELECT line, ingredient FROM ingredient_lines "
+                f"WHERE model = ? AND line IN ({placeholders})",
+                [model, *normalized],
+            ).fetchall()
+
+            known: Dict[str, str] = dict(rows)
+            self.line_hits += len(known)
+            self.line_misses += len(normalized) - len(known)
+
+        return known
+
+    def set_lines(self, model: str, mapping: Dict[str, str]) -> None:
+        with self.lock, self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO ingredient_lines (model, line, ingredient) "
+                "VALUES (?, ?, ?)",
+                [(model, normalize_text(l), i) for l, i in mapping.items()],
+            )
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "details_hits": self.details_hits,
+            "details_misses": self.details_misses,
+            "line_hits": self.line_hits,
+            "line_misses": self.line_misses,
+        }
@@ -1,12 +1,49 @@
+import os
+import threading
 from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Dict
 
-from google import genai
+if TYPE_CHECKING:
+    from google import genai
+
+GEMINI_BASE_URL = os.getenv("GEMINI_BASE_URL", "")
+
+_clients: Dict[str, "genai.Client"] = {}
+_clients_lock = threading.Lock()
+
+
+def shared_client(api_key: str) -> "genai.Client":
+    from google import genai
+    from google.genai import types
+
+    with _clients_lock:
+        if api_key not in _clients:
+            _clients[api_key] = genai.Client(
+                api_key=api_key,
+                http_options=(
+                    types.HttpOptions(base_url=GEMINI_BASE_URL)
+                    if GEMINI_BASE_URL
+                    else None
+                ),
+            )
+
+        return _clients[api_key]
+
+
+async def close_clients() -> None:
+    with _clients_lock:
+        clients = list(_clients.values())
+        _clients.clear()
+
+    for client in clients:
+        await client.aio.aclose()
+        client.close()
 
 
 class AiTask(ABC):
     def __init__(self, api_key: str, model: str) -> None:
         self.api_key = api_key
-        self.client = genai.Client(api_key=api_key)
+        self.client = shared_client(api_key)
         self.model = model
 
     @abstractmethod
@@ -14,5 +51,5 @@ class AiTask(ABC):
         pass
 
     @abstractmethod
-    def ai_request():
+    async def ai_request():
         pass
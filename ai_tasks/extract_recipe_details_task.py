@@ -1,10 +1,18 @@
 import logging
-from typing import List, Optional, cast
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple, cast
 
 from google.genai import types
 
-from models.data_models import RecipeDetails
+from ingredient_parser import (
+    INGREDIENT_PARSER_ENABLED,
+    IngredientParser,
+    default_parser,
+)
+from metrics import INGREDIENT_LINES, instrument
+from models.data_models import RecipeCuisine, RecipeDetails, RecipeDetailsBatch
 
+from .ai_cache import AiCache, normalize_text
 from .ai_task import AiTask
 
 logging.basicConfig(level=logging.INFO)
@@ -12,10 +20,27 @@ logging.getLogger("google_genai").setLevel(logging.WARNING)
 logging.getLogger("httpx").setLevel(logging.WARNING)
 
 
+@dataclass
+class PendingExtraction:
+    index: int
+    dish_name: str
+    ingredients: List[str]
+    sent: List[str]
+    key: Optional[str] = None
+    known: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def resolved(self) -> List[str]:
+        return [self.known[normalize_text(i)] for i in self.ingredients]
+
+
 class ExtractRecipeDetailsTask(AiTask):
-    def __init__(self, api_key: str, model: str) -> None:
+    def __init__(
+        self, api_key: str, model: str, cache: Optional[AiCache] = None
+    ) -> None:
         super().__init__(api_key, model)
         self.logger = logging.getLogger(__name__)
+        self.cache = cache
 
     def prompt(self, dish_name: str, ingredients: List[str]) -> str:
         prompt = f"""
@@ -45,7 +70,149 @@ class ExtractRecipeDetailsTask(AiTask):
 
         return prompt
 
-    def ai_request(
+    def cuisine_prompt(self, dish_name: str, ingredients: List[str]) -> str:
+        return f"""
+            You are a culinary analyst. Determine the most likely **cuisine type** (e.g., Italian, Mexican, Indian, Thai, French) of the following dish from its name and base ingredients.
+
+            **Dish Name:** {dish_name}
+
+            **Ingredients:**
+            {ingredients}
+
+            **Required Output:**
+            Return ONLY a single Python dictionary that conforms to the provided JSON schema. Do not include any introductory text, markdown formatting (like JSON blockquotes), or explanations.
+
+            Example of Required Output Format (for reference):
+            {{
+                "cuisine": "indian"
+            }}.
+        """
+
+    @instrument("ai")
+    async def ai_request(
+        self,
+        dish_name: str,
+        ingredients: List[str],
+    ) -> Optional[RecipeDetails]:
+        return (await self.ai_request_batch([(dish_name, ingredients)]))[0]
+
+    @instrument("ai")
+    async def ai_request_batch(
+        self, recipes: List[Tuple[str, List[str]]]
+    ) -> List[Optional[RecipeDetails]]:
+        results: List[Optional[RecipeDetails]] = [None] * len(recipes)
+        pending: List[PendingExtraction] = []
+
+        parser: Optional[IngredientParser] = (
+            default_parser() if INGREDIENT_PARSER_ENABLED else None
+        )
+
+        for index, (dish_name, ingredients) in enumerate(recipes):
+            key: Optional[str] = None
+            known: Dict[str, str] = {}
+
+            if self.cache:
+                key = self.cache.details_key(self.model, dish_name, ingredients)
+                cached: Optional[RecipeDetails] = self.cache.get_details(key)
+                if cached:
+                    results[index] = cached
+                    continue
+
+                known = self.cache.get_lines(self.model, ingredients)
+                INGREDIENT_LINES.labels("cache").inc(len(known))
+
+            if parser:
+                parsed: Dict[str, str] = {
+                    normalize_text(line): name
+                    for line, name in parser.resolve(ingredients).items()
+                    if normalize_text(line) not in known
+                }
+                INGREDIENT_LINES.labels("parser").inc(len(parsed))
+                known.update(parsed)
+
+            unseen: List[str] = list(
+                dict.fromkeys(i for i in ingredients if normalize_text(i) not in known)
+            )
+
+            if parser and not unseen:
+                local = self.resolve_locally(parser, dish_name, ingredients, known)
+                if local:
+                    if self.cache and key:
+                        self.cache.set_details(key, local)
+                    results[index] = local
+                    continue
+
+            INGREDIENT_LINES.labels("llm").inc(len(unseen))
+            pending.append(
+                PendingExtraction(
+                    index, dish_name, ingredients, sent=unseen, key=key, known=known
+                )
+            )
+
+        if not pending:
+            return results
+
+        if len(pending) > 1:
+            generated = await self.generate_batch(pending)
+        elif pending[0].sent:
+            generated = [await self.generate(pending[0].dish_name, pending[0].sent)]
+        else:
+            generated = [
+                await self.generate_cuisine(pending[0].dish_name, pending[0].resolved)
+            ]
+
+        for p, recipe_details in zip(pending, generated):
+            if recipe_details:
+                results[p.index] = self.merge(p, recipe_details)
+
+        return results
+
+    def resolve_locally(
+        self,
+        parser: IngredientParser,
+        dish_name: str,
+        ingredients: List[str],
+        known: Dict[str, str],
+    ) -> Optional[RecipeDetails]:
+        base_ingredients = [known[normalize_text(i)] for i in ingredients]
+        cuisine = parser.infer_cuisine(dish_name, base_ingredients)
+        if not cuisine:
+            return None
+
+        return RecipeDetails(cuisine=cuisine, ingredients=base_ingredients)
+
+    def merge(
+        self, pending: PendingExtraction, recipe_details: RecipeDetails
+    ) -> RecipeDetails:
+        known: Dict[str, str] = dict(pending.known)
+        sent: List[str] = pending.sent
+        ingredients: List[str] = pending.ingredients
+
+        if not sent:
+            base_ingredients = pending.resolved
+        elif len(recipe_details.ingredients) == len(sent):
+            extracted = dict(zip(sent, recipe_details.ingredients))
+            if self.cache:
+                self.cache.set_lines(self.model, extracted)
+            for line, name in extracted.items():
+                known.setdefault(normalize_text(line), name)
+            base_ingredients = [known[normalize_text(i)] for i in ingredients]
+        else:
+            base_ingredients = [
+                known[normalize_text(i)]
+                for i in ingredients
+                if normalize_text(i) in known
+            ] + recipe_details.ingredients
+
+        recipe_details = RecipeDetails(
+            cuisine=recipe_details.cuisine, ingredients=base_ingredients
+        )
+        if self.cache and pending.key:
+            self.cache.set_details(pending.key, recipe_details)
+
+        return recipe_details
+
+    async def generate(
         self,
         dish_name: str,
         ingredients: List[str],
@@ -56,7 +223,7 @@ class ExtractRecipeDetailsTask(AiTask):
         )
 
         try:
-            response = self.client.models.generate_content(
+            response = await self.client.aio.models.generate_content(
                 model=self.model,
                 contents=self.prompt(dish_name, ingredients),
                 config=config,
@@ -68,3 +235,95 @@ class ExtractRecipeDetailsTask(AiTask):
                 return None
         except Exception as e:
             raise RuntimeError(f"Extract recipe details request failed with error {e}")
+
+    async def generate_cuisine(
+        self,
+        dish_name: str,
+        ingredients: List[str],
+    ) -> Optional[RecipeDetails]:
+        config = types.GenerateContentConfig(
+            response_mime_type="application/json",
+            response_schema=RecipeCuisine,
+        )
+
+        try:
+            response = await self.client.aio.models.generate_content(
+                model=self.model,
+                contents=self.cuisine_prompt(dish_name, ingredients),
+                config=config,
+            )
+        except Exception as e:
+            raise RuntimeError(f"Extract recipe details request failed with error {e}")
+
+        if not response or not response.parsed:
+            return None
+
+        cuisine: RecipeCuisine = cast(RecipeCuisine, response.parsed)
+        return RecipeDetails(cuisine=cuisine.cuisine, ingredients=[])
+
+    def batch_prompt(self, recipes: List[PendingExtraction]) -> str:
+        numbered = "\n".join(
+            (
+                f"{n}. **Dish Name:** {p.dish_name}\n   **Input JSON:** {p.sent}"
+                if p.sent
+                else f"{n}. **Dish Name:** {p.dish_name}\n"
+                f"   **Known Ingredients:** {p.resolved}"
+            )
+            for n, p in enumerate(recipes, start=1)
+        )
+
+        return f"""
+            You are an ingredient extraction expert and culinary analyst. Your task is to process each of the following {len(recipes)} recipes, given as a dish name and a JSON list of recipe ingredients.
+
+            {numbered}
+
+            For each recipe, in the same order:
+
+            **Part 1: Cuisine Detection**
+            Analyze the **Dish Name** and the ingredients to determine the most likely **cuisine type** (e.g., Italian, Mexican, Indian, Thai, French).
+
+            **Part 2: Ingredient Extraction**
+            For each string in the **Input JSON** list, extract and return **only the base ingredient name in singular form**.
+            You must strip away all measurements, quantities, units, preparation instructions, and parenthetical notes. You must keep the cut of meat including ground meat (e.g., 'ground beef', 'chicken breast').
+            Recipes given with **Known Ingredients** instead of an **Input JSON** only need Part 1; return an empty "ingredients" list for them.
+
+            **Required Output:**
+            Return ONLY a single Python dictionary that conforms to the provided JSON schema, with exactly one entry in "recipes" per input recipe. Do not include any introductory text, markdown formatting (like JSON blockquotes), or explanations.
+
+            Example of Required Output Format (for reference):
+            {{
+                "recipes": [
+                    {{"cuisine": "indian", "ingredients": ["chicken breast", "tomato sauce", "ginger"]}},
+                    {{"cuisine": "italian", "ingredients": ["spaghetti", "garlic", "olive oil"]}}
+                ]
+            }}.
+        """
+
+    async def generate_batch(
+        self, recipes: List[PendingExtraction]
+    ) -> List[Optional[RecipeDetails]]:
+        config = types.GenerateContentConfig(
+            response_mime_type="application/json",
+            response_schema=RecipeDetailsBatch,
+        )
+
+        try:
+            response = await self.client.aio.models.generate_content(
+                model=self.model,
+                contents=self.batch_prompt(recipes),
+                config=config,
+            )
+        except Exception as e:
+            raise RuntimeError(f"Extract recipe details request failed with error {e}")
+
+        if not response or not response.parsed:
+            return [None] * len(recipes)
+
+        batch: RecipeDetailsBatch = cast(RecipeDetailsBatch, response.parsed)
+        if len(batch.recipes) != len(recipes):
+            raise RuntimeError(
+                f"Extract recipe details returned {len(batch.recipes)} results "
+                f"for {len(recipes)} recipes"
+            )
+
+        return list(batch.recipes)
@@ -1,11 +1,13 @@
 import logging
-from typing import Optional, cast
+from typing import Any, AsyncIterator, Optional, Tuple, cast
 
 from google.genai import types
 
+from metrics import instrument
 from models import Recipe
 
 from .ai_task import AiTask
+from .partial_json import PartialJsonObjectParser
 
 logging.basicConfig(level=logging.INFO)
 logging.getLogger("google_genai").setLevel(logging.WARNING)
@@ -43,18 +45,20 @@ class GenerateRecipeTask(AiTask):
         }}.
         """
 
-    def ai_request(self, user_input: str) -> Optional[Recipe]:
-        config = types.GenerateContentConfig(
+    def config(self) -> types.GenerateContentConfig:
+        return types.GenerateContentConfig(
             system_instruction=self.prompt(),
             response_mime_type="application/json",
             response_schema=Recipe,
         )
 
+    @instrument("ai")
+    async def ai_request(self, user_input: str) -> Optional[Recipe]:
         try:
-            response = self.client.models.generate_content(
+            response = await self.client.aio.models.generate_content(
                 model=self.model,
                 contents=user_input,
-                config=config,
+                config=self.config(),
             )
             if response and response.parsed:
                 recipe: Recipe = cast(Recipe, response.parsed)
@@ -63,3 +67,26 @@ class GenerateRecipeTask(AiTask):
                 return None
         except Exception as e:
             raise RuntimeError(f"Recipe generation failed with error {e}")
+
+    async def ai_request_stream(
+        self, user_input: str
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        parser = PartialJsonObjectParser()
+
+        try:
+            stream = await self.client.aio.models.generate_content_stream(
+                model=self.model,
+                contents=user_input,
+                config=self.config(),
+            )
+            async for chunk in stream:
+                if not chunk.text:
+                    continue
+
+                for field in parser.feed(chunk.text):
+                    yield field
+        except Exception as e:
+            raise RuntimeError(f"Recipe generation failed with error {e}")
+
+        if not parser.finished:
+            raise RuntimeError("Recipe generation stream ended before the recipe")
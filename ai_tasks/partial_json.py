@@ -0,0 +1,63 @@
+import json
+from typing import Any, List, Tuple
+
+WHITESPACE = " \t\n\r"
+
+
+class PartialJsonObjectParser:
+    def __init__(self) -> None:
+        self.decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.started = False
+        self.finished = False
+
+    def feed(self, text: str) -> List[Tuple[str, Any]]:
+        self.buffer += text
+        fields: List[Tuple[str, Any]] = []
+
+        while not self.finished:
+            i = self.skip_whitespace(self.pos)
+            if i >= len(self.buffer):
+                break
+
+            if not self.started:
+                if self.buffer[i] != "{":
+                    raise ValueError("Streamed response is not a JSON object")
+                self.started = True
+                self.pos = i + 1
+                continue
+
+            if self.buffer[i] == "}":
+                self.finished = True
+                self.pos = i + 1
+                break
+
+            if self.buffer[i] == ",":
+                i = self.skip_whitespace(i + 1)
+
+            try:
+                key, i = self.decoder.raw_decode(self.buffer, i)
+                i = self.skip_whitespace(i)
+                if i >= len(self.buffer) or self.buffer[i] != ":":
+                    break
+                value, i = self.decoder.raw_decode(
+                    self.buffer, self.skip_whitespace(i + 1)
+                )
+            except json.JSONDecodeError:
+                break
+
+            # a scalar at the very end of the buffer may still be growing
+            if not isinstance(value, (str, list, dict)) and i >= len(self.buffer):
+                break
+
+            fields.append((key, value))
+            self.pos = i
+
+        return fields
+
+    def skip_whitespace(self, i: int) -> int:
+        while i < len(self.buffer) and self.buffer[i] in WHITESPACE:
+            i += 1
+
+        return i
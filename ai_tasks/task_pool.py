@@ -0,0 +1,18 @@
+import threading
+from typing import Any, Dict, Tuple, Type, TypeVar
+
+from .ai_task import AiTask
+
+T = TypeVar("T", bound=AiTask)
+
+_tasks: Dict[Tuple[Type[AiTask], str, str], AiTask] = {}
+_tasks_lock = threading.Lock()
+
+
+def get_task(task_cls: Type[T], api_key: str, model: str, **kwargs: Any) -> T:
+    key = (task_cls, api_key, model)
+    with _tasks_lock:
+        if key not in _tasks:
+            _tasks[key] = task_cls(api_key, model, **kwargs)
+
+        return _tasks[key]  # type: ignore
@@ -0,0 +1,814 @@
+import asyncio
+import logging
+import os
+import uuid
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta, timezone
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from bson import ObjectId
+from pymongo import ASCENDING, TEXT, AsyncMongoClient, ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError, OperationFailure
+
+from metrics import MongoCommandMetrics, instrument_methods
+
+from models import (
+    Recipe,
+    RecipeSummary,
+    ShoppingList,
+    ShoppingListItem,
+    ShoppingListItemOp,
+    ShoppingListResponse,
+    ShoppingListRequest,
+)
+from mongo_utils import (
+    RECIPE_SUMMARY_PROJECTION,
+    max_pool_size_from_env,
+    mongo_uri_from_env,
+    recipe_document,
+    recipe_from_document,
+    shopping_list_from_document,
+    summary_from_document,
+)
+from recipe_urls import RecipeAlreadyExists, canonical_url
+from shopping_list_ops import (
+    ShoppingListNotFound,
+    ShoppingListVersionConflict,
+    assign_item_ids,
+    new_item_id,
+    referenced_item_ids,
+    shopping_list_update,
+)
+
+RECIPE_TEXT_WEIGHTS: Dict[str, int] = {
+    "title": 3,
+    "ingredients": 2,
+    "cuisine": 2,
+    "instructions": 1,
+}
+
+
+DUPLICATE_KEY_ERROR = 11000
+RESUME_TOKEN_LOST_ERRORS = frozenset({260, 280, 286})
+
+CHANGE_STREAM_RETRY_DELAY = float(os.getenv("CHANGE_STREAM_RETRY_DELAY", 1))
+CHANGE_STREAM_MAX_RETRY_DELAY = float(os.getenv("CHANGE_STREAM_MAX_RETRY_DELAY", 60))
+
+logger = logging.getLogger(__name__)
+
+
+class RecipeWriteListener(ABC):
+    @abstractmethod
+    async def recipe_written(self, id: str, fields: Dict[str, Any]) -> None:
+        pass
+
+    @abstractmethod
+    async def recipe_deleted(self, id: str) -> None:
+        pass
+
+
+class ShoppingListWriteListener(ABC):
+    @abstractmethod
+    async def shopping_list_written(self, id: str) -> None:
+        pass
+
+
+async def follow_changes(
+    name: str,
+    collection: Any,
+    handle: Callable[[Dict[str, Any]], Awaitable[None]],
+    resync: Optional[Callable[[], Awaitable[None]]] = None,
+    **options: Any,
+) -> None:
+    resume_token: Optional[Dict[str, Any]] = None
+    history_lost = False
+    failures = 0
+
+    while True:
+        try:
+            if history_lost and resync:
+                await resync()
+            history_lost = False
+
+            async with await collection.watch(
+                resume_after=resume_token, **options
+            ) as stream:
+                resume_token = stream.resume_token or resume_token
+                failures = 0
+                async for change in stream:
+                    await handle(change)
+                    resume_token = stream.resume_token
+        except OperationFailure as e:
+            if e.code in RESUME_TOKEN_LOST_ERRORS:
+                resume_token = None
+                history_lost = True
+            logger.error(f"{name} change stream failed: {e}")
+        except Exception as e:
+            logger.error(f"{name} change stream failed: {e}")
+
+        failures += 1
+        delay = min(
+            CHANGE_STREAM_RETRY_DELAY * 2 ** (failures - 1),
+            CHANGE_STREAM_MAX_RETRY_DELAY,
+        )
+        logger.info(f"restarting {name} change stream in {delay}s")
+        await asyncio.sleep(delay)
+
+
+def item_documents(items: List[ShoppingListItem]) -> List[Dict[str, Any]]:
+    return [{**i.model_dump(), "id": i.id or new_item_id()} for i in items]
+
+
+@instrument_methods("mongo")
+class AsyncMongoUtils:
+    def __init__(
+        self, uri: Optional[str] = None, max_pool_size: Optional[int] = None
+    ) -> None:
+        self.client: AsyncMongoClient = AsyncMongoClient(
+            uri or mongo_uri_from_env(),
+            maxPoolSize=max_pool_size or max_pool_size_from_env(),
+            event_listeners=[MongoCommandMetrics()],
+        )
+
+        self.db = self.client.clipcart
+        self.recipes_collection = self.db.recipes
+        self.shopping_list_collection = self.db.shopping_list
+        self.notion_page_id_collection = self.db.notion_page_ids
+        self.jobs_collection = self.db.jobs
+
+        self.recipe_listeners: List[RecipeWriteListener] = []
+        self.shopping_list_listeners: List[ShoppingListWriteListener] = []
+
+    def add_recipe_listener(self, listener: RecipeWriteListener) -> None:
+        self.recipe_listeners.append(listener)
+
+    def add_shopping_list_listener(self, listener: ShoppingListWriteListener) -> None:
+        self.shopping_list_listeners.append(listener)
+
+    async def notify_recipe_written(self, id: Any, fields: Dict[str, Any]) -> None:
+        for listener in self.recipe_listeners:
+            await listener.recipe_written(str(id), fields)
+
+    async def notify_recipe_deleted(self, id: Any) -> None:
+        for listener in self.recipe_listeners:
+            await listener.recipe_deleted(str(id))
+
+    async def notify_shopping_list_written(self, id: Any) -> None:
+        for listener in self.shopping_list_listeners:
+            await listener.shopping_list_written(str(id))
+
+    async def close(self) -> None:
+        await self.client.close()
+
+    async def ping(self) -> None:
+        await self.client.admin.command("ping")
+
+    async def ensure_indexes(self) -> None:
+        await self.recipes_collection.create_index("url")
+        await self.recipes_collection.create_index("ingredients")
+        await self.recipes_collection.create_index(
+            "canonical_url",
+            unique=True,
+            partialFilterExpression={"canonical_url": {"$type": "string"}},
+        )
+        await self.recipes_collection.create_index("duplicate_of", sparse=True)
+        await self.recipes_collection.create_index(
+            [(field, TEXT) for field in RECIPE_TEXT_WEIGHTS],
+            weights=RECIPE_TEXT_WEIGHTS,
+            name="recipe_text",
+        )
+        await self.jobs_collection.create_index("key", unique=True)
+        await self.jobs_collection.create_index(
+            [("status", ASCENDING), ("next_run_at", ASCENDING)]
+        )
+
+    async def add_recipe(
+        self, recipe: Recipe, duplicate_of: Optional[str] = None
+    ) -> ObjectId:
+        document: Dict[str, Any] = recipe_document(recipe, duplicate_of)
+        try:
+            result = await self.recipes_collection.insert_one(document)
+        except DuplicateKeyError:
+            existing_id = await self.find_recipe_id_by_url(recipe.url or "")
+            if not existing_id:
+                raise
+            raise RecipeAlreadyExists(existing_id, recipe.url or "")
+        await self.notify_recipe_written(result.inserted_id, document)
+
+        return result.inserted_id
+
+    async def add_recipes(
+        self, recipes: List[Recipe], duplicate_of: Optional[List[Optional[str]]] = None
+    ) -> List[Tuple[ObjectId, bool]]:
+        documents: List[Dict[str, Any]] = [
+            recipe_document(r, d)
+            for r, d in zip(recipes, duplicate_of or [None] * len(recipes))
+        ]
+        existing: Dict[int, ObjectId] = {}
+        try:
+            await self.recipes_collection.insert_many(documents, ordered=False)
+        except BulkWriteError as e:
+            for error in e.details["writeErrors"]:
+                existing_id = None
+                if error["code"] == DUPLICATE_KEY_ERROR:
+                    url = documents[error["index"]]["url"]
+                    existing_id = await self.find_recipe_id_by_url(url)
+                if not existing_id:
+                    raise
+                existing[error["index"]] = existing_id
+
+        for index, document in enumerate(documents):
+            if index not in existing:
+                await self.notify_recipe_written(document["_id"], document)
+
+        return [
+            (existing[i], True) if i in existing else (d["_id"], False)
+            for i, d in enumerate(documents)
+        ]
+
+    async def get_recipe_by_id(self, id: str) -> Optional[Recipe]:
+        recipe: Optional[Dict[str, Any]] = await self.recipes_collection.find_one(
+            {"_id": ObjectId(id)}
+        )
+        if not recipe:
+            return None
+
+        return recipe_from_document(recipe)
+
+    async def find_recipe_id_by_url(self, url: str) -> Optional[ObjectId]:
+        canonical: Optional[str] = canonical_url(url)
+        query: Dict[str, Any] = (
+            {"$or": [{"canonical_url": canonical}, {"url": url}]}
+            if canonical
+            else {"url": url}
+        )
+        recipe: Optional[Dict[str, Any]] = await self.recipes_collection.find_one(
+            query, {"_id": 1}
+        )
+        if not recipe:
+            return None
+
+        return recipe["_id"]
+
+    async def get_all_recipes(self) -> List[Recipe]:
+        recipe_list = []
+
+        async for r in self.recipes_collection.find({}):
+            recipe_list.append(recipe_from_document(r))
+
+        return recipe_list
+
+    async def get_recipes_page(
+        self, after: Optional[str] = None, limit: int = 0
+    ) -> List[Recipe]:
+        recipes = (
+            self.recipes_collection.find(self._page_filter(after))
+            .sort("_id", ASCENDING)
+            .limit(limit)
+        )
+
+        recipe_list = []
+
+        async for r in recipes:
+            recipe_list.append(recipe_from_document(r))
+
+        return recipe_list
+
+    async def get_recipe_summaries(
+        self, after: Optional[str] = None, limit: int = 0
+    ) -> List[RecipeSummary]:
+        recipes = (
+            self.recipes_collection.find(
+                self._page_filter(after), RECIPE_SUMMARY_PROJECTION
+            )
+            .sort("_id", ASCENDING)
+            .limit(limit)
+        )
+
+        summaries = []
+
+        async for r in recipes:
+            summaries.append(summary_from_document(r))
+
+        return summaries
+
+    async def iter_recipes(
+        self, summary: bool = False, batch_size: int = 500
+    ) -> AsyncIterator[Dict[str, Any]]:
+        projection = RECIPE_SUMMARY_PROJECTION if summary else None
+        recipes = self.recipes_collection.find(
+            {}, projection, batch_size=batch_size
+        ).sort("_id", ASCENDING)
+
+        async for r in recipes:
+            r["_id"] = str(r["_id"])
+            yield r
+
+    def _page_filter(self, after: Optional[str]) -> Dict[str, Any]:
+        if not after:
+            return {}
+
+        return {"_id": {"$gt": ObjectId(after)}}
+
+    async def delete_recipe(self, id: str) -> None:
+        await self.recipes_collection.delete_one({"_id": ObjectId(id)})
+        await self.notify_recipe_deleted(id)
+
+    async def update_recipe_details(
+        self, id: ObjectId, ingredients: List[str], cusine: str
+    ) -> None:
+        fields: Dict[str, Any] = {"ingredients": ingredients, "cuisine": cusine}
+        await self.recipes_collection.update_one({"_id": id}, {"$set": fields})
+        await self.notify_recipe_written(id, fields)
+
+    async def update_recipe_details_bulk(
+        self, updates: List[Tuple[ObjectId, List[str], str]]
+    ) -> None:
+        await self.recipes_collection.bulk_write(
+            [
+                UpdateOne(
+                    {"_id": id},
+                    {"$set": {"ingredients": ingredients, "cuisine": cuisine}},
+                )
+                for id, ingredients, cuisine in updates
+            ],
+            ordered=False,
+        )
+        for id, ingredients, cuisine in updates:
+            await self.notify_recipe_written(
+                id, {"ingredients": ingredients, "cuisine": cuisine}
+            )
+
+    async def update_recipe(self, id: str, recipe: Recipe) -> None:
+        fields: Dict[str, Any] = {
+            "title": recipe.title,
+            "ingredients": recipe.ingredients,
+            "measured_ingredients": recipe.measured_ingredients,
+            "instructions": recipe.instructions,
+        }
+        await self.recipes_collection.update_one(
+            {"_id": ObjectId(id)}, {"$set": fields}
+        )
+        await self.notify_recipe_written(id, fields)
+
+    async def set_recipe_images(self, id: str, images: Dict[str, str]) -> None:
+        await self.recipes_collection.update_one(
+            {"_id": ObjectId(id)}, {"$set": {"images": images}}
+        )
+        await self.notify_recipe_written(id, {"images": images})
+
+    async def get_recipe_images(self, id: str) -> Optional[Dict[str, Any]]:
+        return await self.recipes_collection.find_one(
+            {"_id": ObjectId(id)}, {"images": 1, "img_url": 1}
+        )
+
+    async def mark_recipe_duplicates(self, duplicates: Dict[str, str]) -> None:
+        if not duplicates:
+            return
+
+        await self.recipes_collection.bulk_write(
+            [
+                UpdateOne({"_id": ObjectId(id)}, {"$set": {"duplicate_of": original}})
+                for id, original in duplicates.items()
+            ],
+            ordered=False,
+        )
+        for id, original in duplicates.items():
+            await self.notify_recipe_written(id, {"duplicate_of": original})
+
+    async def set_canonical_urls(self, urls: Dict[str, str]) -> int:
+        if not urls:
+            return 0
+
+        try:
+            result = await self.recipes_collection.bulk_write(
+                [
+                    UpdateOne({"_id": ObjectId(id)}, {"$set": {"canonical_url": url}})
+                    for id, url in urls.items()
+                ],
+                ordered=False,
+            )
+            return result.modified_count
+        except BulkWriteError as e:
+            if any(
+                error["code"] != DUPLICATE_KEY_ERROR
+                for error in e.details["writeErrors"]
+            ):
+                raise
+            return e.details["nModified"]
+
+    async def get_duplicate_recipes(self) -> List[Dict[str, Any]]:
+        return [
+            {**r, "_id": str(r["_id"])}
+            async for r in self.recipes_collection.find(
+                {"duplicate_of": {"$exists": True}}, {"title": 1, "duplicate_of": 1}
+            )
+        ]
+
+    async def iter_recipe_fields(
+        self, fields: List[str], batch_size: int = 1000, ordered: bool = False
+    ) -> AsyncIterator[Dict[str, Any]]:
+        async for r in self.recipes_collection.find(
+            {},
+            {f: 1 for f in fields},
+            batch_size=batch_size,
+            sort=[("_id", 1)] if ordered else None,
+        ):
+            r["_id"] = str(r["_id"])
+            yield r
+
+    async def find_recipe_ids_with_ingredients(
+        self, ingredients: List[str], limit: int = 0
+    ) -> List[str]:
+        recipes = self.recipes_collection.find(
+            {"ingredients": {"$all": ingredients}}, {"_id": 1}
+        ).limit(limit)
+
+        return [str(r["_id"]) async for r in recipes]
+
+    async def search_recipe_ids(
+        self, query: str, limit: int = 0, offset: int = 0
+    ) -> List[Tuple[str, float]]:
+        recipes = (
+            self.recipes_collection.find(
+                {"$text": {"$search": query}}, {"score": {"$meta": "textScore"}}
+            )
+            .sort([("score", {"$meta": "textScore"})])
+            .skip(offset)
+            .limit(limit)
+        )
+
+        return [(str(r["_id"]), r["score"]) async for r in recipes]
+
+    async def find_recipe_summaries_by_ids(self, ids: List[str]) -> List[RecipeSummary]:
+        object_ids = [ObjectId(_id) for _id in ids]
+
+        summaries: Dict[str, RecipeSummary] = {}
+
+        async for r in self.recipes_collection.find(
+            {"_id": {"$in": object_ids}}, RECIPE_SUMMARY_PROJECTION
+        ):
+            summary: RecipeSummary = summary_from_document(r)
+            summaries[summary.id] = summary
+
+        return [summaries[_id] for _id in ids if _id in summaries]
+
+    async def find_recipes_by_ids(self, ids: List[str]) -> List[Recipe]:
+        object_ids = [ObjectId(_id) for _id in ids]
+
+        recipe_list = []
+
+        async for r in self.recipes_collection.find({"_id": {"$in": object_ids}}):
+            recipe_list.append(recipe_from_document(r))
+
+        return recipe_list
+
+    async def aggregate_recipe_ingredients(self, ids: List[str]) -> List[str]:
+        cursor = await self.recipes_collection.aggregate(
+            [
+                {"$match": {"_id": {"$in": [ObjectId(_id) for _id in ids]}}},
+                {"$unwind": "$ingredients"},
+                {"$group": {"_id": {"$toLower": {"$trim": {"input": "$ingredients"}}}}},
+                {"$match": {"_id": {"$ne": ""}}},
+                {"$sort": {"_id": ASCENDING}},
+            ]
+        )
+
+        return [r["_id"] async for r in cursor]
+
+    async def aggregate_measured_ingredients(
+        self, ids: List[str]
+    ) -> List[Tuple[str, int]]:
+        cursor = await self.recipes_collection.aggregate(
+            [
+                {"$match": {"_id": {"$in": [ObjectId(_id) for _id in ids]}}},
+                {"$unwind": "$measured_ingredients"},
+                {
+                    "$group": {
+                        "_id": {"$trim": {"input": "$measured_ingredients"}},
+                        "count": {"$sum": 1},
+                    }
+                },
+                {"$match": {"_id": {"$ne": ""}}},
+                {"$sort": {"_id": ASCENDING}},
+            ]
+        )
+
+        return [(r["_id"], r["count"]) async for r in cursor]
+
+    async def get_shopping_list(self, id: str) -> Optional[ShoppingList]:
+        shopping_list: Optional[Dict[str, Any]] = (
+            await self.shopping_list_collection.find_one({"_id": ObjectId(id)})
+        )
+        if not shopping_list:
+            return None
+
+        return shopping_list_from_document(shopping_list)
+
+    async def create_shopping_list(
+        self, shopping_list: ShoppingListRequest
+    ) -> ObjectId:
+        res = await self.shopping_list_collection.insert_one(
+            {
+                "name": shopping_list.name,
+                "items": item_documents(shopping_list.items),
+                "version": 0,
+            }
+        )
+
+        await self.notify_shopping_list_written(res.inserted_id)
+
+        return res.inserted_id
+
+    async def delete_shopping_list(self, id: str) -> None:
+        await self.shopping_list_collection.delete_one({"_id": ObjectId(id)})
+        await self.notify_shopping_list_written(id)
+
+    async def update_shopping_list(
+        self,
+        id: str,
+        items: List[ShoppingListItem],
+        name: Optional[str] = None,
+        version: Optional[int] = None,
+    ) -> int:
+        fields: Dict[str, Any] = {"items": item_documents(items)}
+        if name is not None:
+            fields["name"] = name
+
+        return await self.write_shopping_list(
+            id, {"$set": fields, "$inc": {"version": 1}}, version
+        )
+
+    async def apply_shopping_list_ops(
+        self, id: str, ops: List[ShoppingListItemOp], version: Optional[int] = None
+    ) -> Tuple[int, List[str]]:
+        ops = assign_item_ids(ops)
+        added: List[str] = [op.item_id for op in ops if op.op == "add" and op.item_id]
+        if not ops:
+            shopping_list: Optional[ShoppingList] = await self.get_shopping_list(id)
+            if not shopping_list:
+                raise ShoppingListNotFound("Shopping list not found")
+            return shopping_list.version, added
+
+        update, array_filters = shopping_list_update(ops)
+        new_version: int = await self.write_shopping_list(
+            id, update, version, referenced_item_ids(ops), array_filters
+        )
+
+        return new_version, added
+
+    async def write_shopping_list(
+        self,
+        id: str,
+        update: Any,
+        version: Optional[int] = None,
+        item_ids: Optional[List[str]] = None,
+        array_filters: Optional[List[Dict[str, Any]]] = None,
+    ) -> int:
+        query: Dict[str, Any] = {"_id": ObjectId(id)}
+        if version is not None:
+            query["version"] = version
+        if item_ids:
+            query["items.id"] = {"$all": item_ids}
+
+        result: Optional[Dict[str, Any]] = (
+            await self.shopping_list_collection.find_one_and_update(
+                query,
+                update,
+                projection={"version": 1},
+                array_filters=array_filters,
+                return_document=ReturnDocument.AFTER,
+            )
+        )
+        if result is None:
+            await self.raise_write_failure(id, version)
+
+        await self.notify_shopping_list_written(id)
+
+        return result["version"]
+
+    async def raise_write_failure(self, id: str, version: Optional[int]) -> None:
+        current: Optional[Dict[str, Any]] = (
+            await self.shopping_list_collection.find_one(
+                {"_id": ObjectId(id)}, {"version": 1}
+            )
+        )
+        if current is None:
+            raise ShoppingListNotFound("Shopping list not found")
+        if version is not None and current.get("version", 0) != version:
+            raise ShoppingListVersionConflict(current.get("version", 0))
+
+        raise ShoppingListNotFound("Shopping list item not found")
+
+    async def backfill_shopping_list_item_ids(self) -> None:
+        updates: List[UpdateOne] = []
+        async for s in self.shopping_list_collection.find(
+            {
+                "$or": [
+                    {"version": {"$exists": False}},
+                    {"items": {"$elemMatch": {"id": {"$exists": False}}}},
+                ]
+            }
+        ):
+            items: List[Dict[str, Any]] = [
+                {**i, "id": i.get("id") or new_item_id()} for i in s.get("items", [])
+            ]
+            updates.append(
+                UpdateOne(
+                    {"_id": s["_id"]},
+                    {"$set": {"items": items, "version": s.get("version", 0)}},
+                )
+            )
+
+        if updates:
+            await self.shopping_list_collection.bulk_write(updates, ordered=False)
+
+    async def get_all_shopping_lists(self) -> ShoppingListResponse:
+        shopping_lists: List[ShoppingList] = []
+
+        async for s in self.shopping_list_collection.find({}):
+            shopping_lists.append(shopping_list_from_document(s))
+
+        return ShoppingListResponse(lists=shopping_lists)
+
+    async def upsert_job(self, type: str, key: str, payload: Dict[str, Any]) -> str:
+        now = datetime.now(timezone.utc)
+        running: Optional[Dict[str, Any]] = (
+            await self.jobs_collection.find_one_and_update(
+                {"key": key, "status": "running"},
+                {
+                    "$set": {
+                        "type": type,
+                        "payload": payload,
+                        "rerun": True,
+                        "updated_at": now,
+                    }
+                },
+                {"_id": 1},
+            )
+        )
+        if running:
+            return str(running["_id"])
+
+        try:
+            job: Dict[str, Any] = await self.jobs_collection.find_one_and_update(
+                {"key": key, "status": {"$ne": "running"}},
+                {
+                    "$set": {
+                        "type": type,
+                        "payload": payload,
+                        "status": "pending",
+                        "attempts": 0,
+                        "error": None,
+                        "run": None,
+                        "rerun": False,
+                        "lease_until": None,
+                        "next_run_at": now,
+                        "updated_at": now,
+                        "finished_at": None,
+                    },
+                    "$setOnInsert": {"created_at": now},
+                },
+                {"_id": 1},
+                upsert=True,
+                return_document=ReturnDocument.AFTER,
+            )
+        except DuplicateKeyError:
+            return await self.upsert_job(type, key, payload)
+
+        return str(job["_id"])
+
+    async def claim_job(
+        self, types: List[str], lease: float
+    ) -> Optional[Dict[str, Any]]:
+        now = datetime.now(timezone.utc)
+        return await self.jobs_collection.find_one_and_update(
+            {
+                "type": {"$in": types},
+                "$or": [
+                    {"status": "pending", "next_run_at": {"$lte": now}},
+                    {"status": "running", "lease_until": {"$lte": now}},
+                ],
+            },
+            {
+                "$set": {
+                    "status": "running",
+                    "run": uuid.uuid4().hex,
+                    "rerun": False,
+                    "lease_until": now + timedelta(seconds=lease),
+                    "updated_at": now,
+                },
+                "$inc": {"attempts": 1},
+            },
+            sort=[("next_run_at", ASCENDING)],
+            return_document=ReturnDocument.AFTER,
+        )
+
+    async def requeue_rerun(self, id: ObjectId, run: str) -> bool:
+        now = datetime.now(timezone.utc)
+        result = await self.jobs_collection.update_one(
+            {"_id": id, "run": run, "rerun": True},
+            {
+                "$set": {
+                    "status": "pending",
+                    "attempts": 0,
+                    "error": None,
+                    "run": None,
+                    "rerun": False,
+                    "lease_until": None,
+                    "next_run_at": now,
+                    "updated_at": now,
+                    "finished_at": None,
+                }
+            },
+        )
+
+        return bool(result.modified_count)
+
+    async def finish_job(
+        self, id: ObjectId, run: str, status: str, error: Optional[str] = None
+    ) -> None:
+        if await self.requeue_rerun(id, run):
+            return
+
+        now = datetime.now(timezone.utc)
+        result = await self.jobs_collection.update_one(
+            {"_id": id, "run": run, "rerun": {"$ne": True}},
+            {
+                "$set": {
+                    "status": status,
+                    "error": error,
+                    "run": None,
+                    "lease_until": None,
+                    "updated_at": now,
+                    "finished_at": now,
+                }
+            },
+        )
+        if not result.matched_count:
+            await self.requeue_rerun(id, run)
+
+    async def retry_job(self, id: ObjectId, run: str, error: str, delay: float) -> None:
+        if await self.requeue_rerun(id, run):
+            return
+
+        now = datetime.now(timezone.utc)
+        result = await self.jobs_collection.update_one(
+            {"_id": id, "run": run, "rerun": {"$ne": True}},
+            {
+                "$set": {
+                    "status": "pending",
+                    "error": error,
+                    "run": None,
+                    "lease_until": None,
+                    "next_run_at": now + timedelta(seconds=delay),
+                    "updated_at": now,
+                }
+            },
+        )
+        if not result.matched_count:
+            await self.requeue_rerun(id, run)
+
+    async def rerun_job_ids(self, ids: List[ObjectId]) -> Set[ObjectId]:
+        return {
+            job["_id"]
+            async for job in self.jobs_collection.find(
+                {"_id": {"$in": ids}, "rerun": True}, {"_id": 1}
+            )
+        }
+
+    async def recover_jobs(self) -> int:
+        now = datetime.now(timezone.utc)
+        result = await self.jobs_collection.update_many(
+            {"status": "running", "lease_until": {"$lte": now}},
+            {
+                "$set": {
+                    "status": "pending",
+                    "run": None,
+                    "rerun": False,
+                    "lease_until": None,
+                    "next_run_at": now,
+                    "updated_at": now,
+                }
+            },
+        )
+
+        return result.modified_count
+
+    async def get_job(self, id: str) -> Optional[Dict[str, Any]]:
+        return await self.jobs_collection.find_one(
+            {"_id": ObjectId(id)}, {"run": 0, "lease_until": 0}
+        )
+
+    async def count_jobs(self, status: str) -> int:
+        return await self.jobs_collection.count_documents({"status": status})
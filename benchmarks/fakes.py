@@ -0,0 +1,130 @@
+# Local stand-ins for the app's upstreams. fake_gemini answers the
+# generateContent calls made by the AI tasks with canned RecipeDetails /
+# Recipe JSON, and fixture_site serves the saved recipe pages, both after a
+# configurable delay. Point the app at the fake with GEMINI_BASE_URL.
+#
+#   python benchmarks/fakes.py --port 8089 --latency 0.8
+import argparse
+import asyncio
+import json
+import os
+import re
+import sys
+from typing import Any, Dict
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import HTMLResponse, StreamingResponse
+
+from harness import FIXTURES, serve
+
+CANNED_DETAILS: Dict[str, Any] = {
+    "cuisine": "indian",
+    "ingredients": ["toor dal", "water", "turmeric", "salt", "ghee", "cumin"],
+}
+CANNED_RECIPE: Dict[str, Any] = {
+    "title": "Bench Dal Tadka",
+    "url": "",
+    "img_url": "",
+    "ingredients": [],
+    "measuredIngredients": [
+        "1 cup toor dal",
+        "3 cups water",
+        "1/2 tsp turmeric",
+        "1 tsp salt",
+        "2 tbsp ghee",
+        "1 tsp cumin",
+    ],
+    "cuisine": "Indian",
+    "instructions": "Rinse the dal\nPressure cook with water\nTemper with ghee",
+}
+
+
+def canned_response(body: Dict[str, Any]) -> Dict[str, Any]:
+    schema = (body.get("generationConfig") or {}).get("responseSchema") or {}
+    properties = schema.get("properties") or {}
+    prompt = " ".join(
+        part.get("text", "")
+        for content in body.get("contents", [])
+        for part in content.get("parts", [])
+    )
+
+    if "recipes" in properties:
+        count = max(1, len(re.findall(r"\*\*Dish Name:\*\*", prompt)))
+        result: Dict[str, Any] = {"recipes": [CANNED_DETAILS] * count}
+    elif "cuisine" in properties and "title" not in properties:
+        result = CANNED_DETAILS
+    else:
+        result = CANNED_RECIPE
+
+    return {
+        "candidates": [
+            {
+                "content": {"role": "model", "parts": [{"text": json.dumps(result)}]},
+                "finishReason": "STOP",
+                "index": 0,
+            }
+        ],
+        "usageMetadata": {"promptTokenCount": 1, "candidatesTokenCount": 1},
+    }
+
+
+def fake_gemini(latency: float) -> FastAPI:
+    app = FastAPI()
+    app.state.requests = 0
+
+    @app.post("/{version}/models/{model}:generateContent")
+    async def generate_content(version: str, model: str, request: Request):
+        app.state.requests += 1
+        await asyncio.sleep(latency)
+
+        return canned_response(await request.json())
+
+    @app.post("/{version}/models/{model}:streamGenerateContent")
+    async def stream_generate_content(version: str, model: str, request: Request):
+        app.state.requests += 1
+        body = await request.json()
+        await asyncio.sleep(latency)
+
+        async def events():
+            yield f"data: {json.dumps(canned_response(body))}\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    return app
+
+
+def fixture_site(latency: float) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/{name}", response_class=HTMLResponse)
+    async def page(name: str):
+        path = os.path.join(FIXTURES, os.path.basename(name) + ".html")
+        if not os.path.exists(path):
+            path = os.path.join(FIXTURES, "generic", os.path.basename(name) + ".html")
+        if not os.path.exists(path):
+            raise HTTPException(status_code=404)
+
+        await asyncio.sleep(latency)
+        with open(path, encoding="utf-8") as f:
+            return f.read()
+
+    return app
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--site-port", type=int, default=8090)
+    args = parser.parse_args()
+
+    with serve(fixture_site(args.latency), args.site_port) as site:
+        print(f"fixture site on {site}")
+        with serve(fake_gemini(args.latency), args.port) as gemini:
+            print(f"fake Gemini on {gemini}, export GEMINI_BASE_URL={gemini}")
+            try:
+                asyncio.run(asyncio.Event().wait())
+            except KeyboardInterrupt:
+                pass
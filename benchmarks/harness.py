@@ -0,0 +1,100 @@
+# Shared helpers for the offline benchmarks: latency reporting and running
+# ASGI stand-ins (fake Gemini, fixture recipe site) on local ports.
+import os
+import random
+import socket
+import statistics
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import uvicorn
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+WORDS = (
+    "onion tomato garlic ginger potato paneer chicken rice dal spinach carrot "
+    "pea cumin coriander turmeric butter cream yogurt lemon basil pasta heat "
+    "oil pan add chopped vegetables saute until soft stir spices simmer"
+).split()
+UNITS = ["cup", "cups", "tbsp", "tsp", "g", "ml", ""]
+
+
+def percentile(values: List[float], p: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(p / 100 * len(ordered)) - 1))
+
+    return ordered[index]
+
+
+def report(name: str, latencies: List[float], elapsed: float) -> None:
+    ms = [latency * 1000 for latency in latencies]
+    print(
+        f"{name:<28} n={len(ms):<6} "
+        f"p50={percentile(ms, 50):9.3f}ms p99={percentile(ms, 99):9.3f}ms "
+        f"mean={statistics.fmean(ms):9.3f}ms "
+        f"throughput={len(ms) / elapsed:9.1f}/s"
+    )
+
+
+def measure(name: str, func: Any, rounds: int) -> None:
+    latencies: List[float] = []
+    start = time.perf_counter()
+    for _ in range(rounds):
+        t = time.perf_counter()
+        func()
+        latencies.append(time.perf_counter() - t)
+
+    report(name, latencies, time.perf_counter() - start)
+
+
+def measured_line(rng: random.Random) -> str:
+    amount = rng.choice(["1", "2", "1/2", "1 1/2", "200", "¼"])
+    unit = rng.choice(UNITS)
+    name = " ".join(rng.sample(WORDS, rng.randint(1, 3)))
+
+    return " ".join(part for part in (amount, unit, name) if part)
+
+
+def recipe_document(rng: random.Random) -> dict:
+    return {
+        "title": " ".join(rng.sample(WORDS, 3)),
+        "url": f"https://example.com/{rng.getrandbits(32):x}",
+        "img_url": "",
+        "measured_ingredients": [measured_line(rng) for _ in range(12)],
+        "ingredients": rng.sample(WORDS, 10),
+        "instructions": "\n".join(" ".join(rng.choices(WORDS, k=20)) for _ in range(8)),
+        "cuisine": "Indian",
+    }
+
+
+def fixture(*parts: str) -> str:
+    with open(os.path.join(FIXTURES, *parts), encoding="utf-8") as f:
+        return f.read()
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@contextmanager
+def serve(app: Any, port: int) -> Iterator[str]:
+    server = uvicorn.Server(
+        uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning")
+    )
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+
+    try:
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        server.should_exit = True
+        thread.join()
@@ -0,0 +1,160 @@
+# End-to-end load scenarios against the FastAPI app, fully offline: Gemini is
+# replaced by the fake in benchmarks/fakes.py and recipe pages are served from
+# benchmarks/fixtures, both with configurable latency. Needs a throwaway local
+# mongod (the app writes to its usual database; bench documents are removed
+# afterwards), e.g. `docker run -p 27017:27017 mongo`.
+#
+#   python benchmarks/load_bench.py --gemini-latency 0.8 --site-latency 0.3
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import httpx
+
+from fakes import CANNED_RECIPE, fake_gemini, fixture_site
+from harness import free_port, recipe_document, report, serve
+
+MONGO_URI = os.getenv("BENCH_MONGO_URI", "mongodb://localhost:27017")
+BENCH_TITLE = "bench-load"
+SITE_PAGES = ["hebbarskitchen", "vegrecipesofindia", "masoor_dal"]
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    name: str,
+    call: Callable[[int], Any],
+    requests: int,
+    concurrency: int,
+) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    errors = 0
+
+    async def one(n: int) -> None:
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            response: httpx.Response = await call(n)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(n) for n in range(requests)))
+    report(name, latencies, time.perf_counter() - start)
+    if errors:
+        print(f"{'':<28} {errors} requests failed")
+
+
+async def run_load(
+    base_url: str, site: str, recipe_ids: List[str], args: argparse.Namespace
+) -> None:
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(
+        base_url=base_url, limits=limits, timeout=120
+    ) as client:
+        scenarios: Dict[str, Callable[[int], Any]] = {
+            "GET /api/recipes?limit=50": lambda n: client.get(
+                "/api/recipes", params={"limit": 50}
+            ),
+            "GET /api/recipes/summary": lambda n: client.get("/api/recipes/summary"),
+            "GET /api/recipe/{id}": lambda n: client.get(
+                f"/api/recipe/{recipe_ids[n % len(recipe_ids)]}"
+            ),
+            "POST add_manual burst": lambda n: client.post(
+                "/api/recipe/add_manual",
+                json={
+                    "title": f"{BENCH_TITLE} manual {n}",
+                    "ingredients": ["1 cup toor dal", "2 cups water", "1 tsp salt"],
+                    "instructions": "Boil\nSimmer",
+                },
+            ),
+            "POST add_auto url": lambda n: client.post(
+                "/api/recipe/add_auto",
+                json={"request": f"{site}/{SITE_PAGES[n % len(SITE_PAGES)]}?n={n}"},
+            ),
+            "POST add_auto prompt": lambda n: client.post(
+                "/api/recipe/add_auto", json={"request": f"{BENCH_TITLE} dal {n}"}
+            ),
+        }
+
+        for name, call in scenarios.items():
+            if args.only and not any(o in name for o in args.only):
+                continue
+            requests = args.requests if name.startswith("GET") else args.writes
+            await run_scenario(client, name, call, requests, args.concurrency)
+
+
+def main(args: argparse.Namespace) -> None:
+    gemini_port, site_port, app_port = free_port(), free_port(), free_port()
+    workdir = tempfile.mkdtemp(prefix="thyme-bench-")
+
+    os.environ.update(
+        {
+            "MONGO_URI": MONGO_URI,
+            "GEMINI_API_KEY": "bench",
+            "GEMINI_BASE_URL": f"http://127.0.0.1:{gemini_port}",
+            "AI_CACHE_PATH": os.path.join(workdir, "ai_cache.sqlite3"),
+            "IMAGE_STORE_PATH": os.path.join(workdir, "images"),
+        }
+    )
+
+    import main as app_main
+    from mongo_utils import MongoUtils
+
+    mongo = MongoUtils(MONGO_URI)
+    rng = random.Random(args.seed)
+    documents = [
+        {**recipe_document(rng), "title": f"{BENCH_TITLE} {n}"}
+        for n in range(args.seed_recipes)
+    ]
+    recipe_ids = [
+        str(i) for i in mongo.recipes_collection.insert_many(documents).inserted_ids
+    ]
+
+    try:
+        with (
+            serve(fake_gemini(args.gemini_latency), gemini_port),
+            serve(fixture_site(args.site_latency), site_port) as site,
+            serve(app_main.app, app_port) as base_url,
+        ):
+            print(
+                f"recipes={args.seed_recipes} concurrency={args.concurrency} "
+                f"gemini_latency={args.gemini_latency}s "
+                f"site_latency={args.site_latency}s"
+            )
+            asyncio.run(run_load(base_url, site, recipe_ids, args))
+    finally:
+        bench_filter = {
+            "$or": [
+                {"title": {"$regex": f"^{BENCH_TITLE}"}},
+                {"url": {"$regex": f"^http://127.0.0.1:{site_port}/"}},
+                {"title": CANNED_RECIPE["title"]},
+            ]
+        }
+        ids = [
+            r["_id"] for r in mongo.recipes_collection.find(bench_filter, {"_id": 1})
+        ]
+        mongo.recipes_collection.delete_many({"_id": {"$in": ids}})
+        mongo.db.jobs.delete_many({"payload.recipe_id": {"$in": [str(i) for i in ids]}})
+        mongo.client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--writes", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--seed-recipes", type=int, default=500)
+    parser.add_argument("--gemini-latency", type=float, default=0.5)
+    parser.add_argument("--site-latency", type=float, default=0.2)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--only", nargs="*", help="run scenarios matching these")
+    main(parser.parse_args())
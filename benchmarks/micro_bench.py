@@ -0,0 +1,108 @@
+# Offline microbenchmarks with p50/p99 per call:
+#   parse      - WprmScraper / GenericScraper over the saved fixture pages
+#   validate   - Recipe and RecipeDetails Pydantic validation
+#   ingredients- merging measured ingredient lines for a shopping list (the
+#                path that replaced get_unique_ingredients)
+#   parser     - local ingredient parser over the same lines, cold and cached
+import argparse
+import glob
+import json
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from harness import FIXTURES, measure, recipe_document
+
+from custom_scrapers import GenericScraper, WprmScraper
+from ingredient_parser import IngredientParser
+from ingredient_quantities import merge_measured_ingredients
+from models import Recipe, RecipeDetails
+
+
+def bench_parse(rounds: int) -> None:
+    pages = [(WprmScraper, p) for p in glob.glob(os.path.join(FIXTURES, "*.html"))]
+    pages += [
+        (GenericScraper, p)
+        for p in glob.glob(os.path.join(FIXTURES, "generic", "*.html"))
+    ]
+
+    for scraper_cls, path in sorted(pages, key=lambda p: p[1]):
+        with open(path, encoding="utf-8") as f:
+            html = f.read()
+        name = os.path.splitext(os.path.basename(path))[0]
+        url = f"http://127.0.0.1/{name}"
+
+        measure(
+            f"parse {name}",
+            lambda: scraper_cls().parse(html, url),
+            rounds,
+        )
+
+
+def bench_validate(rounds: int, rng: random.Random) -> None:
+    documents = [recipe_document(rng) for _ in range(rounds)]
+    details = json.dumps({"cuisine": "indian", "ingredients": ["dal"] * 12})
+    it = iter(documents)
+
+    measure("validate Recipe", lambda: Recipe.model_validate(next(it)), rounds)
+    measure(
+        "validate RecipeDetails json",
+        lambda: RecipeDetails.model_validate_json(details),
+        rounds,
+    )
+
+
+def bench_ingredients(rounds: int, recipes: int, rng: random.Random) -> None:
+    lines = [
+        line
+        for _ in range(recipes)
+        for line in recipe_document(rng)["measured_ingredients"]
+    ]
+
+    measure(
+        f"merge {recipes} recipes",
+        lambda: merge_measured_ingredients(lines),
+        rounds,
+    )
+
+
+def bench_parser(rounds: int, recipes: int, rng: random.Random) -> None:
+    lines = [
+        line
+        for _ in range(recipes)
+        for line in recipe_document(rng)["measured_ingredients"]
+    ]
+    cold, warm = IngredientParser(cache_size=0), IngredientParser()
+    warm.parse_many(lines)
+
+    measure(
+        f"parse {len(lines)} lines cold",
+        lambda: cold.parse_many(lines),
+        rounds,
+    )
+    measure(
+        f"parse {len(lines)} lines cached",
+        lambda: warm.parse_many(lines),
+        rounds,
+    )
+
+
+def main(rounds: int, recipes: int, seed: int) -> None:
+    rng = random.Random(seed)
+
+    bench_parse(rounds)
+    bench_validate(rounds * 50, rng)
+    bench_ingredients(rounds, recipes, rng)
+    bench_parser(rounds, recipes, rng)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--recipes", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    main(args.rounds, args.recipes, args.seed)
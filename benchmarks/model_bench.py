@@ -0,0 +1,101 @@
+# Compares the per-document cost of turning recipe documents into a JSON list
+# response: the old path (model_validate per document, then FastAPI's
+# response_model validation and JSONResponse) against validating once and
+# serializing the response model directly with model_dump_json.
+import argparse
+import asyncio
+import copy
+import gc
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bson import ObjectId
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from models import Recipe, RecipeListResponse
+from mongo_utils import recipe_from_document
+
+WORDS = (
+    "onion tomato garlic ginger potato paneer chicken rice dal spinach carrot "
+    "pea cumin coriander turmeric butter cream yogurt lemon basil pasta heat "
+    "oil pan add chopped vegetables saute until soft stir spices simmer"
+).split()
+RESPONSE_FIELD = create_model_field("Response_bench", RecipeListResponse)
+
+
+def synthetic_document(rng: random.Random) -> dict:
+    ingredients = rng.sample(WORDS, rng.randint(5, 14))
+    return {
+        "_id": ObjectId(),
+        "id": None,
+        "title": " ".join(rng.sample(WORDS, 3)),
+        "url": f"https://example.com/{rng.randrange(10**9)}",
+        "img_url": f"https://example.com/{rng.randrange(10**9)}.jpg",
+        "ingredients": ingredients,
+        "measured_ingredients": [f"{rng.randint(1, 500)} g {i}" for i in ingredients],
+        "cuisine": rng.choice(["indian", "italian", "thai", "mexican"]),
+        "instructions": " ".join(rng.choices(WORDS, k=rng.randint(60, 200))),
+    }
+
+
+async def validated(documents: list) -> bytes:
+    recipes = []
+    for r in documents:
+        r["_id"] = str(r["_id"])
+        recipes.append(Recipe.model_validate(r))
+
+    content = await serialize_response(
+        field=RESPONSE_FIELD, response_content=RecipeListResponse(recipes=recipes)
+    )
+
+    return JSONResponse(content).body
+
+
+async def direct(documents: list) -> bytes:
+    response = RecipeListResponse(recipes=[recipe_from_document(r) for r in documents])
+
+    return response.model_dump_json(by_alias=True).encode()
+
+
+def measure(path, documents: list, rounds: int) -> float:
+    loop = asyncio.new_event_loop()
+    best = float("inf")
+    for _ in range(rounds):
+        batch = copy.deepcopy(documents)
+        gc.disable()
+        start = time.perf_counter()
+        loop.run_until_complete(path(batch))
+        best = min(best, time.perf_counter() - start)
+        gc.enable()
+
+    loop.close()
+
+    return best * 1e6 / len(documents)
+
+
+def main(docs: int, rounds: int, seed: int) -> None:
+    rng = random.Random(seed)
+    documents = [synthetic_document(rng) for _ in range(docs)]
+
+    before = measure(validated, documents, rounds)
+    after = measure(direct, documents, rounds)
+
+    print(f"{docs} documents, best of {rounds}")
+    print(f"validate + response_model: {before:.2f}us/doc")
+    print(f"validate + dump_json:       {after:.2f}us/doc ({before / after:.1f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--docs", type=int, default=10_000)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    main(args.docs, args.rounds, args.seed)
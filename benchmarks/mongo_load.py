@@ -0,0 +1,98 @@
+# Compares the blocking MongoUtils against AsyncMongoUtils behind async
+# FastAPI routes. Needs a local mongod, e.g. `docker run -p 27017:27017 mongo`.
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from fastapi import FastAPI
+
+from async_mongo_utils import AsyncMongoUtils
+from models import Recipe
+from mongo_utils import MongoUtils
+
+MONGO_URI = os.getenv("BENCH_MONGO_URI", "mongodb://localhost:27017")
+
+RECIPE = Recipe(
+    title="Bench Dal",
+    url="",
+    measured_ingredients=["1 cup toor dal", "2 cups water", "1 tsp salt"],  # type: ignore
+    instructions="Boil\nSimmer",
+)  # type: ignore
+
+
+def blocking_app(mongo: MongoUtils) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/bench/{recipe_id}")
+    async def bench(recipe_id: str):
+        mongo.get_recipe_by_id(recipe_id)
+        mongo.add_recipe(RECIPE)
+        return {"ok": "ok"}
+
+    return app
+
+
+def async_app(mongo: AsyncMongoUtils) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/bench/{recipe_id}")
+    async def bench(recipe_id: str):
+        await mongo.get_recipe_by_id(recipe_id)
+        await mongo.add_recipe(RECIPE)
+        return {"ok": "ok"}
+
+    return app
+
+
+async def run_load(app: FastAPI, recipe_id: str, requests: int, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as c:
+
+        async def one():
+            async with semaphore:
+                r = await c.get(f"/bench/{recipe_id}")
+                r.raise_for_status()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(requests)))
+        elapsed = time.perf_counter() - start
+
+    return requests / elapsed
+
+
+async def main(requests: int, concurrency: int, pool_size: int) -> None:
+    sync_mongo = MongoUtils(MONGO_URI, pool_size)
+    async_mongo = AsyncMongoUtils(MONGO_URI, pool_size)
+    seeded_id = str(sync_mongo.add_recipe(RECIPE))
+
+    try:
+        before = await run_load(
+            blocking_app(sync_mongo), seeded_id, requests, concurrency
+        )
+        after = await run_load(async_app(async_mongo), seeded_id, requests, concurrency)
+    finally:
+        sync_mongo.recipes_collection.delete_many({"title": RECIPE.title})
+        sync_mongo.client.close()
+        await async_mongo.close()
+
+    print(f"requests={requests} concurrency={concurrency} pool={pool_size}")
+    print(f"blocking MongoUtils:    {before:8.1f} req/s")
+    print(f"AsyncMongoUtils:        {after:8.1f} req/s")
+    print(f"speedup:                {after / before:8.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--pool-size", type=int, default=100)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.requests, args.concurrency, args.pool_size))
@@ -0,0 +1,71 @@
+# Runs saved recipe pages from benchmarks/fixtures through the WPRM parsing
+# paths and reports the mean parse time per page:
+#   soup      - BeautifulSoup with html.parser over the whole page (old path)
+#   strained  - BeautifulSoup with lxml and a SoupStrainer on the recipe card
+#   lxml      - WprmScraper.parse (lxml tree, JSON-LD first)
+import argparse
+import glob
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+from custom_scrapers import WprmScraper
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def parse_strained(scraper: WprmScraper, html: str, url: str) -> None:
+    soup = BeautifulSoup(
+        html, "lxml", parse_only=SoupStrainer(class_="wprm-recipe-container")
+    )
+    scraper.extract_ingredients(soup)
+    scraper.extract_instructions(soup)
+    scraper.extract_cuisine(soup)
+
+
+def measure(parse, html: str, url: str, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        parse(html, url)
+
+    return (time.perf_counter() - start) * 1000 / rounds
+
+
+def main(paths: list, rounds: int) -> None:
+    scraper = WprmScraper()
+    paths = paths or sorted(glob.glob(os.path.join(FIXTURES, "*.html")))
+
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            html = f.read()
+        url = f"https://{os.path.splitext(os.path.basename(path))[0]}.com/"
+
+        old = scraper.parse_soup(html, url)
+        new = scraper.parse(html, url)
+        if old.ingredients != new.ingredients or old.title != new.title:
+            print(f"{path}: lxml path disagrees with the soup path")
+
+        soup = measure(scraper.parse_soup, html, url, rounds)
+        strained = measure(
+            lambda h, u: parse_strained(scraper, h, u), html, url, rounds
+        )
+        tree = measure(scraper.parse, html, url, rounds)
+
+        print(
+            f"{os.path.basename(path)} ({len(html) // 1024}KB): "
+            f"soup={soup:.1f}ms strained={strained:.1f}ms lxml={tree:.1f}ms "
+            f"({soup / tree:.0f}x)"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("paths", nargs="*", help="saved HTML pages to parse")
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    main(args.paths, args.rounds)
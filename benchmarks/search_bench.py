@@ -0,0 +1,118 @@
+# Builds the in-process BM25 SearchIndex over a synthetic recipe corpus and
+# reports build time, query latency percentiles and incremental update cost.
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from search_index import SearchIndex
+
+INGREDIENTS = (
+    "onion tomato garlic ginger potato paneer chicken breast rice dal spinach "
+    "cauliflower carrot pea chickpea lentil cumin coriander turmeric chili "
+    "butter cream yogurt lemon basil oregano pasta mozzarella parmesan beef "
+    "pork tofu soy sauce noodle coconut milk mushroom egg flour sugar salt"
+).split()
+CUISINES = "indian italian mexican thai chinese french japanese greek".split()
+DISHES = "curry masala biryani pasta salad soup stew stir fry tacos risotto".split()
+STEPS = (
+    "heat oil in a pan add the chopped vegetables and saute until soft "
+    "stir in the spices and cook for a few minutes then simmer covered"
+).split()
+QUERIES = [
+    "paneer butter masala",
+    "chicken curry",
+    "spinach dal",
+    "thai coconut soup",
+    "italian pasta basil",
+    "mushroom risotto parmesan",
+    "tofu stir fry soy sauce",
+    "mexican tacos beef",
+]
+
+
+def synthetic_vocabulary(rng: random.Random, size: int = 20_000) -> list:
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    return ["".join(rng.choices(letters, k=rng.randint(4, 9))) for _ in range(size)]
+
+
+def synthetic_recipe(rng: random.Random, vocabulary: list) -> dict:
+    ingredients = rng.sample(INGREDIENTS, rng.randint(5, 14))
+    return {
+        "title": " ".join(
+            rng.sample(ingredients, 2)
+            + rng.sample(vocabulary, 1)
+            + [rng.choice(DISHES)]
+        ),
+        "ingredients": ingredients,
+        "cuisine": rng.choice(CUISINES),
+        "instructions": "\n".join(
+            " ".join(
+                rng.choices(STEPS + ingredients, k=rng.randint(8, 20))
+                + rng.sample(vocabulary, rng.randint(2, 8))
+            )
+            for _ in range(rng.randint(4, 10))
+        ),
+    }
+
+
+def percentile(samples: list, p: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p))]
+
+
+def report_search(label: str, index: SearchIndex, rounds: int) -> None:
+    latencies = []
+    for _ in range(rounds):
+        for query in QUERIES:
+            start = time.perf_counter()
+            index.search(query, limit=20)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    first, rest = latencies[: len(QUERIES)], latencies[len(QUERIES) :] or latencies
+    print(
+        f"{label}: first pass max={max(first):.2f}ms, then "
+        f"p50={statistics.median(rest):.2f}ms p99={percentile(rest, 0.99):.2f}ms "
+        f"over {len(rest)} queries"
+    )
+
+
+def main(docs: int, rounds: int, seed: int) -> None:
+    rng = random.Random(seed)
+    vocabulary = synthetic_vocabulary(rng)
+    corpus = [(f"{i:024x}", synthetic_recipe(rng, vocabulary)) for i in range(docs)]
+
+    index = SearchIndex()
+    start = time.perf_counter()
+    index.index_many(corpus)
+    build = time.perf_counter() - start
+    print(f"indexed {docs} recipes, {len(index.postings)} terms in {build:.2f}s")
+
+    report_search("search", index, rounds)
+
+    updates = []
+    for _ in range(1000):
+        id, _ = rng.choice(corpus)
+        start = time.perf_counter()
+        index.index_fields(id, {"title": synthetic_recipe(rng, vocabulary)["title"]})
+        updates.append((time.perf_counter() - start) * 1e6)
+
+    print(f"incremental title update: p50={statistics.median(updates):.1f}us")
+
+    for id, _ in rng.sample(corpus, min(docs, 5000)):
+        index.index_fields(id, synthetic_recipe(rng, vocabulary))
+    report_search("search after 5000 rewrites", index, rounds)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--docs", type=int, default=100_000)
+    parser.add_argument("--rounds", type=int, default=25)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    main(args.docs, args.rounds, args.seed)
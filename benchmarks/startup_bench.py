@@ -0,0 +1,135 @@
+# Measures cold start in fresh interpreters:
+#   import - time to `import main`
+#   live   - process start until /healthz answers (uvicorn bound and serving)
+#   ready  - process start until /readyz is 200 (Mongo reachable, indexes
+#            loaded); skipped with --no-ready when there is no local mongod
+# --importtime prints the slowest top-level imports from `python -X importtime`.
+import argparse
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import httpx
+
+from harness import free_port, percentile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MONGO_URI = os.getenv("BENCH_MONGO_URI", "mongodb://localhost:27017")
+IMPORT_MAIN = (
+    "import time; t = time.perf_counter(); import main; "
+    "print(time.perf_counter() - t)"
+)
+
+
+def bench_env() -> Dict[str, str]:
+    return {**os.environ, "MONGO_URI": MONGO_URI}
+
+
+def import_time() -> float:
+    out = subprocess.run(
+        [sys.executable, "-c", IMPORT_MAIN],
+        cwd=ROOT,
+        env=bench_env(),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def wait_for(url: str, deadline: float) -> Optional[float]:
+    while time.perf_counter() < deadline:
+        try:
+            if httpx.get(url, timeout=0.5).status_code == 200:
+                return time.perf_counter()
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.01)
+
+    return None
+
+
+def serve_times(ready: bool, timeout: float) -> tuple:
+    port = free_port()
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port)],
+        cwd=ROOT,
+        env=bench_env(),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        base = f"http://127.0.0.1:{port}"
+        deadline = start + timeout
+        live = wait_for(f"{base}/healthz", deadline)
+        done = wait_for(f"{base}/readyz", deadline) if ready and live else None
+    finally:
+        process.terminate()
+        process.wait()
+
+    return (
+        live - start if live else None,
+        done - start if done else None,
+    )
+
+
+def summary(name: str, values: List[Optional[float]]) -> None:
+    measured = [v * 1000 for v in values if v is not None]
+    if not measured:
+        print(f"{name:<8} no successful runs")
+        return
+
+    print(
+        f"{name:<8} n={len(measured):<3} p50={percentile(measured, 50):8.1f}ms "
+        f"p99={percentile(measured, 99):8.1f}ms max={max(measured):8.1f}ms"
+    )
+
+
+def print_importtime(top: int) -> None:
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=ROOT,
+        env=bench_env(),
+        capture_output=True,
+        text=True,
+    )
+    rows = []
+    for line in out.stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        name = parts[2].rstrip()
+        if len(name) - len(name.lstrip()) <= 3:
+            rows.append((int(parts[1]), name.strip()))
+
+    for cumulative, name in sorted(rows, reverse=True)[:top]:
+        print(f"{cumulative / 1000:8.1f}ms  {name}")
+
+
+def main(runs: int, ready: bool, timeout: float, importtime: int) -> None:
+    summary("import", [import_time() for _ in range(runs)])
+
+    served = [serve_times(ready, timeout) for _ in range(runs)]
+    summary("live", [live for live, _ in served])
+    if ready:
+        summary("ready", [done for _, done in served])
+
+    if importtime:
+        print_importtime(importtime)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--no-ready", action="store_true")
+    parser.add_argument("--importtime", type=int, default=0, metavar="TOP")
+    args = parser.parse_args()
+
+    main(args.runs, not args.no_ready, args.timeout, args.importtime)
@@ -0,0 +1,174 @@
+import asyncio
+import logging
+import os
+import uuid
+from collections import OrderedDict
+from typing import Awaitable, Callable, List, Optional, Set, Tuple
+
+from bson import ObjectId
+
+from async_mongo_utils import AsyncMongoUtils
+from custom_scrapers import ScrapeCacheEntry
+from models import BulkImportItemStatus, BulkImportJobResponse, Recipe
+from recipe_dedup import DuplicateMatch
+
+BULK_IMPORT_CONCURRENCY = int(os.getenv("BULK_IMPORT_CONCURRENCY", 16))
+BULK_IMPORT_MAX_JOBS = int(os.getenv("BULK_IMPORT_MAX_JOBS", 100))
+
+logger = logging.getLogger(__name__)
+
+
+class BulkImportJob:
+    def __init__(self, requests: List[str], reuse_existing: bool) -> None:
+        self.id: str = uuid.uuid4().hex
+        self.status: str = "pending"
+        self.reuse_existing = reuse_existing
+        self.items: List[BulkImportItemStatus] = [
+            BulkImportItemStatus(request=r, status="pending") for r in requests
+        ]
+
+    def to_response(self) -> BulkImportJobResponse:
+        return BulkImportJobResponse(
+            id=self.id,
+            status=self.status,
+            total=len(self.items),
+            completed=sum(i.status in ("stored", "existing") for i in self.items),
+            failed=sum(i.status == "failed" for i in self.items),
+            items=self.items,
+        )
+
+
+class BulkImporter:
+    def __init__(
+        self,
+        mongo: AsyncMongoUtils,
+        is_url: Callable[[str], bool],
+        scrape: Callable[[str], Awaitable[ScrapeCacheEntry]],
+        generate: Callable[[str], Awaitable[Optional[Recipe]]],
+        enrich: Callable[[ObjectId, str, Recipe], Awaitable[str]],
+        find_duplicate: Callable[[Recipe], Optional[DuplicateMatch]],
+        concurrency: int = BULK_IMPORT_CONCURRENCY,
+        max_jobs: int = BULK_IMPORT_MAX_JOBS,
+    ) -> None:
+        self.mongo = mongo
+        self.is_url = is_url
+        self.scrape = scrape
+        self.generate = generate
+        self.enrich = enrich
+        self.find_duplicate = find_duplicate
+        self.concurrency = concurrency
+        self.max_jobs = max_jobs
+        self.jobs: OrderedDict[str, BulkImportJob] = OrderedDict()
+        self.tasks: Set[asyncio.Task] = set()
+
+    def start(self, requests: List[str], reuse_existing: bool = False) -> BulkImportJob:
+        job = BulkImportJob(requests, reuse_existing)
+        self.jobs[job.id] = job
+        while len(self.jobs) > self.max_jobs:
+            self.jobs.popitem(last=False)
+
+        task = asyncio.create_task(self.run(job))
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+        return job
+
+    def get(self, job_id: str) -> Optional[BulkImportJob]:
+        return self.jobs.get(job_id)
+
+    async def stop(self) -> None:
+        for task in self.tasks:
+            task.cancel()
+
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+
+    async def run(self, job: BulkImportJob) -> None:
+        job.status = "running"
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        try:
+            prepared = await asyncio.gather(
+                *(
+                    self.prepare(job, index, semaphore)
+                    for index in range(len(job.items))
+                )
+            )
+            ready: List[Tuple[int, Recipe, bool]] = []
+            duplicates: List[Optional[str]] = []
+            for index, recipe, needs_enrichment in filter(None, prepared):
+                duplicate: Optional[DuplicateMatch] = self.find_duplicate(recipe)
+                if duplicate and duplicate.merged:
+                    job.items[index].status = "existing"
+                    job.items[index].recipe_id = duplicate.id
+                    job.items[index].duplicate_of = duplicate.id
+                    continue
+
+                ready.append((index, recipe, needs_enrichment))
+                duplicates.append(duplicate.id if duplicate else None)
+
+            if ready:
+                stored: List[Tuple[ObjectId, bool]] = await self.mongo.add_recipes(
+                    [recipe for _, recipe, _ in ready], duplicates
+                )
+                for (
+                    (index, recipe, needs_enrichment),
+                    (recipe_id, existed),
+                    duplicate_of,
+                ) in zip(ready, stored, duplicates):
+                    if existed:
+                        job.items[index].status = "existing"
+                        job.items[index].recipe_id = str(recipe_id)
+                        job.items[index].duplicate_of = str(recipe_id)
+                        continue
+
+                    job.items[index].status = "stored"
+                    job.items[index].recipe_id = str(recipe_id)
+                    job.items[index].duplicate_of = duplicate_of
+                    if needs_enrichment:
+                        await self.enrich(recipe_id, recipe.url or "", recipe)
+
+            job.status = "done"
+        except Exception as e:
+            job.status = "failed"
+            logger.error(f"bulk import {job.id} failed: {e}")
+            for item in job.items:
+                if item.status not in ("stored", "existing", "failed"):
+                    item.status = "failed"
+                    item.error = str(e)
+
+        logger.info(f"bulk import {job.id} finished with status {job.status}")
+
+    async def prepare(
+        self, job: BulkImportJob, index: int, semaphore: asyncio.Semaphore
+    ) -> Optional[Tuple[int, Recipe, bool]]:
+        item: BulkImportItemStatus = job.items[index]
+
+        async with semaphore:
+            try:
+                if not self.is_url(item.request):
+                    item.status = "generating"
+                    recipe: Optional[Recipe] = await self.generate(item.request)
+                    if not recipe:
+                        raise ValueError("No recipe generated")
+                    item.status = "ready"
+
+                    return index, recipe, False
+
+                if job.reuse_existing:
+                    existing_id: Optional[ObjectId] = (
+                        await self.mongo.find_recipe_id_by_url(item.request)
+                    )
+                    if existing_id:
+                        item.status = "existing"
+                        item.recipe_id = str(existing_id)
+                        return None
+
+                item.status = "scraping"
+                scraped: ScrapeCacheEntry = await self.scrape(item.request)
+                item.status = "ready"
+
+                return index, scraped.recipe, scraped.needs_enrichment
+            except Exception as e:
+                item.status = "failed"
+                item.error = str(e)
+                return None
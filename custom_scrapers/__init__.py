@@ -1,14 +1,39 @@
-from typing import List, Type
+import importlib
+from typing import Any, Dict, List, Type
 
-from .custom_scraper import CustomScraper
-from .wprm_scraper import WprmScraper
+from .custom_scraper import (
+    CustomScraper,
+    close_scrapers,
+    host_limit,
+    http_client,
+    run_parser,
+)
+from .registry import ScraperRegistry, normalize_host, registry
+from .scrape_cache import ScrapeCache, ScrapeCacheEntry
+
+LAZY_EXPORTS: Dict[str, str] = {
+    "GenericScraper": ".generic_scraper",
+    "WprmScraper": ".wprm_scraper",
+}
+
+registry.add(
+    "custom_scrapers.wprm_scraper:WprmScraper",
+    ("hebbarskitchen.com", "vegrecipesofindia.com"),
+    markup="wprm-recipe-ingredients-container",
+)
+registry.load_entry_points()
+
+
+def __getattr__(name: str) -> Any:
+    if name not in LAZY_EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    return getattr(importlib.import_module(LAZY_EXPORTS[name], __name__), name)
 
 
 def custom_scraper_base_urls() -> List[str]:
-    return WprmScraper.base_urls
+    return registry.registered_hosts()
 
 
 def get_scrapper(url: str) -> Type[CustomScraper]:
-    scraper = {url: WprmScraper for url in WprmScraper.base_urls}
-
-    return scraper[url]
+    return registry.scraper_for(url)
@@ -1,18 +1,115 @@
+import asyncio
+import os
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Dict, Optional, TypeVar
+from urllib.parse import urlparse
 
-import requests
+import httpx
+
+from metrics import instrument
+from models import Recipe
+
+T = TypeVar("T")
+
+HEADERS: Dict[str, str] = {
+    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/141.0.0.0 Safari/537.36"
+}
+FETCH_TIMEOUT = httpx.Timeout(float(os.getenv("SCRAPER_TIMEOUT", 15)), connect=5.0)
+MAX_CONNECTIONS = int(os.getenv("SCRAPER_MAX_CONNECTIONS", 100))
+PER_HOST_CONCURRENCY = int(os.getenv("SCRAPER_PER_HOST_CONCURRENCY", 4))
+PARSE_WORKERS = int(os.getenv("SCRAPER_PARSE_WORKERS", os.cpu_count() or 4))
+
+
+@dataclass
+class FetchedPage:
+    status_code: int
+    html: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
+@dataclass
+class HostLimit:
+    semaphore: asyncio.Semaphore
+    users: int = 0
+
+
+_client: Optional[httpx.AsyncClient] = None
+_host_limits: Dict[str, HostLimit] = {}
+_parse_pool: Optional[ThreadPoolExecutor] = None
+
+
+def http_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            headers=HEADERS,
+            http2=True,
+            timeout=FETCH_TIMEOUT,
+            follow_redirects=True,
+            limits=httpx.Limits(
+                max_connections=MAX_CONNECTIONS,
+                max_keepalive_connections=MAX_CONNECTIONS // 2,
+            ),
+        )
+
+    return _client
+
+
+@asynccontextmanager
+async def host_limit(url: str) -> AsyncIterator[None]:
+    host: str = urlparse(url).netloc
+    limit: HostLimit = _host_limits.setdefault(
+        host, HostLimit(asyncio.Semaphore(PER_HOST_CONCURRENCY))
+    )
+    limit.users += 1
+
+    try:
+        async with limit.semaphore:
+            yield
+    finally:
+        limit.users -= 1
+        if not limit.users and _host_limits.get(host) is limit:
+            del _host_limits[host]
+
+
+async def run_parser(func: Callable[..., T], *args: Any) -> T:
+    global _parse_pool
+    if _parse_pool is None:
+        _parse_pool = ThreadPoolExecutor(
+            max_workers=PARSE_WORKERS, thread_name_prefix="scraper-parse"
+        )
+
+    return await asyncio.get_running_loop().run_in_executor(_parse_pool, func, *args)
+
+
+async def close_scrapers() -> None:
+    global _client, _parse_pool
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+    if _parse_pool is not None:
+        _parse_pool.shutdown(wait=False, cancel_futures=True)
+        _parse_pool = None
+
+    _host_limits.clear()
 
 
 class CustomScraper(ABC):
+    needs_enrichment: bool = False
+
     def __init__(self):
         pass
 
+    @instrument("fetch")
     def get_html_content(self, url):
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/141.0.0.0 Safari/537.36"
-        }
+        import requests
 
-        r = requests.get(url, headers=headers)
+        r = requests.get(url, headers=HEADERS, timeout=FETCH_TIMEOUT.read)
 
         if r.status_code == 200:
 
@@ -20,6 +117,48 @@ class CustomScraper(ABC):
 
         raise RuntimeError(f"Failed to fetch website: {url}")
 
+    async def fetch_html_content(self, url: str) -> str:
+        page: FetchedPage = await self.fetch_page(url)
+
+        return page.html
+
+    @instrument("fetch")
+    async def fetch_page(
+        self,
+        url: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> FetchedPage:
+        headers: Dict[str, str] = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
+        async with host_limit(url):
+            r = await http_client().get(url, headers=headers)
+
+        if r.status_code == 304 and headers:
+            return FetchedPage(304, "", etag, last_modified)
+
+        if r.status_code == 200:
+            return FetchedPage(
+                200,
+                r.text,
+                r.headers.get("ETag"),
+                r.headers.get("Last-Modified"),
+            )
+
+        raise RuntimeError(f"Failed to fetch website: {url}")
+
+    def scrape(self, url) -> Recipe:
+        return self.parse(self.get_html_content(url), url)
+
+    async def scrape_async(self, url: str) -> Recipe:
+        html: str = await self.fetch_html_content(url)
+
+        return await run_parser(self.parse, html, url)
+
     @abstractmethod
-    def scrape(self, url):
+    def parse(self, html: str, url: str) -> Recipe:
         pass
@@ -0,0 +1,46 @@
+import logging
+from typing import List, Optional, Type
+
+from recipe_scrapers import scrape_html
+
+from metrics import timed
+from models import Recipe
+
+from .custom_scraper import CustomScraper
+from .registry import registry
+
+logger = logging.getLogger(__name__)
+
+
+class GenericScraper(CustomScraper):
+    needs_enrichment: bool = True
+
+    def __init__(self):
+        pass
+
+    def parse(self, html: str, url: str) -> Recipe:
+        markup_scraper: Optional[Type[CustomScraper]] = registry.scraper_for_markup(
+            html
+        )
+        if markup_scraper:
+            try:
+                recipe: Recipe = markup_scraper().parse(html, url)
+                self.needs_enrichment = markup_scraper.needs_enrichment
+                return recipe
+            except Exception as e:
+                logger.info(f"{markup_scraper.__name__} could not parse {url}: {e}")
+
+        with timed("parse", "recipe_scrapers"):
+            scraper = scrape_html(html, org_url=url, supported_only=False)
+        measured_ingredients: List[str] = scraper.ingredients()
+        instructions: str = scraper.instructions()
+        title: str = scraper.title()
+        img_url: str = scraper.image()
+
+        return Recipe(
+            title=title,
+            url=url,
+            img_url=img_url,
+            measured_ingredients=measured_ingredients,  # type: ignore
+            instructions=instructions,
+        )  # type: ignore
@@ -0,0 +1,72 @@
+import json
+from typing import Any, Dict, Iterable, List, Optional
+
+
+def is_recipe(node: Any) -> bool:
+    if not isinstance(node, dict):
+        return False
+
+    types = node.get("@type")
+    return "Recipe" in (types if isinstance(types, list) else [types])
+
+
+def find_recipe(node: Any) -> Optional[Dict[str, Any]]:
+    if is_recipe(node):
+        return node
+
+    if isinstance(node, dict):
+        node = node.get("@graph", [])
+
+    if isinstance(node, list):
+        for child in node:
+            recipe = find_recipe(child)
+            if recipe:
+                return recipe
+
+    return None
+
+
+def recipe_json_ld(blocks: Iterable[str]) -> Optional[Dict[str, Any]]:
+    for block in blocks:
+        try:
+            recipe = find_recipe(json.loads(block))
+        except ValueError:
+            continue
+        if recipe:
+            return recipe
+
+    return None
+
+
+def json_ld_text(value: Any) -> str:
+    if isinstance(value, list):
+        return ", ".join(json_ld_text(v) for v in value if v)
+    if isinstance(value, dict):
+        return json_ld_text(value.get("name") or value.get("text"))
+
+    return str(value or "").strip()
+
+
+def json_ld_image(value: Any) -> str:
+    if isinstance(value, list):
+        return json_ld_image(value[0]) if value else ""
+    if isinstance(value, dict):
+        return str(value.get("url") or "")
+
+    return str(value or "")
+
+
+def json_ld_instructions(value: Any) -> List[str]:
+    if isinstance(value, str):
+        return [value.strip()] if value.strip() else []
+    if isinstance(value, list):
+        return [line for v in value for line in json_ld_instructions(v)]
+    if not isinstance(value, dict):
+        return []
+
+    if value.get("@type") == "HowToSection":
+        steps = json_ld_instructions(value.get("itemListElement", []))
+        name = json_ld_text(value.get("name"))
+        return [name.capitalize(), *steps] if name else steps
+
+    return json_ld_instructions(value.get("text") or value.get("name") or "")
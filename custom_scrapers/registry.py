@@ -0,0 +1,93 @@
+import importlib
+import logging
+import threading
+from importlib.metadata import entry_points
+from typing import Callable, Dict, List, Optional, Tuple, Type, Union
+from urllib.parse import urlparse
+
+from .custom_scraper import CustomScraper
+
+ENTRY_POINT_GROUP = "thyme_api.scrapers"
+DEFAULT_SCRAPER = "custom_scrapers.generic_scraper:GenericScraper"
+
+ScraperSpec = Union[Type[CustomScraper], str]
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_host(url: str) -> str:
+    parsed = urlparse(url if "//" in url else f"//{url}")
+    host: str = (parsed.hostname or "").lower().rstrip(".")
+
+    return host.removeprefix("www.")
+
+
+def load_scraper(spec: str) -> Type[CustomScraper]:
+    module_name, _, class_name = spec.partition(":")
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+class ScraperRegistry:
+    def __init__(self, default: ScraperSpec = DEFAULT_SCRAPER) -> None:
+        self.lock = threading.Lock()
+        self.hosts: Dict[str, ScraperSpec] = {}
+        self.markups: List[Tuple[str, ScraperSpec]] = []
+        self.default = default
+
+    def register(
+        self, *hosts: str, markup: Optional[str] = None
+    ) -> Callable[[Type[CustomScraper]], Type[CustomScraper]]:
+        def decorator(scraper: Type[CustomScraper]) -> Type[CustomScraper]:
+            self.add(scraper, hosts, markup)
+            return scraper
+
+        return decorator
+
+    def add(
+        self, scraper: ScraperSpec, hosts: Tuple[str, ...], markup: Optional[str] = None
+    ) -> None:
+        with self.lock:
+            for host in hosts:
+                self.hosts[normalize_host(host)] = scraper
+            if markup:
+                self.markups.append((markup, scraper))
+
+    def load_entry_points(self, group: str = ENTRY_POINT_GROUP) -> None:
+        for entry_point in entry_points(group=group):
+            self.add(entry_point.value, (entry_point.name,))
+
+    def resolve(self, spec: ScraperSpec) -> Type[CustomScraper]:
+        if not isinstance(spec, str):
+            return spec
+
+        scraper: Type[CustomScraper] = load_scraper(spec)
+        with self.lock:
+            for host, registered in self.hosts.items():
+                if registered == spec:
+                    self.hosts[host] = scraper
+            self.markups = [(m, scraper if s == spec else s) for m, s in self.markups]
+            if self.default == spec:
+                self.default = scraper
+
+        return scraper
+
+    def scraper_for(self, url: str) -> Type[CustomScraper]:
+        spec: ScraperSpec = self.hosts.get(normalize_host(url), self.default)
+        try:
+            return self.resolve(spec)
+        except (ImportError, AttributeError) as e:
+            logger.error(f"could not load scraper {spec}: {e}")
+            return self.resolve(self.default)
+
+    def scraper_for_markup(self, html: str) -> Optional[Type[CustomScraper]]:
+        for markup, spec in self.markups:
+            if markup in html:
+                return self.resolve(spec)
+
+        return None
+
+    def registered_hosts(self) -> List[str]:
+        return sorted(self.hosts)
+
+
+registry = ScraperRegistry()
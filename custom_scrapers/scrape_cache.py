@@ -0,0 +1,76 @@
+import os
+import time
+from dataclasses import dataclass
+from typing import List, Optional
+
+from cachetools import LRUCache
+
+from models import Recipe
+
+from .custom_scraper import CustomScraper, FetchedPage, run_parser
+
+SCRAPE_CACHE_SIZE = int(os.getenv("SCRAPE_CACHE_SIZE", 1024))
+SCRAPE_CACHE_TTL = float(os.getenv("SCRAPE_CACHE_TTL", 6 * 60 * 60))
+
+
+@dataclass
+class ScrapeCacheEntry:
+    recipe: Recipe
+    needs_enrichment: bool
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fetched_at: float
+
+
+class ScrapeCache:
+    def __init__(
+        self, maxsize: int = SCRAPE_CACHE_SIZE, ttl: float = SCRAPE_CACHE_TTL
+    ) -> None:
+        self.ttl = ttl
+        self.entries: LRUCache = LRUCache(maxsize=maxsize)
+
+    async def scrape(self, url: str, scraper: CustomScraper) -> ScrapeCacheEntry:
+        entry: Optional[ScrapeCacheEntry] = self.entries.get(url)
+        if entry and time.monotonic() - entry.fetched_at < self.ttl:
+            return self._copy(entry)
+
+        page: FetchedPage = await scraper.fetch_page(
+            url,
+            entry.etag if entry else None,
+            entry.last_modified if entry else None,
+        )
+
+        if entry and page.status_code == 304:
+            entry.fetched_at = time.monotonic()
+            return self._copy(entry)
+
+        recipe: Recipe = await run_parser(scraper.parse, page.html, url)
+        entry = ScrapeCacheEntry(
+            recipe=recipe,
+            needs_enrichment=scraper.needs_enrichment,
+            etag=page.etag,
+            last_modified=page.last_modified,
+            fetched_at=time.monotonic(),
+        )
+        self.entries[url] = entry
+
+        return self._copy(entry)
+
+    def record_details(self, url: str, ingredients: List[str], cuisine: str) -> None:
+        entry: Optional[ScrapeCacheEntry] = self.entries.get(url)
+        if not entry:
+            return
+
+        entry.recipe = entry.recipe.model_copy(
+            update={"ingredients": ingredients, "cuisine": cuisine}
+        )
+        entry.needs_enrichment = False
+
+    def _copy(self, entry: ScrapeCacheEntry) -> ScrapeCacheEntry:
+        return ScrapeCacheEntry(
+            recipe=entry.recipe.model_copy(deep=True),
+            needs_enrichment=entry.needs_enrichment,
+            etag=entry.etag,
+            last_modified=entry.last_modified,
+            fetched_at=entry.fetched_at,
+        )
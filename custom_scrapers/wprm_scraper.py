@@ -1,30 +1,122 @@
 import logging
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
+import lxml.html
 from bs4 import BeautifulSoup
 from bs4.element import ResultSet, Tag
+from lxml.etree import ParserError
 
+from metrics import instrument
 from models import Ingredients, Recipe
 
 from .custom_scraper import CustomScraper
+from .json_ld import json_ld_image, json_ld_instructions, json_ld_text, recipe_json_ld
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
 
-class WprmScraper(CustomScraper):
-    base_urls: List[str] = [
-        "https://hebbarskitchen.com",
-        "https://www.vegrecipesofindia.com",
-    ]
+def class_xpath(name: str) -> str:
+    return f".//*[contains(concat(' ', normalize-space(@class), ' '), ' {name} ')]"
+
+
+def element_classes(element: lxml.html.HtmlElement) -> List[str]:
+    return (element.get("class") or "").split()
+
+
+def first_text(root: lxml.html.HtmlElement, name: str) -> str:
+    found: List[lxml.html.HtmlElement] = root.xpath(class_xpath(name))
+    return found[0].text_content() if found else ""
 
+
+class WprmScraper(CustomScraper):
     def __init__(self):
         pass
 
-    def scrape(self, url) -> Recipe:
+    @instrument("parse")
+    def parse(self, html: str, url: str) -> Recipe:
         try:
-            html: str = self.get_html_content(url)
+            return self.parse_tree(lxml.html.fromstring(html), url)
+        except (ParserError, ValueError, RuntimeError) as e:
+            logger.info(f"falling back to BeautifulSoup for {url}: {e}")
+            return self.parse_soup(html, url)
+
+    def parse_tree(self, tree: lxml.html.HtmlElement, url: str) -> Recipe:
+        containers: List[lxml.html.HtmlElement] = tree.xpath(
+            class_xpath("wprm-recipe-container")
+        )
+        if not containers:
+            raise RuntimeError(f"No recipe container in {url}")
+
+        container: lxml.html.HtmlElement = containers[0]
+        json_ld: Dict[str, Any] = (
+            recipe_json_ld(tree.xpath("//script[@type='application/ld+json']/text()"))
+            or {}
+        )
+
+        ingredients: Ingredients = self.extract_ingredients_tree(container)
+        if not ingredients.measured_ingredients:
+            raise RuntimeError(f"Could not get ingredients for {url}")
+
+        instructions: List[str] = [
+            step[:1].upper() + step[1:]
+            for step in json_ld_instructions(json_ld.get("recipeInstructions"))
+        ] or self.extract_instructions_tree(container)
+        if not instructions:
+            raise RuntimeError(f"Could not extract instructions for {url}")
+
+        cuisine: str = json_ld_text(json_ld.get("recipeCuisine")) or first_text(
+            container, "wprm-recipe-cuisine"
+        )
+
+        return Recipe(
+            title=json_ld_text(json_ld.get("name"))
+            or first_text(container, "wprm-recipe-name"),
+            url=url,
+            img_url=json_ld_image(json_ld.get("image")),
+            measuredIngredients=ingredients.measured_ingredients,
+            ingredients=ingredients.ingredients or [],
+            instructions="\n".join(instructions),
+            cuisine=cuisine.capitalize() or None,
+        )
+
+    def extract_ingredients_tree(self, container: lxml.html.HtmlElement) -> Ingredients:
+        ingredients: List[str] = []
+        measured_ingredients: List[str] = []
+
+        for group in container.xpath(class_xpath("wprm-recipe-ingredient-group")):
+            for li in group.iter("li"):
+                parts: Dict[str, str] = {}
+                for span in li.iter("span"):
+                    for name in element_classes(span):
+                        if name.startswith("wprm-recipe-ingredient-"):
+                            parts.setdefault(name[23:], span.text_content())
+
+                name: str = parts.get("name", "")
+                measured_ingredients.append(
+                    " ".join([parts.get("amount", ""), parts.get("unit", ""), name])
+                )
+                ingredients.append(name)
+
+        return Ingredients(
+            ingredients=ingredients, measured_ingredients=measured_ingredients
+        )
 
+    def extract_instructions_tree(self, container: lxml.html.HtmlElement) -> List[str]:
+        instructions: List[str] = []
+
+        for group in container.xpath(class_xpath("wprm-recipe-instruction-group")):
+            group_name: str = first_text(group, "wprm-recipe-group-name")
+            if group_name:
+                instructions.append(group_name.capitalize())
+
+            for steps in group.xpath(class_xpath("wprm-recipe-instructions")):
+                instructions.append(steps.text_content().capitalize())
+
+        return instructions
+
+    def parse_soup(self, html: str, url: str) -> Recipe:
+        try:
             soup = BeautifulSoup(html, "html.parser")
             recipe_name_tag: Optional[Tag] = soup.find(class_="wprm-recipe-name")
             if recipe_name_tag:
@@ -0,0 +1,123 @@
+import asyncio
+import logging
+import os
+import time
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Set, Tuple
+
+from bson import ObjectId
+
+from async_mongo_utils import AsyncMongoUtils
+from job_queue import Job, JobQueue
+from models import RecipeDetails
+
+if TYPE_CHECKING:
+    from ai_tasks import ExtractRecipeDetailsTask
+
+ENRICHMENT_BATCH_SIZE = int(os.getenv("ENRICHMENT_BATCH_SIZE", 10))
+ENRICHMENT_REQUESTS_PER_MINUTE = float(os.getenv("ENRICHMENT_REQUESTS_PER_MINUTE", 30))
+
+ENRICHMENT_JOB = "enrich_recipe"
+
+logger = logging.getLogger(__name__)
+
+
+def enrichment_job_key(recipe_id: ObjectId) -> str:
+    return f"{ENRICHMENT_JOB}:{recipe_id}"
+
+
+class RateLimiter:
+    def __init__(self, requests_per_minute: float) -> None:
+        self.interval = 60.0 / requests_per_minute if requests_per_minute > 0 else 0
+        self.next_slot = 0.0
+        self.lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self.lock:
+            now = time.monotonic()
+            wait = self.next_slot - now
+            self.next_slot = max(now, self.next_slot) + self.interval
+
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class EnrichmentWorker:
+    def __init__(
+        self,
+        mongo: AsyncMongoUtils,
+        jobs: JobQueue,
+        task_factory: Callable[[], "ExtractRecipeDetailsTask"],
+        record_details: Optional[Callable[[str, RecipeDetails], None]] = None,
+        batch_size: int = ENRICHMENT_BATCH_SIZE,
+        requests_per_minute: float = ENRICHMENT_REQUESTS_PER_MINUTE,
+    ) -> None:
+        self.mongo = mongo
+        self.jobs = jobs
+        self.task_factory = task_factory
+        self.record_details = record_details
+        self.rate_limiter = RateLimiter(requests_per_minute)
+        self.batches = 0
+
+        jobs.register(ENRICHMENT_JOB, self.process, batch_size)
+
+    async def submit(
+        self,
+        recipe_id: ObjectId,
+        dish_name: str,
+        measured_ingredients: List[str],
+        url: Optional[str] = None,
+    ) -> str:
+        return await self.jobs.submit(
+            ENRICHMENT_JOB,
+            enrichment_job_key(recipe_id),
+            {
+                "recipe_id": str(recipe_id),
+                "dish_name": dish_name,
+                "measured_ingredients": measured_ingredients,
+                "url": url,
+            },
+        )
+
+    async def stats(self) -> Dict[str, int]:
+        return {**await self.jobs.stats(), "batches": self.batches}
+
+    async def process(self, jobs: List[Job]) -> List[Optional[str]]:
+        await self.rate_limiter.acquire()
+        results: List[
+            Optional[RecipeDetails]
+        ] = await self.task_factory().ai_request_batch(
+            [(j.payload["dish_name"], j.payload["measured_ingredients"]) for j in jobs]
+        )
+        self.batches += 1
+
+        superseded: Set[ObjectId] = await self.mongo.rerun_job_ids([j.id for j in jobs])
+        errors: List[Optional[str]] = []
+        updates: List[Tuple[ObjectId, List[str], str]] = []
+        for job, recipe_details in zip(jobs, results):
+            if job.id in superseded:
+                errors.append(None)
+                continue
+
+            if not recipe_details:
+                errors.append(
+                    f"ingredient extraction failed for {job.payload['dish_name']}"
+                )
+                continue
+
+            errors.append(None)
+            updates.append(
+                (
+                    ObjectId(job.payload["recipe_id"]),
+                    recipe_details.ingredients,
+                    recipe_details.cuisine.capitalize(),
+                )
+            )
+            if job.payload.get("url") and self.record_details:
+                self.record_details(job.payload["url"], recipe_details)
+
+        if updates:
+            await self.mongo.update_recipe_details_bulk(updates)
+
+        logger.info(f"recipe details updated for {len(updates)} recipes")
+
+        return errors
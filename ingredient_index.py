@@ -0,0 +1,103 @@
+import heapq
+import logging
+import re
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Iterable, List, Set
+
+from async_mongo_utils import AsyncMongoUtils, RecipeWriteListener
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_ingredient(name: str) -> str:
+    return re.sub(r"\s+", " ", name).strip().lower()
+
+
+def normalize_ingredients(names: Iterable[str]) -> FrozenSet[str]:
+    return frozenset(n for n in (normalize_ingredient(i) for i in names) if n)
+
+
+@dataclass
+class PantryCoverage:
+    recipe_id: str
+    coverage: float
+    missing: List[str]
+
+
+class IngredientIndex(RecipeWriteListener):
+    def __init__(self) -> None:
+        self.postings: Dict[str, Set[str]] = defaultdict(set)
+        self.recipe_ingredients: Dict[str, FrozenSet[str]] = {}
+        self.loaded = False
+
+    async def load(self, mongo: AsyncMongoUtils) -> None:
+        async for r in mongo.iter_recipe_fields(["ingredients"]):
+            self.set_recipe(r["_id"], r.get("ingredients") or [])
+
+        self.loaded = True
+        logger.info(
+            f"ingredient index loaded {len(self.recipe_ingredients)} recipes, "
+            f"{len(self.postings)} ingredients"
+        )
+
+    def set_recipe(self, id: str, ingredients: Iterable[str]) -> None:
+        self.remove_recipe(id)
+
+        normalized: FrozenSet[str] = normalize_ingredients(ingredients)
+        self.recipe_ingredients[id] = normalized
+        for ingredient in normalized:
+            self.postings[ingredient].add(id)
+
+    def remove_recipe(self, id: str) -> None:
+        for ingredient in self.recipe_ingredients.pop(id, frozenset()):
+            recipe_ids: Set[str] = self.postings[ingredient]
+            recipe_ids.discard(id)
+            if not recipe_ids:
+                del self.postings[ingredient]
+
+    async def recipe_written(self, id: str, fields: Dict[str, Any]) -> None:
+        if "ingredients" in fields:
+            self.set_recipe(id, fields["ingredients"] or [])
+
+    async def recipe_deleted(self, id: str) -> None:
+        self.remove_recipe(id)
+
+    def containing_all(self, ingredients: Iterable[str]) -> List[str]:
+        normalized: FrozenSet[str] = normalize_ingredients(ingredients)
+        if not normalized:
+            return []
+
+        postings: List[Set[str]] = sorted(
+            (self.postings.get(i, set()) for i in normalized), key=len
+        )
+
+        return sorted(set.intersection(*postings))
+
+    def rank_by_pantry(
+        self, pantry: Iterable[str], limit: int = 20, min_coverage: float = 0.0
+    ) -> List[PantryCoverage]:
+        normalized: FrozenSet[str] = normalize_ingredients(pantry)
+
+        matches: Counter = Counter()
+        for ingredient in normalized:
+            matches.update(self.postings.get(ingredient, ()))
+
+        candidates = (
+            (matched / len(self.recipe_ingredients[recipe_id]), matched, recipe_id)
+            for recipe_id, matched in matches.items()
+        )
+        top = heapq.nsmallest(
+            limit,
+            (c for c in candidates if c[0] >= min_coverage),
+            key=lambda c: (-c[0], -c[1], c[2]),
+        )
+
+        return [
+            PantryCoverage(
+                recipe_id,
+                coverage,
+                sorted(self.recipe_ingredients[recipe_id] - normalized),
+            )
+            for coverage, _, recipe_id in top
+        ]
@@ -0,0 +1,3 @@
+from .parser import *
+from .singularize import singularize
+from .tokenizer import tokenize
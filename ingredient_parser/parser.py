@@ -0,0 +1,193 @@
+import difflib
+import os
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Optional, Sequence, Set, Tuple
+
+from .singularize import singularize
+from .tokenizer import tokenize
+from .vocabulary import (
+    COMMON_INGREDIENTS,
+    CUISINE_INGREDIENTS,
+    DISH_CUISINES,
+    PREPARATION_WORDS,
+    UNIT_WORDS,
+)
+
+INGREDIENT_PARSER_ENABLED = os.getenv("INGREDIENT_PARSER_ENABLED", "1") != "0"
+INGREDIENT_PARSER_MIN_CONFIDENCE = float(
+    os.getenv("INGREDIENT_PARSER_MIN_CONFIDENCE", "0.9")
+)
+INGREDIENT_PARSER_CACHE_SIZE = int(os.getenv("INGREDIENT_PARSER_CACHE_SIZE", "20000"))
+
+FUZZY_CUTOFF = 0.85
+FUZZY_CANDIDATES = 3
+NEGATION_PREFIXES = ("un", "non")
+DISH_WEIGHT = 2.0
+CUISINE_MIN_SCORE = 2.0
+
+FILLER_WORDS: FrozenSet[str] = frozenset(
+    singularize(word) for word in PREPARATION_WORDS | UNIT_WORDS
+)
+
+
+@dataclass(frozen=True)
+class ParsedIngredient:
+    line: str
+    name: Optional[str]
+    confidence: float
+
+
+def phrase_key(phrase: str) -> str:
+    return " ".join(tokenize(phrase))
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+
+    previous = list(range(len(b) + 1))
+    for i, x in enumerate(a, start=1):
+        current = [i]
+        for j, y in enumerate(b, start=1):
+            current.append(
+                min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (x != y))
+            )
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+
+    return previous[-1]
+
+
+def is_typo(word: str, candidate: str) -> bool:
+    if word == candidate:
+        return True
+
+    for prefix in NEGATION_PREFIXES:
+        if word.startswith(prefix) != candidate.startswith(prefix):
+            return False
+
+    limit = 1 if len(candidate) <= 7 else 2
+    return len(candidate) >= 4 and edit_distance(word, candidate, limit) <= limit
+
+
+def is_misspelling(phrase: str, key: str) -> bool:
+    words, candidates = phrase.split(), key.split()
+    return len(words) == len(candidates) and all(
+        is_typo(w, c) for w, c in zip(words, candidates)
+    )
+
+
+class IngredientParser:
+    def __init__(self, cache_size: int = INGREDIENT_PARSER_CACHE_SIZE) -> None:
+        self.names: Dict[str, str] = {}
+        self.keys: List[str] = []
+        self.longest = 0
+        self.cuisines: Dict[str, Set[str]] = {}
+
+        for entry in COMMON_INGREDIENTS:
+            self.add(entry)
+        for cuisine, entries in CUISINE_INGREDIENTS.items():
+            for entry in entries:
+                key = self.add(entry)
+                if key:
+                    self.cuisines.setdefault(key, set()).add(cuisine)
+
+        self.parse = lru_cache(maxsize=cache_size)(self.parse_line)
+
+    def add(self, entry: str) -> Optional[str]:
+        name = " ".join(entry.split())
+        key = phrase_key(name)
+        if not key:
+            return None
+
+        if key not in self.names:
+            self.names[key] = name
+            self.keys.append(key)
+            self.longest = max(self.longest, len(key.split()))
+
+        return key
+
+    def match(self, tokens: List[str]) -> Optional[Tuple[int, int]]:
+        for size in range(min(self.longest, len(tokens)), 0, -1):
+            for start in range(len(tokens) - size + 1):
+                if " ".join(tokens[start : start + size]) in self.names:
+                    return start, start + size
+
+        return None
+
+    def parse_line(self, line: str) -> ParsedIngredient:
+        tokens = tokenize(line)
+        span = self.match(tokens)
+
+        if span:
+            start, end = span
+            leftover = tokens[:start] + tokens[end:]
+            if all(t in FILLER_WORDS for t in leftover):
+                key = " ".join(tokens[start:end])
+                return ParsedIngredient(line, self.names[key], 1.0)
+
+        phrase = " ".join(t for t in tokens if t not in FILLER_WORDS)
+        if not phrase:
+            return ParsedIngredient(line, None, 0.0)
+
+        close = [
+            key
+            for key in difflib.get_close_matches(
+                phrase, self.keys, n=FUZZY_CANDIDATES, cutoff=FUZZY_CUTOFF
+            )
+            if is_misspelling(phrase, key)
+        ]
+        if not close:
+            return ParsedIngredient(line, None, 0.0)
+
+        ratio = difflib.SequenceMatcher(None, phrase, close[0]).ratio()
+        return ParsedIngredient(line, self.names[close[0]], round(ratio, 3))
+
+    def parse_many(self, lines: Sequence[str]) -> List[ParsedIngredient]:
+        parsed: Dict[str, ParsedIngredient] = {
+            line: self.parse(line) for line in dict.fromkeys(lines)
+        }
+
+        return [parsed[line] for line in lines]
+
+    def resolve(
+        self,
+        lines: Sequence[str],
+        min_confidence: float = INGREDIENT_PARSER_MIN_CONFIDENCE,
+    ) -> Dict[str, str]:
+        return {
+            p.line: p.name
+            for p in self.parse_many(lines)
+            if p.name and p.confidence >= min_confidence
+        }
+
+    def infer_cuisine(self, dish_name: str, names: Sequence[str]) -> Optional[str]:
+        scores: Counter = Counter()
+
+        for word in tokenize(dish_name):
+            if word in DISH_CUISINES:
+                scores[DISH_CUISINES[word]] += DISH_WEIGHT
+
+        for name in set(names):
+            cuisines = self.cuisines.get(phrase_key(name), set())
+            for cuisine in cuisines:
+                scores[cuisine] += 1 / len(cuisines)
+
+        ranked = scores.most_common(2)
+        if not ranked:
+            return None
+
+        cuisine, score = ranked[0]
+        runner_up = ranked[1][1] if len(ranked) > 1 else 0.0
+        if score < CUISINE_MIN_SCORE or score < 2 * runner_up:
+            return None
+
+        return cuisine
+
+
+@lru_cache(maxsize=1)
+def default_parser() -> IngredientParser:
+    return IngredientParser()
@@ -0,0 +1,30 @@
+from typing import Dict, FrozenSet
+
+IRREGULAR: Dict[str, str] = {
+    "leaves": "leaf",
+    "halves": "half",
+    "loaves": "loaf",
+    "cookies": "cookie",
+    "brownies": "brownie",
+    "chilies": "chili",
+    "chillies": "chili",
+    "chilis": "chili",
+    "chilli": "chili",
+}
+
+INVARIANT: FrozenSet[str] = frozenset("molasses grits chaas series gras".split())
+
+
+def singularize(word: str) -> str:
+    if word in IRREGULAR:
+        return IRREGULAR[word]
+    if len(word) <= 3 or word in INVARIANT or not word.endswith("s"):
+        return word
+    if word.endswith(("ss", "us", "is")):
+        return word
+    if word.endswith("ies"):
+        return word[:-3] + "y"
+    if word.endswith(("oes", "ches", "shes", "xes", "zes")):
+        return word[:-2]
+
+    return word[:-1]
@@ -0,0 +1,34 @@
+import re
+from typing import List
+
+from ingredient_quantities import UNICODE_FRACTIONS
+
+from .singularize import singularize
+from .vocabulary import UNIT_WORDS
+
+TOKEN_PATTERN = re.compile(r"\d+(?:[./]\d+)?|[a-zà-ÿ][a-zà-ÿ'’]*")
+PARENTHETICAL_PATTERN = re.compile(r"\([^)]*\)|\[[^\]]*\]")
+QUANTITY_PATTERN = re.compile(r"^\d+(?:[./]\d+)?$")
+
+
+def clean_line(line: str) -> str:
+    line = line.lower()
+    for symbol, fraction in UNICODE_FRACTIONS.items():
+        line = line.replace(symbol, f" {fraction}")
+    line = PARENTHETICAL_PATTERN.sub(" ", line).replace("-", " ")
+
+    return re.split(r"[,;:]", line, maxsplit=1)[0]
+
+
+def tokenize(line: str) -> List[str]:
+    tokens: List[str] = [
+        t.strip("'’")
+        for t in TOKEN_PATTERN.findall(clean_line(line))
+        if not QUANTITY_PATTERN.match(t)
+    ]
+    tokens = [t for t in tokens if t]
+
+    while len(tokens) > 1 and tokens[0] in UNIT_WORDS:
+        tokens.pop(0)
+
+    return [singularize(t) for t in tokens]
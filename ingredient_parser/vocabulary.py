@@ -0,0 +1,273 @@
+from typing import Dict, FrozenSet, List
+
+from ingredient_quantities import UNITS
+
+UNIT_WORDS: FrozenSet[str] = frozenset(UNITS) | frozenset("""
+    c t tbs kgs kilogram kilograms mg
+    millilitre milliliter millilitres milliliters litres liters fl quart quarts
+    pint pints gallon gallons stick sticks bunch bunches sprig sprigs handful
+    handfuls piece pieces slice slices dash dashes drop drops packet packets
+    package packages pack jar jars bottle bottles box boxes bag bags head heads
+    stalk stalks pod pods inch inches cm leaf knob pinches scoop scoops cube
+    cubes strand strands fillet fillets rasher rashers sheet sheets
+    """.split())
+
+PREPARATION_WORDS: FrozenSet[str] = frozenset("""
+    chopped finely roughly coarsely thinly thickly diced minced sliced grated
+    crushed peeled deseeded seeded cored halved quartered cubed julienned
+    shredded mashed pureed puréed beaten whisked melted softened sifted
+    toasted roasted boiled blanched soaked drained rinsed washed
+    trimmed rinsed cleaned cut torn crumbled zested juiced squeezed pitted
+    stemmed cooked uncooked cooled chilled frozen thawed warm hot cold lukewarm
+    room temperature fresh freshly dried dry packed loosely firmly heaping
+    heaped level scant generous large small medium big extra thin thick fine
+    coarse whole split skinless boneless ripe raw optional divided plus more
+    about approximately approx few some little handful to taste as needed
+    required for garnish garnishing serving frying deep tempering greasing
+    brushing dusting sprinkling and or of a an the into in pieces piece bite
+    sized size lengthwise crosswise inch inches cm long wide strips rings
+    wedges florets chunks cubes slices dice mince powdered lightly
+    well at least around per approximately good quality organic ground
+    store bought homemade ready made prepared up broken
+    """.split())
+
+CUISINE_INGREDIENTS: Dict[str, List[str]] = {
+    "indian": """
+        toor dal|moong dal|urad dal|chana dal|masoor dal|dal|paneer|ghee|garam
+        masala|turmeric|asafoetida|hing|curry leaf|mustard seed|fenugreek|kasuri
+        methi|methi|amchur|chaat masala|ajwain|jaggery|besan|gram flour|atta|
+        basmati rice|cardamom|green cardamom|black cardamom|cumin seed|jeera|
+        coriander powder|red chili powder|kashmiri red chili powder|kashmiri
+        chili|sambar powder|rasam powder|tamarind|curd|poha|rava|semolina|sooji|
+        idli rice|dosa batter|chickpea|chole masala|rajma|kidney bean|pav bhaji
+        masala|kasoori methi|nigella seed|kalonji|fennel seed|saunf|mace|
+        green chili|dried red chili|coconut|grated coconut|cashew|makhana|
+        maida|garam masala powder|kokum|urad|moong|toor|chana|ghee|malai|khoya|
+        mawa|saffron|rose water|panch phoron|biryani masala|tandoori masala
+    """.split(
+        "|"
+    ),
+    "italian": """
+        pasta|spaghetti|penne|fusilli|linguine|fettuccine|lasagna sheet|lasagna|
+        macaroni|rigatoni|farfalle|orzo|gnocchi|arborio rice|risotto rice|
+        parmesan|parmesan cheese|parmigiano reggiano|pecorino|pecorino romano|
+        mozzarella|mozzarella cheese|
+        ricotta|mascarpone|gorgonzola|prosciutto|pancetta|guanciale|salami|
+        basil|oregano|olive oil|extra virgin olive oil|balsamic vinegar|
+        pine nut|pesto|marinara sauce|tomato passata|passata|san marzano tomato|
+        sun-dried tomato|italian seasoning|rosemary|sage|capers|anchovy|
+        polenta|ciabatta|focaccia|porcini mushroom|red wine|white wine
+    """.split(
+        "|"
+    ),
+    "mexican": """
+        tortilla|corn tortilla|flour tortilla|tortilla chip|jalapeno|jalapeño|
+        chipotle|chipotle in adobo|ancho chili|poblano|serrano|cilantro|lime|
+        black bean|pinto bean|refried bean|avocado|queso fresco|cotija|
+        monterey jack|cheddar cheese|salsa|salsa verde|tomatillo|taco
+        seasoning|chili powder|cumin|masa harina|epazote|mexican oregano|
+        sour cream|enchilada sauce|hominy|corn
+    """.split(
+        "|"
+    ),
+    "thai": """
+        fish sauce|lemongrass|galangal|kaffir lime leaf|makrut lime leaf|
+        thai basil|thai chili|bird's eye chili|red curry paste|green curry
+        paste|yellow curry paste|massaman curry paste|coconut milk|coconut
+        cream|palm sugar|rice noodle|jasmine rice|shrimp paste|oyster sauce|
+        tamarind paste|peanut|bean sprout|lime
+    """.split(
+        "|"
+    ),
+    "chinese": """
+        soy sauce|light soy sauce|dark soy sauce|oyster sauce|hoisin sauce|
+        shaoxing wine|rice vinegar|sesame oil|toasted sesame oil|five spice
+        powder|star anise|sichuan peppercorn|szechuan peppercorn|doubanjiang|
+        chili bean paste|black bean sauce|bok choy|napa cabbage|scallion|
+        spring onion|green onion|ginger|garlic|cornstarch|corn starch|
+        egg noodle|wonton wrapper|tofu|shiitake mushroom|water chestnut|
+        bamboo shoot|chili oil
+    """.split(
+        "|"
+    ),
+    "japanese": """
+        mirin|sake|miso|white miso|red miso|dashi|kombu|bonito flake|nori|
+        wasabi|panko|sushi rice|short grain rice|udon|soba|ramen noodle|
+        rice vinegar|pickled ginger|shichimi togarashi|furikake|edamame|
+        matcha|daikon|tofu|soy sauce|sesame seed
+    """.split(
+        "|"
+    ),
+    "french": """
+        butter|unsalted butter|shallot|dijon mustard|creme fraiche|crème
+        fraîche|heavy cream|gruyere|gruyère|brie|camembert|tarragon|thyme|
+        herbes de provence|bay leaf|leek|white wine|cognac|brandy|baguette|
+        puff pastry|chervil|chive|nutmeg
+    """.split(
+        "|"
+    ),
+    "greek": """
+        feta|feta cheese|kalamata olive|olive|greek yogurt|oregano|dill|mint|
+        lemon|phyllo|filo|cucumber|lamb|pita|tahini|chickpea|red onion
+    """.split(
+        "|"
+    ),
+    "american": """
+        ketchup|mayonnaise|yellow mustard|bbq sauce|barbecue sauce|bacon|
+        cheddar|american cheese|hamburger bun|hot dog|maple syrup|buttermilk|
+        brown sugar|ranch dressing|worcestershire sauce|pickle|ground beef
+    """.split(
+        "|"
+    ),
+}
+
+COMMON_INGREDIENTS: List[str] = """
+    salt|sea salt|kosher salt|black salt|rock salt|pepper|black pepper|white
+    pepper|peppercorn|sugar|white sugar|granulated sugar|caster sugar|powdered
+    sugar|icing sugar|honey|water|oil|vegetable oil|canola oil|sunflower oil|
+    mustard oil|coconut oil|peanut oil|olive oil|butter|egg|egg white|egg yolk|
+    milk|whole milk|cream|heavy cream|whipping cream|yogurt|cheese|flour|
+    all-purpose flour|all purpose flour|plain flour|whole wheat flour|bread
+    flour|cornmeal|baking powder|baking soda|yeast|vanilla extract|vanilla|
+    cocoa powder|chocolate|dark chocolate|chocolate chip|onion|red onion|
+    white onion|yellow onion|garlic|ginger|ginger garlic paste|tomato|tomato
+    puree|tomato paste|tomato sauce|potato|sweet potato|carrot|celery|pea|
+    green pea|bell pepper|red bell pepper|green bell pepper|capsicum|
+    cauliflower|broccoli|cabbage|spinach|kale|lettuce|cucumber|zucchini|
+    eggplant|brinjal|okra|bhindi|mushroom|corn|sweet corn|green bean|bean|
+    beetroot|beet|radish|pumpkin|squash|butternut squash|apple|banana|lemon|
+    lime|orange|mango|pineapple|strawberry|blueberry|raspberry|grape|raisin|
+    date|almond|walnut|pecan|pistachio|peanut|sesame seed|flaxseed|chia seed|
+    rice|brown rice|white rice|bread|breadcrumb|oat|rolled oat|quinoa|noodle|
+    lentil|red lentil|green lentil|chicken|chicken breast|chicken thigh|
+    chicken drumstick|whole chicken|ground chicken|beef|ground beef|beef
+    steak|steak|pork|ground pork|pork chop|pork belly|lamb|ground lamb|mutton|
+    fish|salmon|tuna|cod|shrimp|prawn|crab|sausage|ham|turkey|ground turkey|
+    stock|chicken stock|vegetable stock|beef stock|broth|chicken broth|
+    vegetable broth|vinegar|white vinegar|apple cider vinegar|red wine
+    vinegar|lemon juice|lime juice|orange juice|coriander|coriander leaf|
+    cilantro|parsley|mint|mint leaf|basil|thyme|rosemary|bay leaf|cinnamon|
+    cinnamon stick|clove|nutmeg|paprika|smoked paprika|cayenne pepper|
+    red pepper flake|chili flake|chili|red chili|green chili|cumin|cumin
+    seed|cumin powder|coriander seed|coriander powder|turmeric powder|
+    mustard|spring onion|scallion|green onion|shallot|leek|cornstarch|corn
+    flour|gelatin|cream cheese|condensed milk|evaporated milk|coconut milk|
+    ice|ice cube|soda water|wine|beer|ketchup|mayonnaise|soy sauce|hot sauce|
+    sriracha|peanut butter|jam|tahini|olive|caper|pickle|avocado|tofu|
+    chickpea|kidney bean|black bean|cashew nut|cashew|coconut|desiccated
+    coconut|saffron|cardamom|cardamom powder|fennel|dill|sage|oregano|tarragon
+""".split("|")
+
+DISH_CUISINES: Dict[str, str] = {
+    "dal": "indian",
+    "daal": "indian",
+    "curry": "indian",
+    "masala": "indian",
+    "paneer": "indian",
+    "biryani": "indian",
+    "pulao": "indian",
+    "sabzi": "indian",
+    "sabji": "indian",
+    "paratha": "indian",
+    "roti": "indian",
+    "chapati": "indian",
+    "naan": "indian",
+    "dosa": "indian",
+    "idli": "indian",
+    "sambar": "indian",
+    "rasam": "indian",
+    "chutney": "indian",
+    "tikka": "indian",
+    "korma": "indian",
+    "halwa": "indian",
+    "kheer": "indian",
+    "ladoo": "indian",
+    "laddu": "indian",
+    "pakora": "indian",
+    "bhaji": "indian",
+    "chaat": "indian",
+    "upma": "indian",
+    "poha": "indian",
+    "khichdi": "indian",
+    "raita": "indian",
+    "kofta": "indian",
+    "vada": "indian",
+    "pasta": "italian",
+    "spaghetti": "italian",
+    "lasagna": "italian",
+    "lasagne": "italian",
+    "risotto": "italian",
+    "pizza": "italian",
+    "carbonara": "italian",
+    "bolognese": "italian",
+    "gnocchi": "italian",
+    "bruschetta": "italian",
+    "tiramisu": "italian",
+    "focaccia": "italian",
+    "penne": "italian",
+    "taco": "mexican",
+    "tacos": "mexican",
+    "burrito": "mexican",
+    "enchilada": "mexican",
+    "enchiladas": "mexican",
+    "quesadilla": "mexican",
+    "guacamole": "mexican",
+    "salsa": "mexican",
+    "fajita": "mexican",
+    "fajitas": "mexican",
+    "nachos": "mexican",
+    "tamale": "mexican",
+    "tamales": "mexican",
+    "pozole": "mexican",
+    "pad": "thai",
+    "thai": "thai",
+    "tom": "thai",
+    "larb": "thai",
+    "satay": "thai",
+    "chow": "chinese",
+    "mein": "chinese",
+    "lo": "chinese",
+    "kung": "chinese",
+    "pao": "chinese",
+    "szechuan": "chinese",
+    "sichuan": "chinese",
+    "dumpling": "chinese",
+    "dumplings": "chinese",
+    "wonton": "chinese",
+    "manchurian": "chinese",
+    "hakka": "chinese",
+    "sushi": "japanese",
+    "ramen": "japanese",
+    "teriyaki": "japanese",
+    "tempura": "japanese",
+    "miso": "japanese",
+    "udon": "japanese",
+    "katsu": "japanese",
+    "yakitori": "japanese",
+    "onigiri": "japanese",
+    "quiche": "french",
+    "crepe": "french",
+    "crepes": "french",
+    "ratatouille": "french",
+    "souffle": "french",
+    "gratin": "french",
+    "croissant": "french",
+    "bourguignon": "french",
+    "gyro": "greek",
+    "gyros": "greek",
+    "souvlaki": "greek",
+    "tzatziki": "greek",
+    "moussaka": "greek",
+    "spanakopita": "greek",
+    "burger": "american",
+    "burgers": "american",
+    "sandwich": "american",
+    "brownie": "american",
+    "brownies": "american",
+    "pancake": "american",
+    "pancakes": "american",
+    "mac": "american",
+    "meatloaf": "american",
+    "coleslaw": "american",
+    "cornbread": "american",
+}
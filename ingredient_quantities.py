@@ -0,0 +1,114 @@
+import re
+from dataclasses import dataclass
+from fractions import Fraction
+from typing import Dict, List, Optional, Tuple
+
+UNICODE_FRACTIONS: Dict[str, str] = {
+    "½": "1/2",
+    "⅓": "1/3",
+    "⅔": "2/3",
+    "¼": "1/4",
+    "¾": "3/4",
+    "⅛": "1/8",
+}
+
+UNITS: Dict[str, str] = {
+    "cup": "cup",
+    "cups": "cup",
+    "tbsp": "tbsp",
+    "tablespoon": "tbsp",
+    "tablespoons": "tbsp",
+    "tsp": "tsp",
+    "teaspoon": "tsp",
+    "teaspoons": "tsp",
+    "g": "g",
+    "gram": "g",
+    "grams": "g",
+    "kg": "kg",
+    "ml": "ml",
+    "l": "l",
+    "litre": "l",
+    "liter": "l",
+    "oz": "oz",
+    "ounce": "oz",
+    "ounces": "oz",
+    "lb": "lb",
+    "lbs": "lb",
+    "pound": "lb",
+    "pounds": "lb",
+    "clove": "clove",
+    "cloves": "clove",
+    "pinch": "pinch",
+    "can": "can",
+    "cans": "can",
+}
+
+QUANTITY_PATTERN = re.compile(
+    r"^\s*(?P<amount>\d+\s+\d+/\d+|\d+/\d+|\d+(?:\.\d+)?)\s*(?P<rest>.*)$"
+)
+
+
+@dataclass
+class Measure:
+    amount: Fraction
+    unit: str
+    name: str
+
+
+def parse_amount(amount: str) -> Fraction:
+    return sum((Fraction(part) for part in amount.split()), Fraction(0))
+
+
+def parse_measure(line: str) -> Optional[Measure]:
+    for symbol, fraction in UNICODE_FRACTIONS.items():
+        line = line.replace(symbol, f" {fraction}")
+
+    match = QUANTITY_PATTERN.match(line)
+    if not match:
+        return None
+
+    words: List[str] = match["rest"].split()
+    unit = ""
+    if words and words[0].lower().rstrip(".") in UNITS:
+        unit = UNITS[words.pop(0).lower().rstrip(".")]
+
+    name = " ".join(words).strip().lower()
+    if not name:
+        return None
+
+    return Measure(parse_amount(match["amount"]), unit, name)
+
+
+def format_amount(amount: Fraction) -> str:
+    whole, remainder = divmod(amount, 1)
+    if not remainder:
+        return str(whole)
+    if not whole:
+        return str(remainder)
+
+    return f"{whole} {remainder}"
+
+
+def format_measure(measure: Measure) -> str:
+    return " ".join(
+        p for p in (format_amount(measure.amount), measure.unit, measure.name) if p
+    )
+
+
+def merge_measured_ingredients(lines: List[str]) -> List[str]:
+    totals: Dict[Tuple[str, str], Measure] = {}
+    unmeasured: Dict[str, str] = {}
+
+    for line in lines:
+        measure: Optional[Measure] = parse_measure(line)
+        if measure is None:
+            unmeasured.setdefault(" ".join(line.lower().split()), line.strip())
+            continue
+
+        key = (measure.name, measure.unit)
+        if key in totals:
+            totals[key].amount += measure.amount
+        else:
+            totals[key] = measure
+
+    return [format_measure(m) for m in totals.values()] + list(unmeasured.values())
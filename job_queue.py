@@ -0,0 +1,228 @@
+import asyncio
+import logging
+import os
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from bson import ObjectId
+from bson.errors import InvalidId
+
+from async_mongo_utils import AsyncMongoUtils
+from metrics import JOB_RESULTS
+from models import JobResponse
+
+JOB_CONCURRENCY = int(os.getenv("JOB_CONCURRENCY", 2))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", 5))
+JOB_BACKOFF = float(os.getenv("JOB_BACKOFF", 5))
+JOB_MAX_BACKOFF = float(os.getenv("JOB_MAX_BACKOFF", 600))
+JOB_LEASE = float(os.getenv("JOB_LEASE", 300))
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", 5))
+JOB_LINGER = float(os.getenv("JOB_LINGER", 0.5))
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Job:
+    id: ObjectId
+    type: str
+    key: str
+    payload: Dict[str, Any]
+    attempts: int
+    run: str
+
+
+JobHandler = Callable[[List[Job]], Awaitable[List[Optional[str]]]]
+
+
+def job_from_document(document: Dict[str, Any]) -> Job:
+    return Job(
+        id=document["_id"],
+        type=document["type"],
+        key=document["key"],
+        payload=document.get("payload") or {},
+        attempts=document.get("attempts", 0),
+        run=document["run"],
+    )
+
+
+def backoff_delay(attempts: int, base: float, limit: float) -> float:
+    return min(base * 2 ** max(attempts - 1, 0), limit)
+
+
+class JobQueue:
+    def __init__(
+        self,
+        mongo: AsyncMongoUtils,
+        concurrency: int = JOB_CONCURRENCY,
+        max_attempts: int = JOB_MAX_ATTEMPTS,
+        backoff: float = JOB_BACKOFF,
+        max_backoff: float = JOB_MAX_BACKOFF,
+        lease: float = JOB_LEASE,
+        poll_interval: float = JOB_POLL_INTERVAL,
+        linger: float = JOB_LINGER,
+    ) -> None:
+        self.mongo = mongo
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.lease = lease
+        self.poll_interval = poll_interval
+        self.linger = linger
+        self.handlers: Dict[str, Tuple[JobHandler, int]] = {}
+        self.wakeup = asyncio.Event()
+        self.workers: List[asyncio.Task] = []
+        self.stopping = False
+
+        self.in_flight = 0
+        self.processed = 0
+        self.failed = 0
+        self.retries = 0
+
+    def register(self, type: str, handler: JobHandler, batch_size: int = 1) -> None:
+        self.handlers[type] = (handler, max(batch_size, 1))
+
+    async def start(self) -> None:
+        if self.workers:
+            return
+
+        self.stopping = False
+        recovered: int = await self.mongo.recover_jobs()
+        if recovered:
+            logger.info(f"recovered {recovered} jobs with expired leases")
+
+        self.workers = [
+            asyncio.create_task(self.work()) for _ in range(self.concurrency)
+        ]
+
+    async def stop(self, drain_timeout: float = 0) -> None:
+        self.stopping = True
+        self.wakeup.set()
+        if self.workers and drain_timeout > 0:
+            _, pending = await asyncio.wait(self.workers, timeout=drain_timeout)
+            if pending:
+                logger.warning(
+                    f"{self.in_flight} jobs still running after {drain_timeout}s, "
+                    "they will be retried on the next start"
+                )
+
+        for worker in self.workers:
+            worker.cancel()
+
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        self.workers = []
+
+    async def submit(self, type: str, key: str, payload: Dict[str, Any]) -> str:
+        id: str = await self.mongo.upsert_job(type, key, payload)
+        self.wakeup.set()
+
+        return id
+
+    async def get(self, id: str) -> Optional[JobResponse]:
+        try:
+            document: Optional[Dict[str, Any]] = await self.mongo.get_job(id)
+        except InvalidId:
+            return None
+        if not document:
+            return None
+
+        document["id"] = str(document.pop("_id"))
+        return JobResponse.model_validate(document)
+
+    async def stats(self) -> Dict[str, int]:
+        return {
+            "queue_depth": await self.mongo.count_jobs("pending"),
+            "in_flight": self.in_flight,
+            "processed": self.processed,
+            "failed": self.failed,
+            "retries": self.retries,
+        }
+
+    async def idle(self, timeout: float) -> None:
+        if self.stopping:
+            return
+
+        try:
+            await asyncio.wait_for(self.wakeup.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        self.wakeup.clear()
+
+    async def work(self) -> None:
+        while not self.stopping:
+            try:
+                batch: List[Job] = await self.next_batch()
+            except Exception as e:
+                logger.error(f"could not claim jobs: {e}")
+                batch = []
+
+            if not batch:
+                await self.idle(self.poll_interval)
+                continue
+
+            await self.run(batch)
+
+    async def claim(self, types: List[str]) -> Optional[Job]:
+        document = await self.mongo.claim_job(types, self.lease)
+
+        return job_from_document(document) if document else None
+
+    async def next_batch(self) -> List[Job]:
+        first: Optional[Job] = await self.claim(list(self.handlers))
+        if not first:
+            return []
+
+        batch: List[Job] = [first]
+        batch_size: int = self.handlers[first.type][1]
+        deadline = asyncio.get_running_loop().time() + self.linger
+
+        while len(batch) < batch_size and not self.stopping:
+            job: Optional[Job] = await self.claim([first.type])
+            if job:
+                batch.append(job)
+                continue
+
+            timeout = deadline - asyncio.get_running_loop().time()
+            if timeout <= 0:
+                break
+            await self.idle(timeout)
+
+        return batch
+
+    async def run(self, batch: List[Job]) -> None:
+        handler: JobHandler = self.handlers[batch[0].type][0]
+
+        self.in_flight += len(batch)
+        try:
+            errors: List[Optional[str]] = await handler(batch)
+        except Exception as e:
+            errors = [str(e) or type(e).__name__] * len(batch)
+        finally:
+            self.in_flight -= len(batch)
+
+        for job, error in zip(batch, errors):
+            try:
+                await self.settle(job, error)
+            except Exception as e:
+                logger.error(f"could not update job {job.id}: {e}")
+
+    async def settle(self, job: Job, error: Optional[str]) -> None:
+        if error is None:
+            self.processed += 1
+            JOB_RESULTS.labels(job.type, "done").inc()
+            await self.mongo.finish_job(job.id, job.run, "done")
+            return
+
+        if job.attempts < self.max_attempts:
+            self.retries += 1
+            JOB_RESULTS.labels(job.type, "retry").inc()
+            delay: float = backoff_delay(job.attempts, self.backoff, self.max_backoff)
+            logger.warning(f"job {job.key} failed, retrying in {delay}s: {error}")
+            await self.mongo.retry_job(job.id, job.run, error, delay)
+            return
+
+        self.failed += 1
+        JOB_RESULTS.labels(job.type, "failed").inc()
+        logger.error(f"job {job.key} failed after {job.attempts} attempts: {error}")
+        await self.mongo.finish_job(job.id, job.run, "failed", error)
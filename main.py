@@ -1,71 +1,515 @@
 # main.py
 import asyncio
+import json
 import logging
 import os
-from typing import List, Optional
-from urllib.parse import ParseResult, urlparse
+from contextlib import asynccontextmanager
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Dict,
+    List,
+    Optional,
+    TypeVar,
+)
+from urllib.parse import urlparse
 
 from bson import ObjectId
-from fastapi import FastAPI, HTTPException
-from recipe_scrapers import scrape_me
-
-from ai_tasks import ExtractRecipeDetailsTask, GenerateRecipeTask
-from custom_scrapers import CustomScraper, custom_scraper_base_urls, get_scrapper
+from bson.errors import InvalidId
+from fastapi import (
+    FastAPI,
+    HTTPException,
+    Query,
+    Request,
+    WebSocket,
+    WebSocketDisconnect,
+)
+from fastapi.responses import RedirectResponse, Response, StreamingResponse
+from pydantic import BaseModel
+
+from ai_tasks import AiCache, close_clients, get_task
+from custom_scrapers import (
+    CustomScraper,
+    ScrapeCache,
+    ScrapeCacheEntry,
+    close_scrapers,
+    get_scrapper,
+    http_client,
+)
 from models import (
     AddRecipeRequest,
+    AddShoppingListItemRequest,
+    AiCacheStatsResponse,
+    BulkImportJobResponse,
+    BulkImportRequest,
+    EnrichmentStatsResponse,
+    HealthResponse,
     IdResponse,
+    JobResponse,
     OkResponse,
+    PantryMatch,
+    PantryMatchResponse,
+    PantryRequest,
     Recipe,
-    RecipeDetails,
+    RecipeDuplicate,
+    RecipeDuplicatesResponse,
     RecipeListResponse,
     RecipeRequest,
     RecipeResponse,
+    RecipeSearchHit,
+    RecipeSearchResponse,
+    RecipeSummary,
+    RecipeSummaryListResponse,
+    ShoppingList,
+    ShoppingListFromRecipesRequest,
+    ShoppingListItem,
+    ShoppingListOpsRequest,
+    ShoppingListItemOp,
     ShoppingListResponse,
     ShoppingListRequest,
+    ShoppingListVersionResponse,
     UpdateRecipeRequest,
+    UpdateShoppingListItemRequest,
     UpdateShoppingListRequest,
 )
-from mongo_utils import MongoUtils
+from async_mongo_utils import AsyncMongoUtils
+from mongo_utils import recipe_from_document, summary_from_document
+from bulk_import import BulkImporter
+from ingredient_quantities import merge_measured_ingredients
+from ingredient_index import IngredientIndex, PantryCoverage, normalize_ingredients
+from recipe_images import (
+    IMAGE_MEDIA_TYPE,
+    THUMBNAIL_SIZES,
+    ImageStore,
+    RecipeImageProcessor,
+    image_store_from_env,
+)
+from read_cache import CachedResponse, ReadCache, cache_backend_from_env
+from recipe_dedup import DuplicateMatch, RecipeDeduplicator
+from search_index import SearchIndex
+from shopping_list_ops import ShoppingListNotFound, ShoppingListVersionConflict
+from shopping_list_sync import Event, ShoppingListBroker, next_event
+from enrichment_worker import EnrichmentWorker
+from job_queue import JobQueue
+from metrics import (
+    JOB_QUEUE_DEPTH,
+    METRICS_CONTENT_TYPE,
+    MetricsMiddleware,
+    render_metrics,
+)
+
+if TYPE_CHECKING:
+    from ai_tasks import ExtractRecipeDetailsTask, GenerateRecipeTask
 
 logging.basicConfig(level=logging.INFO)
 
 GEMINI_KEY = os.getenv("GEMINI_API_KEY", "")
 GEMINI_MODEL = "gemini-2.5-flash-lite"
+MAX_PAGE_SIZE = 500
+READ_CACHE_CHANGE_STREAMS = os.getenv("READ_CACHE_CHANGE_STREAMS", "") == "1"
+SHOPPING_LIST_SYNC_CHANGE_STREAMS = (
+    os.getenv("SHOPPING_LIST_SYNC_CHANGE_STREAMS", "") == "1"
+)
 
-app = FastAPI()
+STARTUP_RETRY_DELAY = float(os.getenv("STARTUP_RETRY_DELAY", 5))
+READINESS_TIMEOUT = float(os.getenv("READINESS_TIMEOUT", 2))
+DRAIN_TIMEOUT = float(os.getenv("DRAIN_TIMEOUT", 20))
+
+T = TypeVar("T")
+
+mongo: AsyncMongoUtils
+job_queue: JobQueue
+recipe_deduplicator: RecipeDeduplicator
+enrichment_worker: EnrichmentWorker
+bulk_importer: BulkImporter
+shopping_list_broker: ShoppingListBroker
+image_store: ImageStore
+image_processor: RecipeImageProcessor
+scrape_cache: ScrapeCache
+ai_cache: AiCache
+ingredient_index: IngredientIndex
+search_index: SearchIndex
+read_cache: ReadCache
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    create_resources()
+    app.state.ready = False
+    app.state.draining = False
+    warm_up_task = asyncio.create_task(warm_up(app))
+
+    yield
+
+    app.state.draining = True
+    warm_up_task.cancel()
+    await asyncio.gather(warm_up_task, return_exceptions=True)
+
+    for name, stop in (
+        ("shopping list broker", shopping_list_broker.close),
+        ("image processor", image_processor.stop),
+        ("bulk importer", bulk_importer.stop),
+        ("job queue", lambda: job_queue.stop(DRAIN_TIMEOUT)),
+        ("read cache", read_cache.close),
+        ("scrapers", close_scrapers),
+        ("ai clients", close_clients),
+        ("mongo", mongo.close),
+    ):
+        try:
+            await stop()
+        except Exception as e:
+            logging.error(f"could not stop {name}: {e}")
+
+
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(MetricsMiddleware)
+
+
+def create_resources() -> None:
+    global mongo, job_queue, recipe_deduplicator, enrichment_worker, bulk_importer
+    global shopping_list_broker, image_store, image_processor
+    global scrape_cache, ai_cache, ingredient_index, search_index, read_cache
+
+    scrape_cache = ScrapeCache()
+    ai_cache = AiCache()
+    ingredient_index = IngredientIndex()
+    search_index = SearchIndex()
+    read_cache = ReadCache(cache_backend_from_env())
+    mongo = AsyncMongoUtils()
+    job_queue = JobQueue(mongo)
+    recipe_deduplicator = RecipeDeduplicator(mongo, job_queue)
+    enrichment_worker = EnrichmentWorker(
+        mongo,
+        job_queue,
+        extract_details_task,
+        record_details=lambda url, recipe_details: scrape_cache.record_details(
+            url, recipe_details.ingredients, recipe_details.cuisine.capitalize()
+        ),
+    )
+    bulk_importer = BulkImporter(
+        mongo,
+        is_url=lambda text: is_url(text),
+        scrape=lambda url: scrape_recipe(url),
+        generate=lambda request: generate_recipe_details(request),
+        enrich=lambda id, url, recipe: enrich_scraped_recipe(id, url, recipe),
+        find_duplicate=recipe_deduplicator.find_duplicate,
+    )
+    shopping_list_broker = ShoppingListBroker(mongo)
+    image_store = image_store_from_env(mongo)
+    image_processor = RecipeImageProcessor(mongo, image_store)
+
+    mongo.add_recipe_listener(ingredient_index)
+    mongo.add_recipe_listener(search_index)
+    mongo.add_recipe_listener(recipe_deduplicator)
+    mongo.add_recipe_listener(read_cache)
+    mongo.add_recipe_listener(image_processor)
+    mongo.add_shopping_list_listener(read_cache)
+    if not SHOPPING_LIST_SYNC_CHANGE_STREAMS:
+        mongo.add_shopping_list_listener(shopping_list_broker)
+
+
+async def warm_up(app: FastAPI) -> None:
+    while True:
+        try:
+            await mongo.ping()
+            await mongo.ensure_indexes()
+            await mongo.backfill_shopping_list_item_ids()
+            await ingredient_index.load(mongo)
+            await search_index.load(mongo)
+            await recipe_deduplicator.load()
+            break
+        except Exception as e:
+            logging.error(f"startup failed, retrying in {STARTUP_RETRY_DELAY}s: {e}")
+            await asyncio.sleep(STARTUP_RETRY_DELAY)
+
+    if READ_CACHE_CHANGE_STREAMS:
+        read_cache.watch(mongo)
+    if SHOPPING_LIST_SYNC_CHANGE_STREAMS:
+        shopping_list_broker.watch()
+    await job_queue.start()
+    http_client()
+
+    app.state.ready = True
+    logging.info("startup complete")
+
+
+def extract_details_task() -> "ExtractRecipeDetailsTask":
+    from ai_tasks import ExtractRecipeDetailsTask
+
+    return get_task(ExtractRecipeDetailsTask, GEMINI_KEY, GEMINI_MODEL, cache=ai_cache)
+
+
+def generate_recipe_task() -> "GenerateRecipeTask":
+    from ai_tasks import GenerateRecipeTask
+
+    return get_task(GenerateRecipeTask, GEMINI_KEY, GEMINI_MODEL)
+
+
+@app.get("/healthz", response_model=HealthResponse)
+def liveness() -> HealthResponse:
+    return HealthResponse(status="alive")
+
+
+@app.get("/readyz", response_model=HealthResponse)
+async def readiness(request: Request) -> Response:
+    status = "ready"
+    mongo_ok = False
+    if getattr(request.app.state, "draining", False):
+        status = "draining"
+    elif not getattr(request.app.state, "ready", False):
+        status = "starting"
+    else:
+        try:
+            await asyncio.wait_for(mongo.ping(), READINESS_TIMEOUT)
+            mongo_ok = True
+        except Exception as e:
+            logging.warning(f"readiness check failed: {e}")
+            status = "unavailable"
 
-try:
-    mongo = MongoUtils()
-except Exception as e:
-    logging.error(e)
+    return Response(
+        HealthResponse(status=status, mongo=mongo_ok).model_dump_json(),
+        status_code=200 if status == "ready" else 503,
+        media_type="application/json",
+    )
 
 
 @app.post("/api/recipe/add_auto", response_model=IdResponse)
 async def extract_or_generate_recipe(data: RecipeRequest) -> IdResponse:
     try:
         if is_url(data.request):
-            return await extract_recipe(data.request)
+            return await extract_recipe(data.request, data.reuse_existing)
 
-        return generate_recipe(data.request)
+        return await generate_recipe(data.request)
     except Exception as e:
         raise ValueError(e)
 
 
+@app.post("/api/recipe/add_auto/stream")
+async def extract_or_generate_recipe_stream(data: RecipeRequest) -> StreamingResponse:
+    return StreamingResponse(
+        recipe_events(data),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.post("/api/recipe/bulk_import", response_model=BulkImportJobResponse)
+async def bulk_import_recipes(data: BulkImportRequest) -> BulkImportJobResponse:
+    return bulk_importer.start(data.requests, data.reuse_existing).to_response()
+
+
+@app.post("/api/recipe/bulk_import/ndjson", response_model=BulkImportJobResponse)
+async def bulk_import_recipes_ndjson(
+    request: Request, reuse_existing: bool = False
+) -> BulkImportJobResponse:
+    requests: List[str] = []
+    for line in (await request.body()).decode("utf-8").splitlines():
+        if not line.strip():
+            continue
+        try:
+            entry = json.loads(line)
+        except json.JSONDecodeError:
+            raise HTTPException(status_code=400, detail=f"Invalid NDJSON line: {line}")
+        requests.append(entry if isinstance(entry, str) else entry.get("request", ""))
+
+    return bulk_importer.start(requests, reuse_existing).to_response()
+
+
+@app.get("/api/recipe/bulk_import/{job_id}", response_model=BulkImportJobResponse)
+def get_bulk_import(job_id: str) -> BulkImportJobResponse:
+    job = bulk_importer.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Unknown import job {job_id}")
+
+    return job.to_response()
+
+
 @app.get("/api/recipe/{recipe_id}", response_model=RecipeResponse)
-def get_recipe_by_id(recipe_id: str) -> RecipeResponse:
-    recipe = mongo.get_recipe_by_id(recipe_id)
+async def get_recipe_by_id(recipe_id: str, request: Request) -> Response:
+    async def load() -> RecipeResponse:
+        return RecipeResponse(root=await mongo.get_recipe_by_id(recipe_id))
+
+    cached: CachedResponse = await read_cache.get_or_load(
+        await read_cache.recipe_key(recipe_id), load
+    )
+
+    return cached_response(cached, request)
+
+
+@app.get("/api/recipe/{recipe_id}/image")
+async def get_recipe_image(
+    recipe_id: str,
+    request: Request,
+    size: str = Query(default="medium", pattern=f"^({'|'.join(THUMBNAIL_SIZES)})$"),
+) -> Response:
+    try:
+        document: Optional[Dict[str, Any]] = await mongo.get_recipe_images(recipe_id)
+    except InvalidId as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-    return RecipeResponse(root=recipe)
+    if not document:
+        raise HTTPException(status_code=404, detail="Recipe not found")
+
+    key: Optional[str] = (document.get("images") or {}).get(size)
+    if not key:
+        if not document.get("img_url"):
+            raise HTTPException(status_code=404, detail="Recipe has no image")
+
+        image_processor.schedule(recipe_id, document["img_url"])
+        return RedirectResponse(document["img_url"], status_code=307)
+
+    headers: Dict[str, str] = {
+        "ETag": f'"{key}"',
+        "Cache-Control": "public, max-age=604800",
+    }
+    if_none_match: Optional[str] = request.headers.get("if-none-match")
+    if if_none_match and etag_matches(headers["ETag"], if_none_match):
+        return Response(status_code=304, headers=headers)
+
+    data: Optional[bytes] = await image_store.get(key)
+    if data is None:
+        raise HTTPException(status_code=404, detail="Image not found")
+
+    return Response(data, media_type=IMAGE_MEDIA_TYPE, headers=headers)
 
 
 @app.get("/api/recipes", response_model=RecipeListResponse)
-def get_all_recipes() -> RecipeListResponse:
-    return RecipeListResponse(recipes=mongo.get_all_recipes())
+async def get_all_recipes(
+    request: Request,
+    after: Optional[str] = None,
+    limit: Optional[int] = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+) -> Response:
+    async def load() -> RecipeListResponse:
+        if limit is None and after is None:
+            return RecipeListResponse(recipes=await mongo.get_all_recipes())
+
+        recipes = await mongo.get_recipes_page(after, limit or MAX_PAGE_SIZE)
+
+        return RecipeListResponse(
+            recipes=recipes, next_cursor=next_cursor(recipes, limit or MAX_PAGE_SIZE)
+        )
+
+    try:
+        cached: CachedResponse = await read_cache.get_or_load(
+            await read_cache.recipes_key(after, limit), load
+        )
+    except InvalidId:
+        raise HTTPException(status_code=400, detail=f"Invalid cursor: {after}")
+
+    return cached_response(cached, request)
+
+
+@app.get("/api/recipes/summary", response_model=RecipeSummaryListResponse)
+async def get_recipe_summaries(
+    request: Request,
+    after: Optional[str] = None,
+    limit: int = Query(default=100, ge=1, le=MAX_PAGE_SIZE),
+) -> Response:
+    async def load() -> RecipeSummaryListResponse:
+        summaries = await mongo.get_recipe_summaries(after, limit)
+
+        return RecipeSummaryListResponse(
+            recipes=summaries, next_cursor=next_cursor(summaries, limit)
+        )
+
+    try:
+        cached: CachedResponse = await read_cache.get_or_load(
+            await read_cache.summaries_key(after, limit), load
+        )
+    except InvalidId:
+        raise HTTPException(status_code=400, detail=f"Invalid cursor: {after}")
+
+    return cached_response(cached, request)
+
+
+@app.get("/api/recipes/search", response_model=RecipeSearchResponse)
+async def search_recipes(
+    q: str,
+    limit: int = Query(default=20, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(default=0, ge=0),
+) -> Response:
+    total: Optional[int] = None
+    if search_index.loaded:
+        hits, total = search_index.search(q, limit, offset)
+    else:
+        hits = await mongo.search_recipe_ids(q, limit, offset)
+
+    summaries: List[RecipeSummary] = await mongo.find_recipe_summaries_by_ids(
+        [recipe_id for recipe_id, _ in hits]
+    )
+    summaries_by_id = {s.id: s for s in summaries}
+
+    return model_response(
+        RecipeSearchResponse(
+            results=[
+                RecipeSearchHit(recipe=summaries_by_id[recipe_id], score=score)
+                for recipe_id, score in hits
+                if recipe_id in summaries_by_id
+            ],
+            total=total,
+        )
+    )
+
+
+@app.get("/api/recipes/by_ingredients", response_model=RecipeSummaryListResponse)
+async def get_recipes_by_ingredients(
+    ingredient: List[str] = Query(default=[]),
+    limit: int = Query(default=100, ge=1, le=MAX_PAGE_SIZE),
+) -> Response:
+    if ingredient_index.loaded:
+        recipe_ids: List[str] = ingredient_index.containing_all(ingredient)[:limit]
+    else:
+        recipe_ids = await mongo.find_recipe_ids_with_ingredients(
+            sorted(normalize_ingredients(ingredient)), limit
+        )
+
+    return model_response(
+        RecipeSummaryListResponse(
+            recipes=await mongo.find_recipe_summaries_by_ids(recipe_ids)
+        )
+    )
+
+
+@app.post("/api/recipes/pantry", response_model=PantryMatchResponse)
+async def get_recipes_by_pantry(data: PantryRequest) -> Response:
+    if not ingredient_index.loaded:
+        raise HTTPException(status_code=503, detail="Ingredient index is loading")
+
+    ranked: List[PantryCoverage] = ingredient_index.rank_by_pantry(
+        data.ingredients, data.limit, data.min_coverage
+    )
+    summaries: List[RecipeSummary] = await mongo.find_recipe_summaries_by_ids(
+        [r.recipe_id for r in ranked]
+    )
+    summaries_by_id = {s.id: s for s in summaries}
+
+    return model_response(
+        PantryMatchResponse(
+            matches=[
+                PantryMatch(
+                    recipe=summaries_by_id[r.recipe_id],
+                    coverage=r.coverage,
+                    missing=r.missing,
+                )
+                for r in ranked
+                if r.recipe_id in summaries_by_id
+            ]
+        )
+    )
+
+
+@app.get("/api/recipes/stream")
+async def stream_recipes(summary: bool = False) -> StreamingResponse:
+    return StreamingResponse(
+        recipes_as_ndjson(summary), media_type="application/x-ndjson"
+    )
 
 
 @app.delete("/api/recipe/{recipe_id}", response_model=OkResponse)
-def delete_recipe(recipe_id: str) -> OkResponse:
-    mongo.delete_recipe(recipe_id)
+async def delete_recipe(recipe_id: str) -> OkResponse:
+    await mongo.delete_recipe(recipe_id)
 
     return OkResponse()
 
@@ -80,155 +524,463 @@ async def add_recipe(data: AddRecipeRequest) -> IdResponse:
         instructions=data.instructions,
     )  # type: ignore
 
-    recipe_id: ObjectId = mongo.add_recipe(recipe)
+    recipe_id, duplicate = await recipe_deduplicator.add_recipe(recipe)
+    if duplicate and duplicate.merged:
+        return id_response(recipe_id, duplicate)
 
-    asyncio.create_task(
-        asyncio.to_thread(
-            update_ingredients_in_recipe, recipe_id, data.title, data.ingredients
-        )
+    job_id: str = await update_ingredients_in_recipe(
+        recipe_id, data.title, data.ingredients
     )
 
-    return IdResponse(id=str(recipe_id))  # type: ignore
+    return id_response(recipe_id, duplicate, job_id)
 
 
 @app.get("/api/shopping_lists", response_model=ShoppingListResponse)
-def get_all_shopping_lists() -> ShoppingListResponse:
-    return mongo.get_all_shopping_lists()
+async def get_all_shopping_lists(request: Request) -> Response:
+    cached: CachedResponse = await read_cache.get_or_load(
+        await read_cache.shopping_lists_key(), mongo.get_all_shopping_lists
+    )
+
+    return cached_response(cached, request)
 
 
 @app.post("/api/shopping_list/create", response_model=IdResponse)
-def create_shopping_list(data: ShoppingListRequest) -> IdResponse:
-    shopping_list_id = mongo.create_shopping_list(data)
+async def create_shopping_list(data: ShoppingListRequest) -> IdResponse:
+    shopping_list_id = await mongo.create_shopping_list(data)
 
     return IdResponse(id=str(shopping_list_id))
 
 
+@app.post("/api/shopping_list/from_recipes", response_model=IdResponse)
+async def create_shopping_list_from_recipes(
+    data: ShoppingListFromRecipesRequest,
+) -> IdResponse:
+    try:
+        names: List[str] = await recipe_ingredient_names(data.recipe_ids, data.measured)
+        if not data.shopping_list_id:
+            shopping_list_id = await mongo.create_shopping_list(
+                ShoppingListRequest(
+                    name=data.name,
+                    items=[ShoppingListItem(name=n, checked=False) for n in names],
+                )
+            )
+
+            return IdResponse(id=str(shopping_list_id))
+
+        shopping_list: Optional[ShoppingList] = await mongo.get_shopping_list(
+            data.shopping_list_id
+        )
+    except InvalidId as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if not shopping_list:
+        raise HTTPException(status_code=404, detail="Shopping list not found")
+
+    try:
+        await mongo.update_shopping_list(
+            data.shopping_list_id,
+            merge_shopping_list_items(shopping_list.items, names, data.measured),
+            version=shopping_list.version,
+        )
+    except ShoppingListVersionConflict as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+    return IdResponse(id=data.shopping_list_id)
+
+
 @app.post("/api/recipe/update", response_model=OkResponse)
 async def update_recipe(data: UpdateRecipeRequest):
-    mongo.update_recipe(data.id, data.recipe)
-
-    asyncio.create_task(
-        asyncio.to_thread(
-            update_ingredients_in_recipe,
-            ObjectId(data.id),
-            data.recipe.title,
-            data.recipe.ingredients,
-        )
+    await mongo.update_recipe(data.id, data.recipe)
+
+    await update_ingredients_in_recipe(
+        ObjectId(data.id),
+        data.recipe.title,
+        data.recipe.ingredients,
     )
 
     return OkResponse()
 
 
 @app.post("/api/shopping_list/update", response_model=OkResponse)
-def update_shopping_list(data: UpdateShoppingListRequest) -> OkResponse:
-    mongo.update_shopping_list(data.id, data.items)
+async def update_shopping_list(data: UpdateShoppingListRequest) -> OkResponse:
+    await write_shopping_list(
+        mongo.update_shopping_list(data.id, data.items, data.name, data.version)
+    )
 
     return OkResponse()
 
 
-@app.delete("/api/shopping_list/{shopping_list_id}", response_model=OkResponse)
-def delete_shopping_list(shopping_list_id: str) -> OkResponse:
-    mongo.delete_shopping_list(shopping_list_id)
+@app.get("/api/shopping_list/{shopping_list_id}/events")
+async def stream_shopping_list_events(shopping_list_id: str) -> StreamingResponse:
+    try:
+        if shopping_list_id not in shopping_list_broker.snapshots:
+            if not await mongo.get_shopping_list(shopping_list_id):
+                raise HTTPException(status_code=404, detail="Shopping list not found")
+    except InvalidId as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return StreamingResponse(
+        shopping_list_events(shopping_list_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
-    return OkResponse()
 
+@app.websocket("/api/shopping_list/{shopping_list_id}/ws")
+async def shopping_list_socket(websocket: WebSocket, shopping_list_id: str) -> None:
+    await websocket.accept()
 
-def update_ingredients_in_recipe(
-    id: ObjectId, dish_name: str, measured_ingredients: List[str]
-) -> None:
-    extract_recipe_details_task = ExtractRecipeDetailsTask(GEMINI_KEY, GEMINI_MODEL)
     try:
-        recipe_details: Optional[RecipeDetails] = (
-            extract_recipe_details_task.ai_request(dish_name, measured_ingredients)
-        )
+        async with shopping_list_broker.subscribe(shopping_list_id) as queue:
+            while True:
+                event: Optional[Event] = await next_event(queue)
+                if event is None:
+                    await websocket.send_json({"event": "keepalive"})
+                    continue
+
+                name, data = event
+                await websocket.send_json({"event": name, "data": data})
+                if name in ("deleted", "closed"):
+                    break
+    except (KeyError, InvalidId):
+        await websocket.close(code=4404, reason="Shopping list not found")
+        return
+    except WebSocketDisconnect:
+        return
+
+    await websocket.close()
+
+
+@app.post(
+    "/api/shopping_list/{shopping_list_id}/ops",
+    response_model=ShoppingListVersionResponse,
+)
+async def apply_shopping_list_ops(
+    shopping_list_id: str, data: ShoppingListOpsRequest
+) -> ShoppingListVersionResponse:
+    version, item_ids = await write_shopping_list(
+        mongo.apply_shopping_list_ops(shopping_list_id, data.ops, data.version)
+    )
 
-        if not recipe_details:
-            logging.error("ingredient extraction failed")
-            return None
+    return ShoppingListVersionResponse(
+        id=shopping_list_id, version=version, item_ids=item_ids
+    )
+
+
+@app.post(
+    "/api/shopping_list/{shopping_list_id}/items",
+    response_model=ShoppingListVersionResponse,
+)
+async def add_shopping_list_item(
+    shopping_list_id: str, data: AddShoppingListItemRequest
+) -> ShoppingListVersionResponse:
+    op = ShoppingListItemOp(
+        op="add", item_id=data.item_id, name=data.name, position=data.position
+    )
+
+    return await apply_shopping_list_ops(
+        shopping_list_id, ShoppingListOpsRequest(ops=[op], version=data.version)
+    )
 
-        mongo.update_recipe_details(
-            id, recipe_details.ingredients, recipe_details.cuisine.capitalize()
+
+@app.patch(
+    "/api/shopping_list/{shopping_list_id}/items/{item_id}",
+    response_model=ShoppingListVersionResponse,
+)
+async def update_shopping_list_item(
+    shopping_list_id: str, item_id: str, data: UpdateShoppingListItemRequest
+) -> ShoppingListVersionResponse:
+    ops: List[ShoppingListItemOp] = []
+    if data.checked is not None:
+        ops.append(
+            ShoppingListItemOp(
+                op="check" if data.checked else "uncheck", item_id=item_id
+            )
+        )
+    if data.position is not None:
+        ops.append(
+            ShoppingListItemOp(op="move", item_id=item_id, position=data.position)
         )
-        logging.info(f"recipe details updated for {dish_name}")
-    except RuntimeError as e:
-        logging.error(e)
 
+    return await apply_shopping_list_ops(
+        shopping_list_id, ShoppingListOpsRequest(ops=ops, version=data.version)
+    )
 
-def get_unique_ingredients(recipes: List[Recipe]) -> List[str]:
-    unique_ingredients = set()
-    for r in recipes:
-        unique_ingredients.update(r.ingredients)
 
-    return list(unique_ingredients)
+@app.delete(
+    "/api/shopping_list/{shopping_list_id}/items/{item_id}",
+    response_model=ShoppingListVersionResponse,
+)
+async def remove_shopping_list_item(
+    shopping_list_id: str, item_id: str, version: Optional[int] = None
+) -> ShoppingListVersionResponse:
+    op = ShoppingListItemOp(op="remove", item_id=item_id)
 
+    return await apply_shopping_list_ops(
+        shopping_list_id, ShoppingListOpsRequest(ops=[op], version=version)
+    )
 
-async def extract_recipe(url):
-    parsed: ParseResult = urlparse(url)
-    base_url: str = f"{parsed.scheme}://{parsed.netloc}"
 
-    ai_supplement = False
+@app.get("/api/ai_cache/stats", response_model=AiCacheStatsResponse)
+def get_ai_cache_stats() -> AiCacheStatsResponse:
+    return AiCacheStatsResponse(**ai_cache.stats())
 
-    if base_url in custom_scraper_base_urls():
-        try:
-            custom_scraper: CustomScraper = get_scrapper(base_url)()
-            recipe = custom_scraper.scrape(url)
-        except Exception as e:
-            raise ValueError(f"Failed to scrape {url}: {e}")
+
+@app.get("/api/enrichment/stats", response_model=EnrichmentStatsResponse)
+async def get_enrichment_stats() -> EnrichmentStatsResponse:
+    return EnrichmentStatsResponse(**await enrichment_worker.stats())
+
+
+@app.get("/metrics")
+async def get_metrics() -> Response:
+    try:
+        JOB_QUEUE_DEPTH.set(await mongo.count_jobs("pending"))
+    except Exception as e:
+        logging.error(f"could not count pending jobs: {e}")
+
+    return Response(render_metrics(), media_type=METRICS_CONTENT_TYPE)
+
+
+@app.post("/api/recipes/dedup", response_model=JobResponse)
+async def scan_duplicate_recipes() -> JobResponse:
+    job: Optional[JobResponse] = await job_queue.get(
+        await recipe_deduplicator.submit_scan()
+    )
+    if not job:
+        raise HTTPException(status_code=500, detail="Failed to schedule dedup scan")
+
+    return job
+
+
+@app.get("/api/recipes/duplicates", response_model=RecipeDuplicatesResponse)
+async def get_duplicate_recipes() -> RecipeDuplicatesResponse:
+    duplicates: List[Dict[str, Any]] = await mongo.get_duplicate_recipes()
+
+    return RecipeDuplicatesResponse(
+        duplicates=[RecipeDuplicate.model_validate(d) for d in duplicates]
+    )
+
+
+@app.get("/api/jobs/{job_id}", response_model=JobResponse)
+async def get_job(job_id: str) -> JobResponse:
+    job: Optional[JobResponse] = await job_queue.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    return job
+
+
+@app.delete("/api/shopping_list/{shopping_list_id}", response_model=OkResponse)
+async def delete_shopping_list(shopping_list_id: str) -> OkResponse:
+    await mongo.delete_shopping_list(shopping_list_id)
+
+    return OkResponse()
+
+
+async def update_ingredients_in_recipe(
+    id: ObjectId,
+    dish_name: str,
+    measured_ingredients: List[str],
+    url: Optional[str] = None,
+) -> str:
+    return await enrichment_worker.submit(id, dish_name, measured_ingredients, url)
+
+
+async def enrich_scraped_recipe(id: ObjectId, url: str, recipe: Recipe) -> str:
+    return await update_ingredients_in_recipe(
+        id, recipe.title, recipe.measured_ingredients, url
+    )
+
+
+def id_response(
+    recipe_id: ObjectId,
+    duplicate: Optional[DuplicateMatch],
+    job_id: Optional[str] = None,
+) -> IdResponse:
+    return IdResponse(
+        id=str(recipe_id),
+        job_id=job_id,
+        duplicate_of=duplicate.id if duplicate else None,
+    )
+
+
+def etag_matches(etag: str, if_none_match: str) -> bool:
+    tags = [t.strip().removeprefix("W/") for t in if_none_match.split(",")]
+
+    return "*" in tags or etag in tags
+
+
+def model_response(model: BaseModel) -> Response:
+    return Response(model.model_dump_json(by_alias=True), media_type="application/json")
+
+
+def cached_response(cached: CachedResponse, request: Request) -> Response:
+    headers: Dict[str, str] = {"ETag": cached.etag, "Cache-Control": "no-cache"}
+    if_none_match: Optional[str] = request.headers.get("if-none-match")
+    if if_none_match and etag_matches(cached.etag, if_none_match):
+        return Response(status_code=304, headers=headers)
+
+    return Response(cached.body, media_type="application/json", headers=headers)
+
+
+def next_cursor(items: List, limit: int) -> Optional[str]:
+    if len(items) < limit:
+        return None
+
+    return items[-1].id
+
+
+async def recipes_as_ndjson(summary: bool) -> AsyncIterator[str]:
+    from_document = summary_from_document if summary else recipe_from_document
+    async for r in mongo.iter_recipes(summary=summary):
+        yield from_document(r).model_dump_json(by_alias=True) + "\n"
+
+
+async def recipe_ingredient_names(recipe_ids: List[str], measured: bool) -> List[str]:
+    if not measured:
+        return await mongo.aggregate_recipe_ingredients(recipe_ids)
+
+    lines = await mongo.aggregate_measured_ingredients(recipe_ids)
+
+    return merge_measured_ingredients(
+        [line for line, count in lines for _ in range(count)]
+    )
+
+
+async def write_shopping_list(write: Awaitable[T]) -> T:
+    try:
+        return await write
+    except InvalidId as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ShoppingListNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ShoppingListVersionConflict as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+
+def merge_shopping_list_items(
+    items: List[ShoppingListItem], names: List[str], measured: bool
+) -> List[ShoppingListItem]:
+    checked: List[ShoppingListItem] = [i for i in items if i.checked]
+    unchecked: Dict[str, ShoppingListItem] = {i.name: i for i in items if not i.checked}
+
+    if measured:
+        merged: List[str] = merge_measured_ingredients(list(unchecked) + names)
     else:
-        try:
-            scraper = scrape_me(url)
-            measured_ingredients: List[str] = scraper.ingredients()
-            instructions: str = scraper.instructions()
-            title: str = scraper.title()
-            img_url: str = scraper.image()
-
-            recipe = Recipe(
-                title=title,
-                url=url,
-                img_url=img_url,
-                measured_ingredients=measured_ingredients,  # type: ignore
-                instructions=instructions,
-            )  # type: ignore
-
-            ai_supplement = True
+        seen = {i.name.strip().lower() for i in checked}
+        merged = []
+        for name in list(unchecked) + names:
+            if name.strip().lower() not in seen:
+                seen.add(name.strip().lower())
+                merged.append(name)
 
-        except Exception as e:
-            raise ValueError(f"Failed to scrape {url}: {e}")
+    return checked + [
+        unchecked.get(n) or ShoppingListItem(name=n, checked=False) for n in merged
+    ]
 
-    if not recipe:
-        raise ValueError(f"Failed to scrape {url}, no recipe found.")
+
+async def extract_recipe(url, reuse_existing: bool = False):
+    if reuse_existing:
+        existing_id: Optional[ObjectId] = await mongo.find_recipe_id_by_url(url)
+        if existing_id:
+            return IdResponse(id=str(existing_id))
+
+    scraped: ScrapeCacheEntry = await scrape_recipe(url)
+    recipe: Recipe = scraped.recipe
 
     logging.info(f"extracted recipe: {recipe.title}")
 
-    recipe_id: ObjectId = mongo.add_recipe(recipe)
+    recipe_id, duplicate = await recipe_deduplicator.add_recipe(recipe)
 
-    if ai_supplement:
-        asyncio.create_task(
-            asyncio.to_thread(
-                update_ingredients_in_recipe, recipe_id, title, measured_ingredients
-            )
-        )
+    job_id: Optional[str] = None
+    if scraped.needs_enrichment and not (duplicate and duplicate.merged):
+        job_id = await enrich_scraped_recipe(recipe_id, url, recipe)
 
-    return IdResponse(id=str(recipe_id))  # type: ignore
+    return id_response(recipe_id, duplicate, job_id)
 
 
-def generate_recipe(request: str) -> IdResponse:
-    generate_recipe_task = GenerateRecipeTask(GEMINI_KEY, GEMINI_MODEL)
+async def scrape_recipe(url: str) -> ScrapeCacheEntry:
     try:
-        generated_recipe: Optional[Recipe] = generate_recipe_task.ai_request(request)
+        scraper: CustomScraper = get_scrapper(url)()
+        scraped: ScrapeCacheEntry = await scrape_cache.scrape(url, scraper)
+    except Exception as e:
+        raise ValueError(f"Failed to scrape {url}: {e}")
+
+    if not scraped.recipe:
+        raise ValueError(f"Failed to scrape {url}, no recipe found.")
+
+    return scraped
+
+
+async def generate_recipe_details(request: str) -> Optional[Recipe]:
+    return await generate_recipe_task().ai_request(request)
+
+
+async def generate_recipe(request: str) -> IdResponse:
+    try:
+        generated_recipe: Optional[Recipe] = await generate_recipe_details(request)
         if not generated_recipe:
             logging.error("No recipe generated")
             raise HTTPException(status_code=400, detail=f"Failed to generate recipe")
 
         logging.info(f"extracted recipe: {generated_recipe.title}")
 
-        recipe_id: ObjectId = mongo.add_recipe(generated_recipe)
+        recipe_id, duplicate = await recipe_deduplicator.add_recipe(generated_recipe)
 
-        return IdResponse(id=str(recipe_id))
+        return id_response(recipe_id, duplicate)
     except Exception as e:
         raise ValueError(e)
 
 
+async def recipe_events(data: RecipeRequest) -> AsyncIterator[str]:
+    try:
+        if is_url(data.request):
+            response: IdResponse = await extract_recipe(
+                data.request, data.reuse_existing
+            )
+            yield sse_event("done", response.model_dump())
+            return
+
+        fields: Dict[str, Any] = {}
+
+        async for name, value in generate_recipe_task().ai_request_stream(data.request):
+            fields[name] = value
+            if name != "_id":
+                yield sse_event("field", {"name": name, "value": value})
+
+        generated_recipe = Recipe.model_validate({**fields, "_id": None, "url": ""})
+        logging.info(f"extracted recipe: {generated_recipe.title}")
+
+        recipe_id, duplicate = await recipe_deduplicator.add_recipe(generated_recipe)
+        yield sse_event(
+            "done", id_response(recipe_id, duplicate).model_dump(exclude_none=True)
+        )
+    except Exception as e:
+        logging.error(e)
+        yield sse_event("error", {"detail": str(e)})
+
+
+async def shopping_list_events(id: str) -> AsyncIterator[str]:
+    try:
+        async with shopping_list_broker.subscribe(id) as queue:
+            while True:
+                event: Optional[Event] = await next_event(queue)
+                if event is None:
+                    yield ": keepalive\n\n"
+                    continue
+
+                name, data = event
+                yield sse_event(name, data)
+                if name in ("deleted", "closed"):
+                    return
+    except (KeyError, InvalidId):
+        yield sse_event("error", {"detail": "Shopping list not found"})
+
+
+def sse_event(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
 def is_url(text):
     try:
         result = urlparse(text)
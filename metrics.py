@@ -0,0 +1,158 @@
+import functools
+import inspect
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, Optional, TypeVar
+
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram
+from prometheus_client import generate_latest
+from pymongo import monitoring
+
+F = TypeVar("F", bound=Callable[..., Any])
+C = TypeVar("C", bound=type)
+
+METRICS_CONTENT_TYPE = CONTENT_TYPE_LATEST
+
+REQUEST_LATENCY = Histogram(
+    "thyme_request_duration_seconds",
+    "HTTP request latency by route",
+    ["method", "route", "status"],
+)
+STAGE_LATENCY = Histogram(
+    "thyme_stage_duration_seconds",
+    "Latency of instrumented stages",
+    ["stage", "name"],
+)
+MONGO_COMMAND_LATENCY = Histogram(
+    "thyme_mongo_command_duration_seconds",
+    "MongoDB command latency by issuing route",
+    ["command", "route"],
+)
+MONGO_COMMAND_FAILURES = Counter(
+    "thyme_mongo_command_failures_total",
+    "Failed MongoDB commands by issuing route",
+    ["command", "route"],
+)
+JOB_QUEUE_DEPTH = Gauge(
+    "thyme_job_queue_depth",
+    "Pending background jobs",
+)
+JOB_RESULTS = Counter(
+    "thyme_jobs_total",
+    "Background job attempts by outcome",
+    ["type", "outcome"],
+)
+INGREDIENT_LINES = Counter(
+    "thyme_ingredient_lines_total",
+    "Ingredient lines resolved for enrichment by source",
+    ["source"],
+)
+
+current_scope: ContextVar[Optional[Dict[str, Any]]] = ContextVar(
+    "current_scope", default=None
+)
+
+
+def current_route() -> str:
+    scope: Optional[Dict[str, Any]] = current_scope.get()
+    if scope is None:
+        return "background"
+
+    route = scope.get("route")
+    return getattr(route, "path", "unmatched")
+
+
+@contextmanager
+def timed(stage: str, name: str) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_LATENCY.labels(stage, name).observe(time.perf_counter() - start)
+
+
+def instrument(stage: str, name: Optional[str] = None) -> Callable[[F], F]:
+    def decorator(func: F) -> F:
+        label: str = name or func.__qualname__
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                with timed(stage, label):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper  # type: ignore
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with timed(stage, label):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore
+
+    return decorator
+
+
+def instrument_methods(stage: str) -> Callable[[C], C]:
+    def decorator(cls: C) -> C:
+        for attr, value in list(vars(cls).items()):
+            if attr.startswith("_") or not inspect.isfunction(value):
+                continue
+            if inspect.isasyncgenfunction(value) or inspect.isgeneratorfunction(value):
+                continue
+            setattr(cls, attr, instrument(stage, f"{cls.__name__}.{attr}")(value))
+
+        return cls
+
+    return decorator
+
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        pass
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        MONGO_COMMAND_LATENCY.labels(event.command_name, current_route()).observe(
+            event.duration_micros / 1_000_000
+        )
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        route: str = current_route()
+        MONGO_COMMAND_LATENCY.labels(event.command_name, route).observe(
+            event.duration_micros / 1_000_000
+        )
+        MONGO_COMMAND_FAILURES.labels(event.command_name, route).inc()
+
+
+class MetricsMiddleware:
+    def __init__(self, app: Callable[..., Any]) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message: Dict[str, Any]) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        token = current_scope.set(scope)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            REQUEST_LATENCY.labels(
+                scope["method"], current_route(), str(status)
+            ).observe(time.perf_counter() - start)
+            current_scope.reset(token)
+
+
+def render_metrics() -> bytes:
+    return generate_latest()
@@ -9,7 +9,16 @@ class RecipeDetails(BaseModel):
     ingredients: List[str]
 
 
+class RecipeDetailsBatch(BaseModel):
+    recipes: List[RecipeDetails]
+
+
+class RecipeCuisine(BaseModel):
+    cuisine: str
+
+
 class ShoppingListItem(BaseModel):
+    id: Optional[str] = None
     name: str
     checked: bool
 
@@ -18,6 +27,7 @@ class ShoppingList(BaseModel):
     id: Optional[str] = Field(default=None, alias="_id")
     name: str
     items: List[ShoppingListItem]
+    version: int = 0
 
 
 class Ingredients(BaseModel):
@@ -36,3 +46,20 @@ class Recipe(BaseModel):
     instructions: str
 
     model_config = ConfigDict({"populate_by_name": True})
+
+
+class RecipeSummary(BaseModel):
+    id: Optional[str] = Field(default=None, alias="_id")
+    title: str
+    img_url: Optional[str] = Field(default="")
+    cuisine: Optional[str] = Field(default="")
+
+    model_config = ConfigDict({"populate_by_name": True})
+
+
+class RecipeDuplicate(BaseModel):
+    id: Optional[str] = Field(default=None, alias="_id")
+    title: str
+    duplicate_of: str
+
+    model_config = ConfigDict({"populate_by_name": True})
@@ -1,12 +1,18 @@
-from typing import List
+from typing import List, Literal, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, model_validator
 
 from .data_models import Recipe, ShoppingListItem
 
 
 class RecipeRequest(BaseModel):
     request: str  # either a URL for extraction or a prompt for AI generation
+    reuse_existing: bool = False  # return the stored recipe id for a known URL
+
+
+class BulkImportRequest(BaseModel):
+    requests: List[str]  # URLs for extraction and/or prompts for AI generation
+    reuse_existing: bool = False
 
 
 class AddRecipeRequest(BaseModel):
@@ -20,12 +26,64 @@ class ShoppingListRequest(BaseModel):
     items: List[ShoppingListItem]
 
 
+class ShoppingListFromRecipesRequest(BaseModel):
+    recipe_ids: List[str]
+    name: str = "Shopping list"
+    shopping_list_id: Optional[str] = (
+        None  # merge into this list instead of creating one
+    )
+    measured: bool = False  # sum quantities of measured ingredients
+
+
 class UpdateShoppingListRequest(BaseModel):
     id: str
     name: str
     items: List[ShoppingListItem]
+    version: Optional[int] = None  # reject the update if the list has changed since
+
+
+class ShoppingListItemOp(BaseModel):
+    op: Literal["check", "uncheck", "add", "remove", "move"]
+    item_id: Optional[str] = None
+    name: Optional[str] = None  # for add
+    position: Optional[int] = Field(default=None, ge=0)  # for add and move
+
+    @model_validator(mode="after")
+    def check_arguments(self) -> "ShoppingListItemOp":
+        if self.op == "add" and not self.name:
+            raise ValueError("add requires a name")
+        if self.op != "add" and not self.item_id:
+            raise ValueError(f"{self.op} requires an item_id")
+        if self.op == "move" and self.position is None:
+            raise ValueError("move requires a position")
+
+        return self
+
+
+class ShoppingListOpsRequest(BaseModel):
+    ops: List[ShoppingListItemOp]
+    version: Optional[int] = None
+
+
+class AddShoppingListItemRequest(BaseModel):
+    name: str
+    item_id: Optional[str] = None
+    position: Optional[int] = Field(default=None, ge=0)
+    version: Optional[int] = None
+
+
+class UpdateShoppingListItemRequest(BaseModel):
+    checked: Optional[bool] = None
+    position: Optional[int] = Field(default=None, ge=0)
+    version: Optional[int] = None
 
 
 class UpdateRecipeRequest(BaseModel):
     id: str
     recipe: Recipe
+
+
+class PantryRequest(BaseModel):
+    ingredients: List[str]
+    limit: int = 20
+    min_coverage: float = 0.0
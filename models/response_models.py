@@ -1,12 +1,15 @@
+from datetime import datetime
 from typing import List, Optional
 
 from pydantic import BaseModel, ConfigDict, Field, RootModel
 
-from .data_models import Recipe, ShoppingList
+from .data_models import Recipe, RecipeDuplicate, RecipeSummary, ShoppingList
 
 
 class IdResponse(BaseModel):
     id: str
+    job_id: Optional[str] = None
+    duplicate_of: Optional[str] = None
 
 
 class RecipeResponse(RootModel):
@@ -15,6 +18,16 @@ class RecipeResponse(RootModel):
 
 class RecipeListResponse(BaseModel):
     recipes: List[Recipe]
+    next_cursor: Optional[str] = None
+
+
+class RecipeSummaryListResponse(BaseModel):
+    recipes: List[RecipeSummary]
+    next_cursor: Optional[str] = None
+
+
+class RecipeDuplicatesResponse(BaseModel):
+    duplicates: List[RecipeDuplicate]
 
 
 class OkResponse(BaseModel):
@@ -23,3 +36,80 @@ class OkResponse(BaseModel):
 
 class ShoppingListResponse(BaseModel):
     lists: List[ShoppingList]
+
+
+class ShoppingListVersionResponse(BaseModel):
+    id: str
+    version: int
+    item_ids: List[str] = Field(default_factory=list)
+
+
+class HealthResponse(BaseModel):
+    status: str
+    mongo: Optional[bool] = None
+
+
+class AiCacheStatsResponse(BaseModel):
+    details_hits: int
+    details_misses: int
+    line_hits: int
+    line_misses: int
+
+
+class EnrichmentStatsResponse(BaseModel):
+    queue_depth: int
+    in_flight: int
+    processed: int
+    failed: int
+    batches: int
+    retries: int
+
+
+class JobResponse(BaseModel):
+    id: str
+    type: str
+    key: str
+    status: str
+    attempts: int
+    error: Optional[str] = None
+    next_run_at: Optional[datetime] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
+class BulkImportItemStatus(BaseModel):
+    request: str
+    status: str
+    recipe_id: Optional[str] = None
+    duplicate_of: Optional[str] = None
+    error: Optional[str] = None
+
+
+class BulkImportJobResponse(BaseModel):
+    id: str
+    status: str
+    total: int
+    completed: int
+    failed: int
+    items: List[BulkImportItemStatus]
+
+
+class PantryMatch(BaseModel):
+    recipe: RecipeSummary
+    coverage: float
+    missing: List[str]
+
+
+class PantryMatchResponse(BaseModel):
+    matches: List[PantryMatch]
+
+
+class RecipeSearchHit(BaseModel):
+    recipe: RecipeSummary
+    score: float
+
+
+class RecipeSearchResponse(BaseModel):
+    results: List[RecipeSearchHit]
+    total: Optional[int] = None
@@ -1,33 +1,86 @@
 import os
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 
 from bson import ObjectId
-from pymongo import MongoClient
+from pymongo import ASCENDING, MongoClient
+from pymongo.errors import DuplicateKeyError
+
+from metrics import MongoCommandMetrics, instrument_methods
 
 from models import (
     Recipe,
+    RecipeSummary,
     ShoppingList,
     ShoppingListItem,
     ShoppingListResponse,
     ShoppingListRequest,
 )
+from recipe_urls import RecipeAlreadyExists, canonical_url
 
+RECIPE_SUMMARY_PROJECTION: Dict[str, int] = {"title": 1, "img_url": 1, "cuisine": 1}
+DEFAULT_MAX_POOL_SIZE = 100
 
-class MongoUtils:
-    def __init__(self):
-        self.mongo_user: str = os.getenv("MONGO_USER", "")
-        self.mongo_passwd: str = os.getenv("MONGODB_PASSWD", "")
-        self.mongo_url: str = os.getenv("MONGO_URL", "")
-
-        if not self.mongo_user:
-            raise ValueError("mongo user is not set")
-        if not self.mongo_url:
-            raise ValueError("mongo url is not set")
-        if not self.mongo_passwd:
-            raise ValueError("mongo password is not set")
 
+def mongo_uri_from_env() -> str:
+    mongo_uri: str = os.getenv("MONGO_URI", "")
+    if mongo_uri:
+        return mongo_uri
+
+    mongo_user: str = os.getenv("MONGO_USER", "")
+    mongo_passwd: str = os.getenv("MONGODB_PASSWD", "")
+    mongo_url: str = os.getenv("MONGO_URL", "")
+
+    if not mongo_user:
+        raise ValueError("mongo user is not set")
+    if not mongo_url:
+        raise ValueError("mongo url is not set")
+    if not mongo_passwd:
+        raise ValueError("mongo password is not set")
+
+    return f"mongodb+srv://{mongo_user}:{mongo_passwd}@{mongo_url}"
+
+
+def max_pool_size_from_env() -> int:
+    return int(os.getenv("MONGO_MAX_POOL_SIZE", DEFAULT_MAX_POOL_SIZE))
+
+
+def recipe_document(
+    recipe: Recipe, duplicate_of: Optional[str] = None
+) -> Dict[str, Any]:
+    document: Dict[str, Any] = recipe.model_dump()
+    canonical: Optional[str] = canonical_url(recipe.url)
+    if canonical:
+        document["canonical_url"] = canonical
+    if duplicate_of:
+        document["duplicate_of"] = duplicate_of
+
+    return document
+
+
+def recipe_from_document(document: Dict[str, Any]) -> Recipe:
+    document["_id"] = str(document["_id"])
+    return Recipe.model_validate(document)
+
+
+def summary_from_document(document: Dict[str, Any]) -> RecipeSummary:
+    document["_id"] = str(document["_id"])
+    return RecipeSummary.model_validate(document)
+
+
+def shopping_list_from_document(document: Dict[str, Any]) -> ShoppingList:
+    document["_id"] = str(document["_id"])
+    return ShoppingList.model_validate(document)
+
+
+@instrument_methods("mongo")
+class MongoUtils:
+    def __init__(
+        self, uri: Optional[str] = None, max_pool_size: Optional[int] = None
+    ) -> None:
         self.client: MongoClient = MongoClient(
-            f"mongodb+srv://{self.mongo_user}:{self.mongo_passwd}@{self.mongo_url}"
+            uri or mongo_uri_from_env(),
+            maxPoolSize=max_pool_size or max_pool_size_from_env(),
+            event_listeners=[MongoCommandMetrics()],
         )
 
         self.db = self.client.clipcart
@@ -36,7 +89,15 @@ class MongoUtils:
         self.notion_page_id_collection = self.db.notion_page_ids
 
     def add_recipe(self, recipe: Recipe) -> ObjectId:
-        result = self.recipes_collection.insert_one(recipe.model_dump())
+        try:
+            result = self.recipes_collection.insert_one(recipe_document(recipe))
+        except DuplicateKeyError:
+            existing = self.recipes_collection.find_one(
+                {"canonical_url": canonical_url(recipe.url)}, {"_id": 1}
+            )
+            if not existing:
+                raise
+            raise RecipeAlreadyExists(existing["_id"], recipe.url or "")
 
         return result.inserted_id
 
@@ -47,8 +108,7 @@ class MongoUtils:
         if not recipe:
             return None
 
-        recipe["_id"] = str(recipe["_id"])
-        return Recipe.model_validate(recipe)
+        return recipe_from_document(recipe)
 
     def get_all_recipes(self) -> List[Recipe]:
         recipes = self.recipes_collection.find({})
@@ -56,11 +116,62 @@ class MongoUtils:
         recipe_list = []
 
         for r in recipes:
-            r["_id"] = str(r["_id"])
-            recipe_list.append(Recipe.model_validate(r))
+            recipe_list.append(recipe_from_document(r))
 
         return recipe_list
 
+    def get_recipes_page(
+        self, after: Optional[str] = None, limit: int = 0
+    ) -> List[Recipe]:
+        recipes = (
+            self.recipes_collection.find(self._page_filter(after))
+            .sort("_id", ASCENDING)
+            .limit(limit)
+        )
+
+        recipe_list = []
+
+        for r in recipes:
+            recipe_list.append(recipe_from_document(r))
+
+        return recipe_list
+
+    def get_recipe_summaries(
+        self, after: Optional[str] = None, limit: int = 0
+    ) -> List[RecipeSummary]:
+        recipes = (
+            self.recipes_collection.find(
+                self._page_filter(after), RECIPE_SUMMARY_PROJECTION
+            )
+            .sort("_id", ASCENDING)
+            .limit(limit)
+        )
+
+        summaries = []
+
+        for r in recipes:
+            summaries.append(summary_from_document(r))
+
+        return summaries
+
+    def iter_recipes(
+        self, summary: bool = False, batch_size: int = 500
+    ) -> Iterator[Dict[str, Any]]:
+        projection = RECIPE_SUMMARY_PROJECTION if summary else None
+        recipes = self.recipes_collection.find(
+            {}, projection, batch_size=batch_size
+        ).sort("_id", ASCENDING)
+
+        for r in recipes:
+            r["_id"] = str(r["_id"])
+            yield r
+
+    def _page_filter(self, after: Optional[str]) -> Dict[str, Any]:
+        if not after:
+            return {}
+
+        return {"_id": {"$gt": ObjectId(after)}}
+
     def delete_recipe(self, id: str) -> None:
         self.recipes_collection.delete_one({"_id": ObjectId(id)})
 
@@ -92,8 +203,7 @@ class MongoUtils:
         recipe_list = []
 
         for r in recipes:
-            r["_id"] = str(r["_id"])
-            recipe_list.append(Recipe.model_validate(r))
+            recipe_list.append(recipe_from_document(r))
 
         return recipe_list
 
@@ -123,13 +233,6 @@ class MongoUtils:
         shopping_lists: List[ShoppingList] = []
 
         for s in shopping_lists_from_db:
-            items_data: List[str] = s.get("items", [])
-            name: str = s.get("name", "")
-            id: ObjectId = s.get("_id", "")
-            items: List[ShoppingListItem] = [
-                ShoppingListItem.model_validate(i) for i in items_data
-            ]
-            shopping_list = ShoppingList(items=items, name=name, _id=str(id))
-            shopping_lists.append(shopping_list)
+            shopping_lists.append(shopping_list_from_document(s))
 
         return ShoppingListResponse(lists=shopping_lists)
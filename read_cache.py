@@ -0,0 +1,248 @@
+import asyncio
+import hashlib
+import logging
+import os
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from cachetools import TTLCache
+from pydantic import BaseModel
+
+from async_mongo_utils import (
+    RECIPE_SUMMARY_PROJECTION,
+    AsyncMongoUtils,
+    RecipeWriteListener,
+    ShoppingListWriteListener,
+    follow_changes,
+)
+
+READ_CACHE_URL = os.getenv("READ_CACHE_URL", "")
+READ_CACHE_SIZE = int(os.getenv("READ_CACHE_SIZE", 1024))
+READ_CACHE_TTL = int(os.getenv("READ_CACHE_TTL", 300))
+
+RECIPES_GENERATION = "generation:recipes"
+SUMMARIES_GENERATION = "generation:summaries"
+RESYNC_GENERATION = "generation:resync"
+SHOPPING_LISTS_KEY = "shopping_lists:all"
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CachedResponse:
+    etag: str
+    body: bytes
+
+    def encode(self) -> bytes:
+        return self.etag.encode("ascii") + b"\n" + self.body
+
+    @staticmethod
+    def decode(value: bytes) -> "CachedResponse":
+        etag, body = value.split(b"\n", 1)
+        return CachedResponse(etag.decode("ascii"), body)
+
+    @staticmethod
+    def from_body(body: bytes) -> "CachedResponse":
+        return CachedResponse(f'"{hashlib.sha1(body).hexdigest()}"', body)
+
+
+class CacheBackend(ABC):
+    @abstractmethod
+    async def get(self, key: str) -> Optional[bytes]:
+        pass
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes) -> None:
+        pass
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        pass
+
+    @abstractmethod
+    async def generation(self, key: str) -> int:
+        pass
+
+    @abstractmethod
+    async def bump(self, key: str) -> None:
+        pass
+
+    @abstractmethod
+    async def version(self, key: str) -> int:
+        pass
+
+    @abstractmethod
+    async def invalidate(self, key: str) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+
+class InMemoryCacheBackend(CacheBackend):
+    def __init__(self, maxsize: int = READ_CACHE_SIZE, ttl: int = READ_CACHE_TTL):
+        self.entries: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.generations: Dict[str, int] = {}
+        self.versions: TTLCache = TTLCache(maxsize=maxsize * 16, ttl=ttl)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return self.entries.get(key)
+
+    async def set(self, key: str, value: bytes) -> None:
+        self.entries[key] = value
+
+    async def delete(self, key: str) -> None:
+        self.entries.pop(key, None)
+
+    async def generation(self, key: str) -> int:
+        return self.generations.get(key, 0)
+
+    async def bump(self, key: str) -> None:
+        self.generations[key] = self.generations.get(key, 0) + 1
+
+    async def version(self, key: str) -> int:
+        return self.versions.get(key, 0)
+
+    async def invalidate(self, key: str) -> None:
+        self.versions[key] = self.versions.get(key, 0) + 1
+        self.entries.pop(key, None)
+
+
+class RedisCacheBackend(CacheBackend):
+    def __init__(self, url: str, ttl: int = READ_CACHE_TTL) -> None:
+        try:
+            from redis import asyncio as redis
+        except ImportError:
+            raise RuntimeError("READ_CACHE_URL requires the redis package")
+
+        self.client = redis.from_url(url)
+        self.ttl = ttl
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self.client.get(key)
+
+    async def set(self, key: str, value: bytes) -> None:
+        await self.client.set(key, value, ex=self.ttl)
+
+    async def delete(self, key: str) -> None:
+        await self.client.delete(key)
+
+    async def generation(self, key: str) -> int:
+        return int(await self.client.get(key) or 0)
+
+    async def bump(self, key: str) -> None:
+        await self.client.incr(key)
+
+    async def version(self, key: str) -> int:
+        return int(await self.client.get(f"version:{key}") or 0)
+
+    async def invalidate(self, key: str) -> None:
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.incr(f"version:{key}")
+            pipe.expire(f"version:{key}", self.ttl)
+            pipe.delete(key)
+            await pipe.execute()
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+def cache_backend_from_env() -> CacheBackend:
+    if READ_CACHE_URL:
+        return RedisCacheBackend(READ_CACHE_URL)
+
+    return InMemoryCacheBackend()
+
+
+class ReadCache(RecipeWriteListener, ShoppingListWriteListener):
+    def __init__(self, backend: CacheBackend) -> None:
+        self.backend = backend
+        self.watchers: List[asyncio.Task] = []
+
+    async def get_or_load(
+        self, key: str, loader: Callable[[], Awaitable[BaseModel]]
+    ) -> CachedResponse:
+        cached: Optional[bytes] = await self.backend.get(key)
+        if cached is not None:
+            return CachedResponse.decode(cached)
+
+        version: int = await self.backend.version(key)
+        model: BaseModel = await loader()
+        response = CachedResponse.from_body(
+            model.model_dump_json(by_alias=True).encode()
+        )
+        if await self.backend.version(key) == version:
+            await self.backend.set(key, response.encode())
+
+        return response
+
+    async def recipe_key(self, id: str) -> str:
+        generation: int = await self.backend.generation(RESYNC_GENERATION)
+        return f"recipe:{generation}:{id}"
+
+    async def recipes_key(self, *params: Any) -> str:
+        generation: int = await self.backend.generation(RECIPES_GENERATION)
+        return f"recipes:{generation}:" + ":".join(str(p) for p in params)
+
+    async def summaries_key(self, *params: Any) -> str:
+        generation: int = await self.backend.generation(SUMMARIES_GENERATION)
+        return f"summaries:{generation}:" + ":".join(str(p) for p in params)
+
+    async def shopping_lists_key(self) -> str:
+        generation: int = await self.backend.generation(RESYNC_GENERATION)
+        return f"{SHOPPING_LISTS_KEY}:{generation}"
+
+    async def recipe_written(self, id: str, fields: Dict[str, Any]) -> None:
+        await self.backend.invalidate(await self.recipe_key(id))
+        await self.backend.bump(RECIPES_GENERATION)
+        if "_id" in fields or any(f in fields for f in RECIPE_SUMMARY_PROJECTION):
+            await self.backend.bump(SUMMARIES_GENERATION)
+
+    async def recipe_deleted(self, id: str) -> None:
+        await self.backend.invalidate(await self.recipe_key(id))
+        await self.backend.bump(RECIPES_GENERATION)
+        await self.backend.bump(SUMMARIES_GENERATION)
+
+    async def shopping_list_written(self, id: str) -> None:
+        await self.backend.invalidate(await self.shopping_lists_key())
+
+    def watch(self, mongo: AsyncMongoUtils) -> None:
+        self.watchers = [
+            asyncio.create_task(self.watch_recipes(mongo)),
+            asyncio.create_task(self.watch_shopping_lists(mongo)),
+        ]
+
+    async def resync(self) -> None:
+        await self.backend.bump(RESYNC_GENERATION)
+        await self.backend.bump(RECIPES_GENERATION)
+        await self.backend.bump(SUMMARIES_GENERATION)
+
+    async def watch_recipes(self, mongo: AsyncMongoUtils) -> None:
+        async def handle(change: Dict[str, Any]) -> None:
+            id = str(change["documentKey"]["_id"])
+            if change["operationType"] == "delete":
+                await self.recipe_deleted(id)
+            elif change["operationType"] == "update":
+                await self.recipe_written(
+                    id, change["updateDescription"]["updatedFields"]
+                )
+            else:
+                await self.recipe_written(id, {"_id": id})
+
+        await follow_changes("recipes", mongo.recipes_collection, handle, self.resync)
+
+    async def watch_shopping_lists(self, mongo: AsyncMongoUtils) -> None:
+        async def handle(change: Dict[str, Any]) -> None:
+            await self.shopping_list_written(str(change["documentKey"]["_id"]))
+
+        await follow_changes(
+            "shopping lists", mongo.shopping_list_collection, handle, self.resync
+        )
+
+    async def close(self) -> None:
+        for watcher in self.watchers:
+            watcher.cancel()
+
+        await asyncio.gather(*self.watchers, return_exceptions=True)
+        await self.backend.close()
@@ -0,0 +1,297 @@
+import hashlib
+import logging
+import os
+import random
+import re
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, FrozenSet, List, Optional, Set, Tuple
+
+from bson import ObjectId
+
+from async_mongo_utils import AsyncMongoUtils, RecipeWriteListener
+from custom_scrapers import run_parser
+from ingredient_parser import FILLER_WORDS, tokenize
+from job_queue import Job, JobQueue
+from models import Recipe
+from recipe_urls import RecipeAlreadyExists, canonical_url
+
+DEDUP_MODE = os.getenv("DEDUP_MODE", "flag")
+DEDUP_THRESHOLD = float(os.getenv("DEDUP_THRESHOLD", 0.8))
+DEDUP_PERMUTATIONS = int(os.getenv("DEDUP_PERMUTATIONS", 64))
+DEDUP_BANDS = int(os.getenv("DEDUP_BANDS", 16))
+DEDUP_BATCH_SIZE = int(os.getenv("DEDUP_BATCH_SIZE", 500))
+
+DEDUP_JOB = "dedup_recipes"
+DEDUP_FIELDS = ["title", "ingredients", "measured_ingredients", "duplicate_of"]
+MIN_FEATURES = 4
+MERSENNE_PRIME = (1 << 61) - 1
+
+TITLE_PATTERN = re.compile(r"[a-z0-9]+")
+TITLE_STOPWORDS = frozenset("""
+    a an and the of with in on for to how make recipe recipes easy best quick
+    simple homemade style classic perfect authentic
+    """.split())
+
+Signature = Tuple[int, ...]
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class DuplicateMatch:
+    id: str
+    similarity: float
+    merged: bool = False
+
+
+def recipe_features(fields: Dict[str, Any]) -> FrozenSet[str]:
+    lines: List[str] = (
+        fields.get("measured_ingredients") or fields.get("ingredients") or []
+    )
+    names = [
+        " ".join(t for t in tokenize(line) if t not in FILLER_WORDS) for line in lines
+    ]
+
+    words = [
+        w
+        for w in TITLE_PATTERN.findall((fields.get("title") or "").lower())
+        if w not in TITLE_STOPWORDS
+    ]
+
+    return frozenset(
+        [f"i:{n}" for n in names if n]
+        + [f"t:{w}" for w in words]
+        + [f"t:{a} {b}" for a, b in zip(words, words[1:])]
+    )
+
+
+class MinHasher:
+    def __init__(self, permutations: int = DEDUP_PERMUTATIONS, seed: int = 1) -> None:
+        rng = random.Random(seed)
+        self.params: List[Tuple[int, int]] = [
+            (rng.randrange(1, MERSENNE_PRIME), rng.randrange(MERSENNE_PRIME))
+            for _ in range(permutations)
+        ]
+
+    def signature(self, features: FrozenSet[str]) -> Signature:
+        hashes: List[int] = [
+            int.from_bytes(hashlib.blake2b(f.encode(), digest_size=8).digest(), "big")
+            for f in features
+        ]
+
+        return tuple(
+            min((a * h + b) % MERSENNE_PRIME for h in hashes) for a, b in self.params
+        )
+
+
+def similarity(a: Signature, b: Signature) -> float:
+    return sum(x == y for x, y in zip(a, b)) / len(a)
+
+
+class LshIndex:
+    def __init__(self, bands: int, rows: int) -> None:
+        self.bands = bands
+        self.rows = rows
+        self.buckets: List[Dict[Signature, Set[str]]] = [
+            defaultdict(set) for _ in range(bands)
+        ]
+        self.signatures: Dict[str, Signature] = {}
+
+    def band_keys(self, signature: Signature) -> List[Signature]:
+        return [
+            signature[band * self.rows : (band + 1) * self.rows]
+            for band in range(self.bands)
+        ]
+
+    def add(self, id: str, signature: Signature) -> None:
+        self.remove(id)
+        self.signatures[id] = signature
+        for band, key in enumerate(self.band_keys(signature)):
+            self.buckets[band][key].add(id)
+
+    def remove(self, id: str) -> None:
+        signature: Optional[Signature] = self.signatures.pop(id, None)
+        if signature is None:
+            return
+
+        for band, key in enumerate(self.band_keys(signature)):
+            bucket: Set[str] = self.buckets[band][key]
+            bucket.discard(id)
+            if not bucket:
+                del self.buckets[band][key]
+
+    def query(
+        self, signature: Signature, threshold: float
+    ) -> Optional[Tuple[str, float]]:
+        candidates: Set[str] = set()
+        for band, key in enumerate(self.band_keys(signature)):
+            candidates.update(self.buckets[band].get(key, ()))
+
+        scored = [(similarity(signature, self.signatures[c]), c) for c in candidates]
+        matches = [(score, c) for score, c in scored if score >= threshold]
+        if not matches:
+            return None
+
+        score, id = min(matches, key=lambda m: (-m[0], m[1]))
+        return id, score
+
+
+class RecipeDeduplicator(RecipeWriteListener):
+    def __init__(
+        self,
+        mongo: AsyncMongoUtils,
+        jobs: JobQueue,
+        mode: str = DEDUP_MODE,
+        threshold: float = DEDUP_THRESHOLD,
+        permutations: int = DEDUP_PERMUTATIONS,
+        bands: int = DEDUP_BANDS,
+    ) -> None:
+        self.mongo = mongo
+        self.jobs = jobs
+        self.merge = mode == "merge"
+        self.threshold = threshold
+        self.bands = bands
+        self.hasher = MinHasher(permutations)
+        self.index = LshIndex(bands, permutations // bands)
+        self.fields: Dict[str, Dict[str, Any]] = {}
+        self.loaded = False
+
+        jobs.register(DEDUP_JOB, self.process)
+
+    async def load(self) -> None:
+        async for batch in self.signed_batches(DEDUP_FIELDS):
+            for r, signature in batch:
+                self.store(
+                    r["_id"], {f: r[f] for f in DEDUP_FIELDS if f in r}, signature
+                )
+
+        self.loaded = True
+        logger.info(f"dedup index loaded {len(self.index.signatures)} recipes")
+
+    def signature(self, fields: Dict[str, Any]) -> Optional[Signature]:
+        features: FrozenSet[str] = recipe_features(fields)
+        if len(features) < MIN_FEATURES:
+            return None
+
+        return self.hasher.signature(features)
+
+    def signatures(self, recipes: List[Dict[str, Any]]) -> List[Optional[Signature]]:
+        return [None if r.get("duplicate_of") else self.signature(r) for r in recipes]
+
+    async def signed_batches(
+        self, fields: List[str], ordered: bool = False
+    ) -> AsyncIterator[List[Tuple[Dict[str, Any], Optional[Signature]]]]:
+        batch: List[Dict[str, Any]] = []
+
+        async for r in self.mongo.iter_recipe_fields(
+            fields, batch_size=DEDUP_BATCH_SIZE, ordered=ordered
+        ):
+            batch.append(r)
+            if len(batch) >= DEDUP_BATCH_SIZE:
+                yield list(zip(batch, await run_parser(self.signatures, batch)))
+                batch = []
+
+        if batch:
+            yield list(zip(batch, await run_parser(self.signatures, batch)))
+
+    def store(
+        self, id: str, fields: Dict[str, Any], signature: Optional[Signature]
+    ) -> None:
+        self.fields[id] = fields
+        if signature:
+            self.index.add(id, signature)
+        else:
+            self.index.remove(id)
+
+    def index_fields(self, id: str, fields: Dict[str, Any]) -> None:
+        changed: Dict[str, Any] = {f: fields[f] for f in DEDUP_FIELDS if f in fields}
+        if not changed:
+            return
+
+        merged: Dict[str, Any] = {**self.fields.get(id, {}), **changed}
+        self.store(id, merged, self.signatures([merged])[0])
+
+    def remove(self, id: str) -> None:
+        self.fields.pop(id, None)
+        self.index.remove(id)
+
+    async def recipe_written(self, id: str, fields: Dict[str, Any]) -> None:
+        self.index_fields(id, fields)
+
+    async def recipe_deleted(self, id: str) -> None:
+        self.remove(id)
+
+    def find_duplicate(self, recipe: Recipe) -> Optional[DuplicateMatch]:
+        signature: Optional[Signature] = self.signature(recipe.model_dump())
+        if not signature:
+            return None
+
+        match: Optional[Tuple[str, float]] = self.index.query(signature, self.threshold)
+        if not match:
+            return None
+
+        return DuplicateMatch(match[0], match[1], merged=self.merge)
+
+    async def add_recipe(
+        self, recipe: Recipe
+    ) -> Tuple[ObjectId, Optional[DuplicateMatch]]:
+        duplicate: Optional[DuplicateMatch] = self.find_duplicate(recipe)
+        if duplicate and duplicate.merged:
+            return ObjectId(duplicate.id), duplicate
+
+        try:
+            recipe_id: ObjectId = await self.mongo.add_recipe(
+                recipe, duplicate.id if duplicate else None
+            )
+        except RecipeAlreadyExists as e:
+            return e.id, DuplicateMatch(str(e.id), 1.0, merged=True)
+
+        return recipe_id, duplicate
+
+    async def submit_scan(self) -> str:
+        return await self.jobs.submit(DEDUP_JOB, DEDUP_JOB, {})
+
+    async def process(self, jobs: List[Job]) -> List[Optional[str]]:
+        duplicates, canonical = await self.scan()
+
+        await self.mongo.set_canonical_urls(canonical)
+        await self.mongo.mark_recipe_duplicates(duplicates)
+        logger.info(
+            f"dedup scan flagged {len(duplicates)} duplicates, "
+            f"canonicalized {len(canonical)} urls"
+        )
+
+        return [None] * len(jobs)
+
+    async def scan(self) -> Tuple[Dict[str, str], Dict[str, str]]:
+        index = LshIndex(self.bands, self.index.rows)
+        urls: Dict[str, str] = {}
+        duplicates: Dict[str, str] = {}
+        canonical: Dict[str, str] = {}
+
+        async for batch in self.signed_batches(
+            DEDUP_FIELDS + ["url", "canonical_url"], ordered=True
+        ):
+            for r, signature in batch:
+                if r.get("duplicate_of"):
+                    continue
+
+                url: Optional[str] = canonical_url(r.get("url"))
+                if url and url in urls:
+                    duplicates[r["_id"]] = urls[url]
+                    continue
+
+                match = index.query(signature, self.threshold) if signature else None
+                if match:
+                    duplicates[r["_id"]] = match[0]
+                    continue
+
+                if url:
+                    urls[url] = r["_id"]
+                    if r.get("canonical_url") != url:
+                        canonical[r["_id"]] = url
+                if signature:
+                    index.add(r["_id"], signature)
+
+        return duplicates, canonical
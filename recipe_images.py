@@ -0,0 +1,189 @@
+import asyncio
+import hashlib
+import io
+import logging
+import os
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional, Set
+
+from cachetools import TTLCache
+from gridfs import AsyncGridFSBucket
+from gridfs.errors import NoFile
+from PIL import Image, ImageOps
+
+from async_mongo_utils import AsyncMongoUtils, RecipeWriteListener
+from custom_scrapers import host_limit, http_client, run_parser
+
+IMAGE_STORE_PATH = os.getenv("IMAGE_STORE_PATH", "image_store")
+IMAGE_STORE_GRIDFS = os.getenv("IMAGE_STORE_GRIDFS", "") == "1"
+IMAGE_MAX_BYTES = int(os.getenv("IMAGE_MAX_BYTES", 15 * 1024 * 1024))
+IMAGE_CONCURRENCY = int(os.getenv("IMAGE_CONCURRENCY", 4))
+IMAGE_QUALITY = int(os.getenv("IMAGE_QUALITY", 80))
+IMAGE_RETRY_AFTER = int(os.getenv("IMAGE_RETRY_AFTER", 3600))
+
+THUMBNAIL_SIZES: Dict[str, int] = {"small": 160, "medium": 480, "large": 1024}
+IMAGE_MEDIA_TYPE = "image/webp"
+
+logger = logging.getLogger(__name__)
+
+
+def content_key(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def make_thumbnails(data: bytes) -> Dict[str, bytes]:
+    largest: int = max(THUMBNAIL_SIZES.values())
+    with Image.open(io.BytesIO(data)) as original:
+        original.draft("RGB", (largest, largest))
+        image = ImageOps.exif_transpose(original)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+
+        thumbnails: Dict[str, bytes] = {}
+        for name, size in THUMBNAIL_SIZES.items():
+            thumbnail = image.copy()
+            thumbnail.thumbnail((size, size), Image.Resampling.LANCZOS)
+            out = io.BytesIO()
+            thumbnail.save(out, "WEBP", quality=IMAGE_QUALITY, method=4)
+            thumbnails[name] = out.getvalue()
+
+    return thumbnails
+
+
+class ImageStore(ABC):
+    @abstractmethod
+    async def put(self, data: bytes) -> str:
+        pass
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[bytes]:
+        pass
+
+
+class LocalImageStore(ImageStore):
+    def __init__(self, root: str = IMAGE_STORE_PATH) -> None:
+        self.root = root
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], f"{key}.webp")
+
+    async def put(self, data: bytes) -> str:
+        key: str = content_key(data)
+        await asyncio.to_thread(self.write, self.path(key), data)
+
+        return key
+
+    def write(self, path: str, data: bytes) -> None:
+        if os.path.exists(path):
+            return
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await asyncio.to_thread(self.read, self.path(key))
+
+    def read(self, path: str) -> Optional[bytes]:
+        try:
+            with open(path, "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+
+class GridFSImageStore(ImageStore):
+    def __init__(self, mongo: AsyncMongoUtils) -> None:
+        self.bucket = AsyncGridFSBucket(mongo.db, bucket_name="recipe_images")
+
+    async def put(self, data: bytes) -> str:
+        key: str = content_key(data)
+        if not await self.bucket.find({"filename": key}).limit(1).to_list():
+            await self.bucket.upload_from_stream(key, data)
+
+        return key
+
+    async def get(self, key: str) -> Optional[bytes]:
+        try:
+            stream = await self.bucket.open_download_stream_by_name(key)
+        except NoFile:
+            return None
+
+        return await stream.read()
+
+
+def image_store_from_env(mongo: AsyncMongoUtils) -> ImageStore:
+    if IMAGE_STORE_GRIDFS:
+        return GridFSImageStore(mongo)
+
+    return LocalImageStore()
+
+
+class RecipeImageProcessor(RecipeWriteListener):
+    def __init__(
+        self,
+        mongo: AsyncMongoUtils,
+        store: ImageStore,
+        concurrency: int = IMAGE_CONCURRENCY,
+    ) -> None:
+        self.mongo = mongo
+        self.store = store
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.pending: Set[str] = set()
+        self.failed: TTLCache = TTLCache(maxsize=10_000, ttl=IMAGE_RETRY_AFTER)
+        self.tasks: Set[asyncio.Task] = set()
+
+    async def recipe_written(self, id: str, fields: Dict[str, Any]) -> None:
+        if fields.get("img_url"):
+            self.schedule(id, fields["img_url"])
+
+    async def recipe_deleted(self, id: str) -> None:
+        pass
+
+    def schedule(self, id: str, img_url: str) -> None:
+        if id in self.pending or id in self.failed:
+            return
+
+        self.pending.add(id)
+        task = asyncio.create_task(self.process(id, img_url))
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    async def process(self, id: str, img_url: str) -> None:
+        try:
+            async with self.semaphore:
+                data: bytes = await self.fetch(img_url)
+                thumbnails: Dict[str, bytes] = await run_parser(make_thumbnails, data)
+                images: Dict[str, str] = {
+                    name: await self.store.put(thumbnail)
+                    for name, thumbnail in thumbnails.items()
+                }
+                await self.mongo.set_recipe_images(id, images)
+        except Exception as e:
+            self.failed[id] = img_url
+            logger.error(f"could not process image {img_url} for recipe {id}: {e}")
+        finally:
+            self.pending.discard(id)
+
+    async def fetch(self, url: str) -> bytes:
+        async with host_limit(url):
+            async with http_client().stream("GET", url) as response:
+                response.raise_for_status()
+                if int(response.headers.get("content-length") or 0) > IMAGE_MAX_BYTES:
+                    raise ValueError("image too large")
+
+                data = bytearray()
+                async for chunk in response.aiter_bytes():
+                    data += chunk
+                    if len(data) > IMAGE_MAX_BYTES:
+                        raise ValueError("image too large")
+
+        return bytes(data)
+
+    async def stop(self) -> None:
+        for task in self.tasks:
+            task.cancel()
+
+        await asyncio.gather(*self.tasks, return_exceptions=True)
@@ -0,0 +1,56 @@
+import re
+from typing import FrozenSet, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from bson import ObjectId
+
+HOST_PREFIXES = ("www.", "m.", "amp.", "mobile.")
+VARIANT_SEGMENTS: FrozenSet[str] = frozenset({"amp", "print", "wprm_print"})
+TRACKING_QUERY_PREFIXES = ("utm_", "mc_", "_ga", "_gl")
+TRACKING_QUERY_PARAMS: FrozenSet[str] = frozenset("""
+    fbclid gclid dclid gbraid wbraid msclkid yclid igshid twclid ttclid ref
+    ref_src ref_url referrer share shared amp print output
+    """.split())
+PRINT_SUFFIX = re.compile(r"/(?:amp|print)(?:/\d+)?$")
+
+
+class RecipeAlreadyExists(Exception):
+    def __init__(self, id: ObjectId, url: str) -> None:
+        super().__init__(f"Recipe {id} already exists for {url}")
+        self.id = id
+
+
+def is_tracking_param(name: str) -> bool:
+    name = name.lower()
+    return name in TRACKING_QUERY_PARAMS or name.startswith(TRACKING_QUERY_PREFIXES)
+
+
+def canonical_url(url: Optional[str]) -> Optional[str]:
+    if not url or not url.strip():
+        return None
+
+    parts = urlsplit(url.strip())
+    if not parts.netloc:
+        return None
+
+    host = parts.hostname or ""
+    for prefix in HOST_PREFIXES:
+        host = host.removeprefix(prefix)
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+
+    path = re.sub(r"/{2,}", "/", parts.path).rstrip("/")
+    path = PRINT_SUFFIX.sub("", path)
+    segments = [s for s in path.split("/") if s and s.lower() not in VARIANT_SEGMENTS]
+    path = "/" + "/".join(segments) if segments else ""
+    path = path.removesuffix(".amp")
+
+    query = urlencode(
+        sorted(
+            (k, v)
+            for k, v in parse_qsl(parts.query, keep_blank_values=True)
+            if not is_tracking_param(k)
+        )
+    )
+
+    return urlunsplit(("https", host, path, query, ""))
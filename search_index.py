@@ -0,0 +1,234 @@
+import heapq
+import logging
+import math
+import os
+import re
+from collections import Counter, defaultdict
+from operator import itemgetter
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from async_mongo_utils import RECIPE_TEXT_WEIGHTS, AsyncMongoUtils, RecipeWriteListener
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from in into is it of on or the then to with".split()
+)
+
+SEARCH_MAX_CANDIDATES = int(os.getenv("SEARCH_MAX_CANDIDATES", 10000))
+MAX_FRESH_POSTINGS = 1000
+MAX_LENGTH_DRIFT = 0.05
+
+RankedPostings = Tuple[float, List[Tuple[float, str]], float]
+
+logger = logging.getLogger(__name__)
+
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in TOKEN_PATTERN.findall(text.lower()) if t not in STOPWORDS]
+
+
+def field_text(value: Any) -> str:
+    if isinstance(value, list):
+        return " ".join(str(v) for v in value)
+
+    return str(value or "")
+
+
+class SearchIndex(RecipeWriteListener):
+    def __init__(
+        self,
+        field_weights: Dict[str, int] = RECIPE_TEXT_WEIGHTS,
+        k1: float = 1.2,
+        b: float = 0.75,
+        max_candidates: int = SEARCH_MAX_CANDIDATES,
+    ) -> None:
+        self.field_weights = field_weights
+        self.k1 = k1
+        self.b = b
+        self.max_candidates = max_candidates
+        self.postings: Dict[str, Dict[str, float]] = defaultdict(dict)
+        self.ranked: Dict[str, RankedPostings] = {}
+        self.fresh: Dict[str, Set[str]] = defaultdict(set)
+        self.field_terms: Dict[str, Dict[str, Counter]] = {}
+        self.doc_lengths: Dict[str, float] = {}
+        self.total_length = 0.0
+        self.loaded = False
+
+    async def load(self, mongo: AsyncMongoUtils) -> None:
+        async for r in mongo.iter_recipe_fields(list(self.field_weights)):
+            self.index_fields(r["_id"], r)
+
+        self.loaded = True
+        logger.info(
+            f"search index loaded {len(self.doc_lengths)} recipes, "
+            f"{len(self.postings)} terms"
+        )
+
+    def index_fields(self, id: str, fields: Dict[str, Any]) -> None:
+        changed: Dict[str, Counter] = {
+            name: Counter(tokenize(field_text(fields[name])))
+            for name in self.field_weights
+            if name in fields
+        }
+        if not changed:
+            return
+
+        terms: Dict[str, Counter] = {**self.field_terms.get(id, {}), **changed}
+        self.remove(id)
+        self.field_terms[id] = terms
+
+        weighted: Counter = Counter()
+        for name, counts in terms.items():
+            weight = self.field_weights[name]
+            for term, count in counts.items():
+                weighted[term] += weight * count
+
+        for term, tf in weighted.items():
+            self.postings[term][id] = tf
+            if term in self.ranked:
+                self.fresh[term].add(id)
+
+        length = float(sum(weighted.values()))
+        self.doc_lengths[id] = length
+        self.total_length += length
+
+    def remove(self, id: str) -> None:
+        terms: Optional[Dict[str, Counter]] = self.field_terms.pop(id, None)
+        if terms is None:
+            return
+
+        for term in set().union(*terms.values()):
+            postings: Dict[str, float] = self.postings[term]
+            postings.pop(id, None)
+            if not postings:
+                del self.postings[term]
+                self.ranked.pop(term, None)
+                self.fresh.pop(term, None)
+
+        self.total_length -= self.doc_lengths.pop(id)
+
+    async def recipe_written(self, id: str, fields: Dict[str, Any]) -> None:
+        self.index_fields(id, fields)
+
+    async def recipe_deleted(self, id: str) -> None:
+        self.remove(id)
+
+    def ranked_postings(
+        self, term: str, base_norm: float, length_factor: float
+    ) -> RankedPostings:
+        postings: Dict[str, float] = self.postings[term]
+        fresh: Set[str] = self.fresh[term]
+        ranked: Optional[RankedPostings] = self.ranked.get(term)
+
+        doc_lengths = self.doc_lengths
+        if ranked is None or abs(ranked[0] / length_factor - 1) > MAX_LENGTH_DRIFT:
+            ranked_with, floor = length_factor, 0.0
+            entries = [
+                (tf / (tf + base_norm + ranked_with * doc_lengths[id]), id)
+                for id, tf in postings.items()
+            ]
+        elif len(fresh) > min(MAX_FRESH_POSTINGS, len(postings) // 8):
+            ranked_with, entries, floor = ranked
+            entries = [e for e in entries if e[1] not in fresh and e[1] in postings]
+            for id in fresh:
+                tf = postings.get(id)
+                if tf:
+                    impact = tf / (tf + base_norm + ranked_with * doc_lengths[id])
+                    if impact >= floor:
+                        entries.append((impact, id))
+        else:
+            return ranked
+
+        entries.sort(key=itemgetter(0), reverse=True)
+        if len(entries) > self.max_candidates:
+            del entries[self.max_candidates :]
+            floor = entries[-1][0]
+        fresh.clear()
+
+        ranked = self.ranked[term] = (ranked_with, entries, floor)
+        return ranked
+
+    def search(
+        self, query: str, limit: int = 20, offset: int = 0
+    ) -> Tuple[List[Tuple[str, float]], int]:
+        doc_count = len(self.doc_lengths)
+        if not doc_count:
+            return [], 0
+
+        k1, b = self.k1, self.b
+        length_factor = k1 * b * doc_count / self.total_length
+        base_norm = k1 * (1 - b)
+        doc_lengths = self.doc_lengths
+        terms: List[Tuple[str, float, float, Dict[str, float], List, float]] = []
+
+        for term in set(tokenize(query)):
+            postings: Optional[Dict[str, float]] = self.postings.get(term)
+            if not postings:
+                continue
+
+            df = len(postings)
+            idf = math.log(1 + (doc_count - df + 0.5) / (df + 0.5)) * (k1 + 1)
+            ranked_with, ranked, floor = self.ranked_postings(
+                term, base_norm, length_factor
+            )
+            bound = idf * max(1.0, ranked_with / length_factor)
+            terms.append((term, idf, bound, postings, ranked, floor))
+
+        if not terms:
+            return [], 0
+
+        size = offset + limit
+        top: List[Tuple[float, str]] = []
+        seen: Set[str] = set()
+
+        def consider(id: str) -> None:
+            seen.add(id)
+            score = 0.0
+            for _, idf, _, postings, *_ in terms:
+                tf = postings.get(id)
+                if tf:
+                    score += (
+                        idf * tf / (tf + base_norm + length_factor * doc_lengths[id])
+                    )
+
+            if len(top) < size:
+                heapq.heappush(top, (score, id))
+            elif (score, id) > top[0]:
+                heapq.heapreplace(top, (score, id))
+
+        for term, _, _, postings, *_ in terms:
+            for id in self.fresh[term]:
+                if id not in seen and id in postings:
+                    consider(id)
+
+        if size > self.max_candidates:
+            for *_, postings, _, _ in terms:
+                for id in postings:
+                    if id not in seen:
+                        consider(id)
+
+        for depth in range(max(len(ranked) for *_, ranked, _ in terms)):
+            if len(seen) >= self.max_candidates:
+                break
+
+            threshold = 0.0
+            for _, _, bound, postings, ranked, floor in terms:
+                if depth < len(ranked):
+                    impact, id = ranked[depth]
+                    threshold += bound * impact
+                    if id not in seen and id in postings:
+                        consider(id)
+                else:
+                    threshold += bound * floor
+
+            if len(top) == size and top[0][0] >= threshold:
+                break
+
+        matched: List[Dict[str, float]] = [postings for *_, postings, _, _ in terms]
+        total = len(matched[0]) if len(matched) == 1 else len(set().union(*matched))
+
+        return [(id, score) for score, id in sorted(top, reverse=True)[offset:]], total
+
+    def index_many(self, documents: Iterable[Tuple[str, Dict[str, Any]]]) -> None:
+        for id, fields in documents:
+            self.index_fields(id, fields)
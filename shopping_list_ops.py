@@ -0,0 +1,163 @@
+import uuid
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from models import ShoppingListItemOp
+
+TOGGLE_OPS = ("check", "uncheck")
+
+Update = Union[Dict[str, Any], List[Dict[str, Any]]]
+
+
+class ShoppingListNotFound(Exception):
+    pass
+
+
+class ShoppingListVersionConflict(Exception):
+    def __init__(self, version: int) -> None:
+        super().__init__(f"Shopping list is at version {version}")
+        self.version = version
+
+
+def new_item_id() -> str:
+    return uuid.uuid4().hex
+
+
+def assign_item_ids(ops: List[ShoppingListItemOp]) -> List[ShoppingListItemOp]:
+    return [
+        (
+            op.model_copy(update={"item_id": new_item_id()})
+            if op.op == "add" and not op.item_id
+            else op
+        )
+        for op in ops
+    ]
+
+
+def referenced_item_ids(ops: List[ShoppingListItemOp]) -> List[str]:
+    added = {op.item_id for op in ops if op.op == "add"}
+
+    return sorted({op.item_id for op in ops if op.item_id and op.item_id not in added})
+
+
+def item_document(op: ShoppingListItemOp) -> Dict[str, Any]:
+    return {"id": op.item_id, "name": op.name, "checked": False}
+
+
+def operator_update(
+    ops: List[ShoppingListItemOp],
+) -> Optional[Tuple[Dict[str, Any], Optional[List[Dict[str, Any]]]]]:
+    if all(op.op in TOGGLE_OPS for op in ops):
+        checked: Dict[str, bool] = {op.item_id: op.op == "check" for op in ops}
+        return (
+            {
+                "$set": {
+                    f"items.$[i{n}].checked": c for n, c in enumerate(checked.values())
+                },
+                "$inc": {"version": 1},
+            },
+            [{f"i{n}.id": item_id} for n, item_id in enumerate(checked)],
+        )
+
+    if len(ops) != 1:
+        return None
+
+    op = ops[0]
+    if op.op == "add":
+        push: Dict[str, Any] = {"$each": [item_document(op)]}
+        if op.position is not None:
+            push["$position"] = op.position
+        return {"$push": {"items": push}, "$inc": {"version": 1}}, None
+
+    if op.op == "remove":
+        return {"$pull": {"items": {"id": op.item_id}}, "$inc": {"version": 1}}, None
+
+    return None
+
+
+def insert_expression(value: Any, position: Optional[int]) -> Dict[str, Any]:
+    if position is None:
+        return {"$concatArrays": ["$items", [value]]}
+
+    return {
+        "$concatArrays": [
+            {"$slice": ["$items", position]},
+            [value],
+            {"$slice": ["$items", position, {"$max": [{"$size": "$items"}, 1]}]},
+        ]
+    }
+
+
+def without_item_expression(item_id: str) -> Dict[str, Any]:
+    return {
+        "$filter": {
+            "input": "$items",
+            "as": "item",
+            "cond": {"$ne": ["$$item.id", item_id]},
+        }
+    }
+
+
+def pipeline_stages(op: ShoppingListItemOp) -> List[Dict[str, Any]]:
+    if op.op in TOGGLE_OPS:
+        checked = {"$mergeObjects": ["$$item", {"checked": op.op == "check"}]}
+        return [
+            {
+                "$set": {
+                    "items": {
+                        "$map": {
+                            "input": "$items",
+                            "as": "item",
+                            "in": {
+                                "$cond": [
+                                    {"$eq": ["$$item.id", op.item_id]},
+                                    checked,
+                                    "$$item",
+                                ]
+                            },
+                        }
+                    }
+                }
+            }
+        ]
+
+    if op.op == "add":
+        value = {"$literal": item_document(op)}
+        return [{"$set": {"items": insert_expression(value, op.position)}}]
+
+    if op.op == "remove":
+        return [{"$set": {"items": without_item_expression(op.item_id)}}]
+
+    return [
+        {
+            "$set": {
+                "_moving": {
+                    "$arrayElemAt": [
+                        {
+                            "$filter": {
+                                "input": "$items",
+                                "as": "item",
+                                "cond": {"$eq": ["$$item.id", op.item_id]},
+                            }
+                        },
+                        0,
+                    ]
+                }
+            }
+        },
+        {"$set": {"items": without_item_expression(op.item_id)}},
+        {"$set": {"items": insert_expression("$_moving", op.position)}},
+        {"$unset": "_moving"},
+    ]
+
+
+def shopping_list_update(
+    ops: List[ShoppingListItemOp],
+) -> Tuple[Update, Optional[List[Dict[str, Any]]]]:
+    update = operator_update(ops)
+    if update is not None:
+        return update
+
+    stages: List[Dict[str, Any]] = [s for op in ops for s in pipeline_stages(op)]
+    stages.append({"$set": {"version": {"$add": [{"$ifNull": ["$version", 0]}, 1]}}})
+
+    return stages, None
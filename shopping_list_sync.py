@@ -0,0 +1,170 @@
+import asyncio
+import logging
+import os
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional, Set, Tuple
+
+from async_mongo_utils import (
+    AsyncMongoUtils,
+    ShoppingListWriteListener,
+    follow_changes,
+)
+from models import ShoppingList, ShoppingListItem
+from mongo_utils import shopping_list_from_document
+
+SYNC_QUEUE_SIZE = int(os.getenv("SHOPPING_LIST_SYNC_QUEUE_SIZE", 100))
+SYNC_KEEPALIVE = float(os.getenv("SHOPPING_LIST_SYNC_KEEPALIVE", 15))
+
+Event = Tuple[str, Dict[str, Any]]
+
+logger = logging.getLogger(__name__)
+
+
+def snapshot_event(shopping_list: ShoppingList) -> Event:
+    return "snapshot", shopping_list.model_dump(by_alias=True)
+
+
+def shopping_list_delta(old: ShoppingList, new: ShoppingList) -> Optional[Event]:
+    old_items: Dict[Optional[str], ShoppingListItem] = {i.id: i for i in old.items}
+    new_items: Dict[Optional[str], ShoppingListItem] = {i.id: i for i in new.items}
+
+    delta: Dict[str, Any] = {"version": new.version}
+    added = [
+        {"position": n, "item": i.model_dump()}
+        for n, i in enumerate(new.items)
+        if i.id not in old_items
+    ]
+    removed = [id for id in old_items if id not in new_items]
+    updated = [
+        i.model_dump() for i in new.items if i.id in old_items and old_items[i.id] != i
+    ]
+    if added:
+        delta["added"] = added
+    if removed:
+        delta["removed"] = removed
+    if updated:
+        delta["updated"] = updated
+    if new.name != old.name:
+        delta["name"] = new.name
+
+    kept_order = [i.id for i in old.items if i.id in new_items]
+    if kept_order != [i.id for i in new.items if i.id in old_items]:
+        delta["order"] = [i.id for i in new.items]
+
+    if len(delta) == 1:
+        return None
+
+    return "delta", delta
+
+
+class ShoppingListBroker(ShoppingListWriteListener):
+    def __init__(self, mongo: AsyncMongoUtils, queue_size: int = SYNC_QUEUE_SIZE):
+        self.mongo = mongo
+        self.queue_size = queue_size
+        self.subscribers: Dict[str, Set[asyncio.Queue]] = defaultdict(set)
+        self.snapshots: Dict[str, ShoppingList] = {}
+        self.locks: Dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+        self.watcher: Optional[asyncio.Task] = None
+
+    @asynccontextmanager
+    async def subscribe(self, id: str) -> AsyncIterator[asyncio.Queue]:
+        queue: asyncio.Queue = asyncio.Queue(self.queue_size)
+        async with self.locks[id]:
+            if id not in self.snapshots:
+                shopping_list: Optional[ShoppingList] = (
+                    await self.mongo.get_shopping_list(id)
+                )
+                if not shopping_list:
+                    raise KeyError(id)
+                self.snapshots[id] = shopping_list
+
+            queue.put_nowait(snapshot_event(self.snapshots[id]))
+            self.subscribers[id].add(queue)
+
+        try:
+            yield queue
+        finally:
+            self.subscribers[id].discard(queue)
+            if not self.subscribers[id]:
+                del self.subscribers[id]
+                self.snapshots.pop(id, None)
+                self.locks.pop(id, None)
+
+    async def shopping_list_written(self, id: str) -> None:
+        if id not in self.subscribers:
+            return
+
+        await self.publish(id, await self.mongo.get_shopping_list(id))
+
+    async def publish(self, id: str, shopping_list: Optional[ShoppingList]) -> None:
+        async with self.locks[id]:
+            old: Optional[ShoppingList] = self.snapshots.get(id)
+            if old is None:
+                return
+
+            if shopping_list is None:
+                self.broadcast(id, ("deleted", {"id": id}))
+                return
+
+            if shopping_list.version < old.version:
+                return
+
+            self.snapshots[id] = shopping_list
+            event: Optional[Event] = shopping_list_delta(old, shopping_list)
+            if event:
+                self.broadcast(id, event)
+
+    def broadcast(self, id: str, event: Event) -> None:
+        for queue in self.subscribers.get(id, ()):
+            if not queue.full():
+                queue.put_nowait(event)
+                continue
+
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait(snapshot_event(self.snapshots[id]))
+
+    def watch(self) -> None:
+        self.watcher = asyncio.create_task(self.watch_changes())
+
+    async def watch_changes(self) -> None:
+        async def handle(change: Dict[str, Any]) -> None:
+            id = str(change["documentKey"]["_id"])
+            if id not in self.subscribers:
+                return
+
+            document: Optional[Dict[str, Any]] = change.get("fullDocument")
+            await self.publish(
+                id, shopping_list_from_document(document) if document else None
+            )
+
+        await follow_changes(
+            "shopping list sync",
+            self.mongo.shopping_list_collection,
+            handle,
+            self.resync,
+            full_document="updateLookup",
+        )
+
+    async def resync(self) -> None:
+        for id in list(self.subscribers):
+            await self.publish(id, await self.mongo.get_shopping_list(id))
+
+    async def close(self) -> None:
+        if self.watcher:
+            self.watcher.cancel()
+            await asyncio.gather(self.watcher, return_exceptions=True)
+
+        for queues in self.subscribers.values():
+            for queue in queues:
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(("closed", {}))
+
+
+async def next_event(queue: asyncio.Queue) -> Optional[Event]:
+    try:
+        return await asyncio.wait_for(queue.get(), SYNC_KEEPALIVE)
+    except asyncio.TimeoutError:
+        return None
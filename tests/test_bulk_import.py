@@ -0,0 +1,53 @@
+import asyncio
+
+from bson import ObjectId
+
+from bulk_import import BulkImporter, BulkImportJob
+from custom_scrapers import ScrapeCacheEntry
+from models import Recipe
+
+EXISTING_ID = ObjectId()
+NEW_ID = ObjectId()
+
+
+class FakeMongo:
+    async def add_recipes(self, recipes, duplicate_of=None):
+        return [
+            (EXISTING_ID, True) if r.url.endswith("old") else (NEW_ID, False)
+            for r in recipes
+        ]
+
+
+async def scrape(url):
+    recipe = Recipe(title=url, url=url, measured_ingredients=[], instructions="")
+    return ScrapeCacheEntry(recipe, True, None, None, 0.0)
+
+
+def test_duplicate_key_inserts_are_reported_existing_and_not_enriched():
+    enriched = []
+
+    async def enrich(recipe_id, url, recipe):
+        enriched.append(recipe_id)
+        return "job"
+
+    importer = BulkImporter(
+        FakeMongo(),
+        is_url=lambda r: True,
+        scrape=scrape,
+        generate=None,
+        enrich=enrich,
+        find_duplicate=lambda r: None,
+    )
+    job = BulkImportJob(["https://example.com/old", "https://example.com/new"], False)
+
+    asyncio.run(importer.run(job))
+
+    old, new = job.items
+    assert (old.status, old.recipe_id, old.duplicate_of) == (
+        "existing",
+        str(EXISTING_ID),
+        str(EXISTING_ID),
+    )
+    assert (new.status, new.recipe_id) == ("stored", str(NEW_ID))
+    assert enriched == [NEW_ID]
+    assert job.to_response().completed == 2
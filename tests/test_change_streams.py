@@ -0,0 +1,73 @@
+import asyncio
+
+from pymongo.errors import OperationFailure
+
+import async_mongo_utils
+from async_mongo_utils import follow_changes
+
+
+class FakeStream:
+    def __init__(self, changes, error):
+        self.changes = changes
+        self.error = error
+        self.resume_token = {"open": True}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.changes:
+            change = self.changes.pop(0)
+            self.resume_token = {"after": change["n"]}
+            return change
+        if self.error:
+            raise self.error
+        await asyncio.Event().wait()
+
+
+class FakeCollection:
+    def __init__(self, streams):
+        self.streams = streams
+        self.resumed = []
+
+    async def watch(self, resume_after=None, **options):
+        self.resumed.append(resume_after)
+        return self.streams.pop(0)
+
+
+def test_change_stream_resumes_and_resyncs_after_history_loss(monkeypatch):
+    monkeypatch.setattr(async_mongo_utils, "CHANGE_STREAM_RETRY_DELAY", 0)
+    history_lost = OperationFailure("history lost", code=286)
+    collection = FakeCollection(
+        [
+            FakeStream([{"n": 1}, {"n": 2}], OperationFailure("stepdown", code=91)),
+            FakeStream([{"n": 3}], history_lost),
+            FakeStream([{"n": 4}], None),
+        ]
+    )
+    handled = []
+    resyncs = []
+
+    async def handle(change):
+        handled.append(change["n"])
+
+    async def resync():
+        resyncs.append(len(handled))
+
+    async def run():
+        task = asyncio.create_task(follow_changes("test", collection, handle, resync))
+        while len(handled) < 4:
+            await asyncio.sleep(0.01)
+        task.cancel()
+
+    asyncio.run(run())
+
+    assert handled == [1, 2, 3, 4]
+    assert collection.resumed == [None, {"after": 2}, None]
+    assert resyncs == [3]
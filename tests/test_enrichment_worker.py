@@ -0,0 +1,50 @@
+import asyncio
+
+from bson import ObjectId
+
+from enrichment_worker import EnrichmentWorker
+from job_queue import Job
+from models import RecipeDetails
+
+
+class FakeJobs:
+    def register(self, name, handler, batch_size=1):
+        pass
+
+
+class FakeMongo:
+    def __init__(self, reruns):
+        self.reruns = reruns
+        self.updates = []
+
+    async def rerun_job_ids(self, ids):
+        return {id for id in ids if id in self.reruns}
+
+    async def update_recipe_details_bulk(self, updates):
+        self.updates.extend(updates)
+
+
+class FakeTask:
+    async def ai_request_batch(self, recipes):
+        return [RecipeDetails(cuisine="thai", ingredients=["basil"]) for _ in recipes]
+
+
+def make_job(recipe_id):
+    payload = {
+        "recipe_id": str(recipe_id),
+        "dish_name": "Pad Krapow",
+        "measured_ingredients": ["1 cup basil"],
+    }
+    return Job(ObjectId(), "enrich_recipe", "key", payload, 1, "run")
+
+
+def test_superseded_runs_do_not_overwrite_recipe_details():
+    current, superseded = ObjectId(), ObjectId()
+    jobs = [make_job(current), make_job(superseded)]
+    mongo = FakeMongo({jobs[1].id})
+    worker = EnrichmentWorker(mongo, FakeJobs(), FakeTask, requests_per_minute=0)
+
+    errors = asyncio.run(worker.process(jobs))
+
+    assert errors == [None, None]
+    assert mongo.updates == [(current, ["basil"], "Thai")]
@@ -0,0 +1,68 @@
+import asyncio
+
+from ai_tasks.extract_recipe_details_task import ExtractRecipeDetailsTask
+from metrics import INGREDIENT_LINES
+from models.data_models import RecipeDetails
+
+PARSED = ["2 cups flour", "1 tsp salt", "3 eggs"]
+
+
+class FakeExtractTask(ExtractRecipeDetailsTask):
+    def __init__(self):
+        super().__init__("test-key", "test-model")
+        self.calls = []
+
+    async def generate(self, dish_name, ingredients):
+        self.calls.append(("generate", dish_name, ingredients))
+        return RecipeDetails(
+            cuisine="french", ingredients=[f"llm {i}" for i in ingredients]
+        )
+
+    async def generate_cuisine(self, dish_name, ingredients):
+        self.calls.append(("cuisine", dish_name, ingredients))
+        return RecipeDetails(cuisine="french", ingredients=[])
+
+    async def generate_batch(self, recipes):
+        self.calls.append(("batch", [(p.dish_name, p.sent) for p in recipes]))
+        return [
+            RecipeDetails(cuisine="french", ingredients=[f"llm {i}" for i in p.sent])
+            for p in recipes
+        ]
+
+
+def llm_lines():
+    return INGREDIENT_LINES.labels("llm")._value.get()
+
+
+def test_resolved_lines_only_ask_for_cuisine():
+    task = FakeExtractTask()
+    before = llm_lines()
+
+    details = asyncio.run(task.ai_request_batch([("Mystery Bake", PARSED)]))[0]
+
+    assert task.calls == [("cuisine", "Mystery Bake", ["flour", "salt", "egg"])]
+    assert details == RecipeDetails(
+        cuisine="french", ingredients=["flour", "salt", "egg"]
+    )
+    assert llm_lines() == before
+
+
+def test_llm_output_never_replaces_parser_hits():
+    task = FakeExtractTask()
+    before = llm_lines()
+
+    results = asyncio.run(
+        task.ai_request_batch(
+            [
+                ("Mystery Bake", PARSED + ["1 cup zorblax"]),
+                ("Mystery Pie", PARSED),
+            ]
+        )
+    )
+
+    assert task.calls == [
+        ("batch", [("Mystery Bake", ["1 cup zorblax"]), ("Mystery Pie", [])])
+    ]
+    assert results[0].ingredients == ["flour", "salt", "egg", "llm 1 cup zorblax"]
+    assert results[1].ingredients == ["flour", "salt", "egg"]
+    assert llm_lines() == before + 1
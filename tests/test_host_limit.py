@@ -0,0 +1,35 @@
+import asyncio
+
+from custom_scrapers import custom_scraper
+from custom_scrapers.custom_scraper import host_limit
+
+
+def test_host_limit_caps_concurrency_and_drops_idle_hosts(monkeypatch):
+    monkeypatch.setattr(custom_scraper, "PER_HOST_CONCURRENCY", 2)
+
+    async def run():
+        active = peak = 0
+
+        async def fetch(url):
+            nonlocal active, peak
+            async with host_limit(url):
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.01)
+                active -= 1
+
+        tasks = [
+            asyncio.create_task(fetch(f"https://example.com/{i}")) for i in range(6)
+        ]
+        await asyncio.sleep(0)
+        hosts_while_busy = set(custom_scraper._host_limits)
+        await asyncio.gather(*tasks)
+        same_host_peak = peak
+        await asyncio.gather(*(fetch(f"https://site{i}.com/") for i in range(50)))
+        return same_host_peak, hosts_while_busy
+
+    peak, hosts_while_busy = asyncio.run(run())
+
+    assert peak == 2
+    assert hosts_while_busy == {"example.com"}
+    assert custom_scraper._host_limits == {}
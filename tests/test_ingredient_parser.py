@@ -0,0 +1,25 @@
+from ingredient_parser import IngredientParser, default_parser, is_typo
+
+
+def test_salted_butter_never_resolves_to_unsalted():
+    parsed = default_parser().parse_line("2 tbsp salted butter")
+
+    assert parsed.name in (None, "butter")
+
+
+def test_sweetened_and_unsweetened_stay_apart():
+    parser = IngredientParser()
+    parser.add("unsweetened cocoa powder")
+
+    assert parser.parse_line("1 cup sweetened cocoa powder").name is None
+    assert not is_typo("sweetened", "unsweetened")
+    assert not is_typo("unsweetened", "sweetened")
+    assert not is_typo("dairy", "nondairy")
+
+
+def test_spelling_mistakes_still_resolve():
+    parser = default_parser()
+
+    assert parser.parse_line("2 cups brocoli").name == "broccoli"
+    assert parser.parse_line("1 lb chiken breast").name == "chicken breast"
+    assert parser.parse_line("2 tomatoe").name == "tomato"
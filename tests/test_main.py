@@ -0,0 +1,70 @@
+import asyncio
+import os
+import subprocess
+import sys
+
+from fastapi import FastAPI
+
+
+def test_import_does_not_open_resources(tmp_path):
+    env = {**os.environ, "AI_CACHE_PATH": str(tmp_path / "missing" / "cache.db")}
+    result = subprocess.run(
+        [sys.executable, "-c", "import main"],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert not (tmp_path / "missing").exists()
+
+
+def test_shutdown_runs_every_stop_when_one_fails(monkeypatch):
+    import main
+
+    stopped = []
+
+    class Fake:
+        def __init__(self, name, fail=False):
+            self.name, self.fail = name, fail
+
+        async def stop(self, *args):
+            stopped.append(self.name)
+            if self.fail:
+                raise RuntimeError(f"{self.name} broke")
+
+        close = stop
+
+    def create_resources():
+        main.shopping_list_broker = Fake("broker", fail=True)
+        main.image_processor = Fake("images")
+        main.bulk_importer = Fake("bulk")
+        main.job_queue = Fake("jobs")
+        main.read_cache = Fake("read cache")
+        main.mongo = Fake("mongo")
+
+    async def warm_up(app):
+        pass
+
+    monkeypatch.setattr(main, "create_resources", create_resources)
+    monkeypatch.setattr(main, "warm_up", warm_up)
+    monkeypatch.setattr(main, "close_scrapers", Fake("scrapers").stop)
+    monkeypatch.setattr(main, "close_clients", Fake("clients").stop)
+
+    async def run():
+        async with main.lifespan(FastAPI()):
+            pass
+
+    asyncio.run(run())
+
+    assert stopped == [
+        "broker",
+        "images",
+        "bulk",
+        "jobs",
+        "read cache",
+        "scrapers",
+        "clients",
+        "mongo",
+    ]
@@ -0,0 +1,53 @@
+import asyncio
+
+from models import OkResponse
+from read_cache import InMemoryCacheBackend, ReadCache
+
+
+def test_write_during_slow_load_does_not_cache_stale_body():
+    async def run():
+        cache = ReadCache(InMemoryCacheBackend())
+        key = await cache.recipe_key("r1")
+        loading = asyncio.Event()
+        written = asyncio.Event()
+
+        async def slow_loader():
+            body = OkResponse(ok="old")
+            loading.set()
+            await written.wait()
+            return body
+
+        async def write():
+            await loading.wait()
+            await cache.recipe_written("r1", {"title": "new"})
+            written.set()
+
+        stale, _ = await asyncio.gather(cache.get_or_load(key, slow_loader), write())
+
+        async def fresh_loader():
+            return OkResponse(ok="new")
+
+        fresh = await cache.get_or_load(key, fresh_loader)
+        return stale, fresh
+
+    stale, fresh = asyncio.run(run())
+
+    assert b"old" in stale.body
+    assert b"new" in fresh.body
+
+
+def test_load_without_concurrent_write_is_cached():
+    async def run():
+        cache = ReadCache(InMemoryCacheBackend())
+        calls = []
+
+        async def loader():
+            calls.append(1)
+            return OkResponse()
+
+        key = await cache.shopping_lists_key()
+        await cache.get_or_load(key, loader)
+        await cache.get_or_load(key, loader)
+        return len(calls)
+
+    assert asyncio.run(run()) == 1
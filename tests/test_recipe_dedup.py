@@ -0,0 +1,66 @@
+import asyncio
+
+import recipe_dedup
+from recipe_dedup import RecipeDeduplicator
+
+INGREDIENTS = ["2 cups flour", "1 tsp salt", "3 eggs", "1 cup milk", "2 tbsp butter"]
+
+
+class FakeJobs:
+    def register(self, name, handler):
+        pass
+
+
+class FakeMongo:
+    def __init__(self, recipes):
+        self.recipes = recipes
+        self.orders = []
+
+    async def iter_recipe_fields(self, fields, batch_size=1000, ordered=False):
+        self.orders.append(ordered)
+        recipes = (
+            sorted(self.recipes, key=lambda r: r["_id"]) if ordered else self.recipes
+        )
+        for r in recipes:
+            yield {"_id": r["_id"], **{f: r[f] for f in fields if f in r}}
+
+
+def make_recipes():
+    return [
+        {"_id": "c", "title": "Pancakes", "ingredients": INGREDIENTS},
+        {"_id": "a", "title": "Pancakes", "ingredients": INGREDIENTS},
+        {
+            "_id": "b",
+            "title": "Beef Stew",
+            "ingredients": ["beef", "carrot", "onion", "potato"],
+        },
+        {
+            "_id": "d",
+            "title": "Stew",
+            "url": "https://www.example.com/stew?utm_source=x",
+        },
+        {"_id": "e", "title": "Stew", "url": "https://example.com/stew/"},
+    ]
+
+
+def test_scan_streams_batches_in_id_order(monkeypatch):
+    monkeypatch.setattr(recipe_dedup, "DEDUP_BATCH_SIZE", 2)
+    mongo = FakeMongo(make_recipes())
+    dedup = RecipeDeduplicator(mongo, FakeJobs())
+
+    duplicates, canonical = asyncio.run(dedup.scan())
+
+    assert mongo.orders == [True]
+    assert duplicates == {"c": "a", "e": "d"}
+    assert canonical == {"d": "https://example.com/stew"}
+
+
+def test_load_indexes_signatures_computed_in_batches(monkeypatch):
+    monkeypatch.setattr(recipe_dedup, "DEDUP_BATCH_SIZE", 2)
+    dedup = RecipeDeduplicator(FakeMongo(make_recipes()), FakeJobs())
+
+    asyncio.run(dedup.load())
+
+    assert set(dedup.index.signatures) == {"a", "b", "c"}
+    assert set(dedup.fields) == {"a", "b", "c", "d", "e"}
+    assert dedup.loaded
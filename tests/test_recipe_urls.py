@@ -0,0 +1,30 @@
+from recipe_urls import canonical_url
+
+
+def test_tracking_params_and_variants_collapse():
+    assert (
+        canonical_url("http://www.example.com/dal-tadka/amp/?utm_source=x&fbclid=1")
+        == canonical_url("https://example.com/dal-tadka?ref=home#comments")
+        == "https://example.com/dal-tadka"
+    )
+
+
+def test_content_params_are_kept_and_sorted():
+    assert (
+        canonical_url("https://example.com/recipe?rid=12&lang=en&utm_medium=email")
+        == "https://example.com/recipe?lang=en&rid=12"
+    )
+
+
+def test_recipes_differing_in_non_tracking_param_do_not_collide():
+    assert canonical_url("https://example.com/recipe?rid=12") != canonical_url(
+        "https://example.com/recipe?rid=13"
+    )
+    assert canonical_url("https://example.com/view?recipe=dal") != canonical_url(
+        "https://example.com/view?recipe=rajma"
+    )
+
+
+def test_non_urls_have_no_canonical_form():
+    assert canonical_url("") is None
+    assert canonical_url("dal tadka") is None
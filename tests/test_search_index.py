@@ -0,0 +1,69 @@
+import math
+import random
+
+from search_index import SearchIndex, tokenize
+
+WORDS = "onion garlic tomato basil paneer butter masala rice dal lemon".split()
+
+
+def exhaustive(index, query, limit):
+    doc_count = len(index.doc_lengths)
+    k1, b = index.k1, index.b
+    length_factor = k1 * b * doc_count / index.total_length
+    base_norm = k1 * (1 - b)
+    scores = {}
+    for term in set(tokenize(query)):
+        postings = index.postings.get(term, {})
+        df = len(postings)
+        idf = math.log(1 + (doc_count - df + 0.5) / (df + 0.5)) * (k1 + 1)
+        for id, tf in postings.items():
+            length = index.doc_lengths[id]
+            scores[id] = scores.get(id, 0.0) + idf * tf / (
+                tf + base_norm + length_factor * length
+            )
+
+    ranked = sorted(scores.items(), key=lambda s: (s[1], s[0]), reverse=True)
+    return [id for id, _ in ranked[:limit]], len(scores)
+
+
+def random_recipe(rng):
+    return {
+        "title": " ".join(rng.choices(WORDS, k=rng.randint(1, 4))),
+        "ingredients": rng.sample(WORDS, rng.randint(1, 6)),
+    }
+
+
+def test_search_matches_exhaustive_bm25_across_writes():
+    rng = random.Random(3)
+    index = SearchIndex(max_candidates=10**6)
+    index.index_many((f"{i:04d}", random_recipe(rng)) for i in range(400))
+    queries = ["paneer butter masala", "garlic", "tomato basil lemon", "rice dal"]
+
+    for _ in range(5):
+        for query in queries:
+            hits, total = index.search(query, limit=10, offset=5)
+            expected, expected_total = exhaustive(index, query, 15)
+            assert [id for id, _ in hits] == expected[5:]
+            assert total == expected_total
+
+        for _ in range(150):
+            id = f"{rng.randrange(450):04d}"
+            if rng.random() < 0.2:
+                index.remove(id)
+            else:
+                index.index_fields(id, random_recipe(rng))
+
+
+def test_candidate_budget_caps_work():
+    rng = random.Random(5)
+    index = SearchIndex(max_candidates=25)
+    index.index_many((f"{i:04d}", random_recipe(rng)) for i in range(400))
+
+    hits, total = index.search("onion garlic tomato", limit=10)
+
+    assert len(hits) == 10
+    assert total == exhaustive(index, "onion garlic tomato", 10)[1]
+
+    hits, _ = index.search("onion garlic tomato", limit=10, offset=30)
+    expected, _ = exhaustive(index, "onion garlic tomato", 40)
+    assert [id for id, _ in hits] == expected[30:]